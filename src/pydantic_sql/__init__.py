@@ -0,0 +1,132 @@
+# src/pydantic_sql/__init__.py
+# Public API of pydantic_sql
+# Names are imported from their submodules on first access, so `import pydantic_sql` loads neither psycopg nor pydantic
+import importlib
+
+# Not imported from typing: that import alone costs more than the rest of this module.
+TYPE_CHECKING = False
+
+# Public name -> submodule that defines it. Functions named like their module
+# (deadline, fingerprint, parallel_scan) are left out: binding them here would
+# shadow the submodule and break `import pydantic_sql.deadline as ...`.
+_EXPORTS = {
+    # exceptions
+    "PydanticSQLException": "exceptions",
+    "ConnectionError": "exceptions",
+    "QueryError": "exceptions",
+    "ParameterError": "exceptions",
+    "ResultMappingError": "exceptions",
+    "ConfigurationError": "exceptions",
+    "TransactionError": "exceptions",
+    "ValidationError": "exceptions",
+    "QueryTimeoutError": "exceptions",
+    "LockNotAvailableError": "exceptions",
+    "LockTimeoutError": "exceptions",
+    "RetryableError": "exceptions",
+    "SerializationError": "exceptions",
+    "DeadlockError": "exceptions",
+    "ResultTooLargeError": "exceptions",
+    # caching and request coalescing
+    "ResultCache": "cache",
+    "CacheStats": "cache",
+    "publish_invalidation": "cache",
+    "listen_for_invalidations": "cache",
+    "ChangeFeed": "change_feed",
+    "SingleFlight": "singleflight",
+    "AsyncSingleFlight": "singleflight",
+    # routing and scale-out reads
+    "ReplicaRouter": "routing",
+    "RoutingSession": "routing",
+    "ShardRouter": "sharding",
+    "Warmup": "warmup",
+    # fetching
+    "Page": "pagination",
+    "fetch_page": "pagination",
+    "paginate": "pagination",
+    "pipelined_fetch": "pipeline",
+    "export_query": "export",
+    "ExportResult": "export",
+    "fetch_with_views": "large_values",
+    "stream_value": "large_values",
+    "stream_large_object": "large_values",
+    "fetch_accounted": "memory",
+    "MemoryBudget": "memory",
+    "MemoryUsage": "memory",
+    # transactions
+    "Deadline": "deadline",
+    "TransactionRunner": "retry",
+    "RetryStats": "retry",
+    # observability
+    "Hook": "instrumentation",
+    "QueryEvent": "instrumentation",
+    "add_hook": "instrumentation",
+    "remove_hook": "instrumentation",
+    "instrument": "instrumentation",
+    "QueryStatsAggregator": "instrumentation",
+    "SlowQueryLog": "slow_query_log",
+    "SlowQuery": "slow_query_log",
+    "normalize_sql": "fingerprint",
+    "stat_statements_report": "fingerprint",
+    "analyze_catalog": "plan_review",
+    "PlanReport": "plan_review",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> "Any":
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        # Plain submodule access, e.g. pydantic_sql.cache without importing it first.
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            # Only a missing submodule means a missing attribute; a missing dependency of one is re-raised.
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache it so later lookups skip __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> "List[str]":
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from typing import Any, List
+
+    from .cache import CacheStats, ResultCache, listen_for_invalidations, publish_invalidation
+    from .deadline import Deadline
+    from .exceptions import (
+        ConfigurationError,
+        ConnectionError,
+        DeadlockError,
+        LockNotAvailableError,
+        LockTimeoutError,
+        ParameterError,
+        PydanticSQLException,
+        QueryError,
+        QueryTimeoutError,
+        ResultMappingError,
+        ResultTooLargeError,
+        RetryableError,
+        SerializationError,
+        TransactionError,
+        ValidationError,
+    )
+    from .export import ExportResult, export_query
+    from .fingerprint import normalize_sql, stat_statements_report
+    from .instrumentation import Hook, QueryEvent, QueryStatsAggregator, add_hook, instrument, remove_hook
+    from .large_values import fetch_with_views, stream_large_object, stream_value
+    from .memory import MemoryBudget, MemoryUsage, fetch_accounted
+    from .pagination import Page, fetch_page, paginate
+    from .pipeline import pipelined_fetch
+    from .plan_review import PlanReport, analyze_catalog
+    from .retry import RetryStats, TransactionRunner
+    from .routing import ReplicaRouter, RoutingSession
+    from .sharding import ShardRouter
+    from .singleflight import AsyncSingleFlight, SingleFlight
+    from .slow_query_log import SlowQuery, SlowQueryLog
@@ -0,0 +1,302 @@
+# src/pydantic_sql/cache.py
+# Opt-in result cache for read queries
+# Keys on the compiled SQL plus normalized parameters
+# Bounds memory with a byte-sized LRU and invalidates entries by table tag
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from pydantic import BaseModel
+
+from .utils import ANY_TABLE, estimate_size, referenced_tables, written_tables
+
+INVALIDATION_CHANNEL = "pydantic_sql_cache"
+
+_MISSING = object()
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size", "tags")
+
+    def __init__(self, value: Any, expires_at: float, size: int, tags: Set[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tags = tags
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        return tuple(sorted((key, _normalize_value(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(item) for item in value)
+    return value
+
+
+def cache_key(sql: str, params: Any = None) -> str:
+    """
+    Build a cache key from a compiled query and its parameters.
+
+    Dict parameters are order-insensitive and Pydantic models are keyed by
+    their field values. repr() keeps types apart, so 1, '1' and Decimal('1')
+    produce different keys.
+
+    :param sql: The compiled SQL text.
+    :param params: Positional or named parameters, or a Pydantic model.
+    :return: A hex digest.
+    """
+    digest = hashlib.sha256(sql.encode())
+    digest.update(b"\x00")
+    digest.update(repr(_normalize_value(params)).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A thread-safe TTL + LRU cache for query results.
+
+    Every entry is tagged with the tables its SQL references. Writes to a
+    table invalidate all entries tagged with it, and every write invalidates
+    entries tagged ANY_TABLE.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 60.0,
+        on_invalidate: Optional[Callable[[Set[str]], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.on_invalidate = on_invalidate
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        # Tag -> number of invalidations so far, so a load can tell whether it raced one
+        self._generations: Dict[str, int] = {}
+        self._clears = 0
+        self._size = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return default
+            if entry.expires_at <= self._clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.value
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store a value.
+
+        :param generation: From `generation(tags)` before the value was loaded;
+            the value is dropped if one of its tags was invalidated since.
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            # Never let one oversized result flush the whole cache.
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        tags = set(tags)
+        with self._lock:
+            if generation is not None and self._generation(tags) != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(value, self._clock() + ttl, size, tags)
+            self._entries[key] = entry
+            self._size += size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats.evictions += 1
+
+    def get_or_load(
+        self,
+        sql: str,
+        params: Any,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """
+        Return the cached result for a query, running `loader` on a miss.
+
+        :param sql: The compiled SQL text.
+        :param params: The query parameters.
+        :param loader: Executes the query and returns its mapped result.
+        :param ttl: Seconds to keep the result, defaults to `default_ttl`.
+        :param tags: Table tags, derived from `sql` when omitted.
+        :return: The cached or freshly loaded result.
+        """
+        key = cache_key(sql, params)
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        tags = set(referenced_tables(sql) if tags is None else tags)
+        generation = self.generation(tags)
+        value = loader()
+        # A write during the load may not be reflected in `value`; then it is returned but not cached.
+        self.put(key, value, ttl, tags, generation)
+        return value
+
+    async def aget_or_load(
+        self,
+        sql: str,
+        params: Any,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """The asyncio counterpart of `get_or_load`; `loader` is a coroutine function."""
+        key = cache_key(sql, params)
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        tags = set(referenced_tables(sql) if tags is None else tags)
+        generation = self.generation(tags)
+        value = await loader()
+        self.put(key, value, ttl, tags, generation)
+        return value
+
+    def generation(self, tags: Iterable[str]) -> int:
+        """A counter that changes whenever one of `tags` is invalidated or the cache is cleared."""
+        with self._lock:
+            return self._generation(set(tags))
+
+    def _generation(self, tags: Set[str]) -> int:
+        generations = self._generations
+        return self._clears + sum(generations.get(tag, 0) for tag in tags | {ANY_TABLE})
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Drop every entry tagged with one of `tags`, and those tagged ANY_TABLE.
+
+        :param tags: Table names.
+        :return: The number of entries removed.
+        """
+        removed = 0
+        tags = set(tags)
+        if not tags:
+            return 0
+        with self._lock:
+            for tag in tags | {ANY_TABLE}:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in self._tags.pop(tag, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+            self._stats.invalidations += removed
+        return removed
+
+    def invalidate_sql(self, sql: str) -> int:
+        """
+        Invalidate entries depending on the tables a write statement modifies.
+
+        Call this after executing any INSERT/UPDATE/DELETE through the adapter.
+        When `on_invalidate` is set it is told about the tables as well, which is
+        how other processes hear about the write (see `publish_invalidation`).
+
+        :param sql: The executed SQL text.
+        :return: The number of entries removed.
+        """
+        tables = written_tables(sql)
+        if not tables:
+            return 0
+        removed = self.invalidate_tags(tables)
+        if self.on_invalidate is not None:
+            self.on_invalidate(tables)
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._size = 0
+            self._clears += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return self._stats.model_copy(update={"entries": len(self._entries), "size_bytes": self._size})
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def publish_invalidation(conn: Any, tables: Iterable[str], channel: str = INVALIDATION_CHANNEL) -> None:
+    """
+    Tell other processes that `tables` changed.
+
+    Suitable as a `ResultCache.on_invalidate` callback via functools.partial.
+
+    :param conn: A psycopg connection.
+    :param tables: The modified table names.
+    :param channel: The NOTIFY channel.
+    """
+    conn.execute("SELECT pg_notify(%s, %s)", (channel, ",".join(sorted(tables))))
+
+
+def listen_for_invalidations(
+    conn: Any,
+    cache: ResultCache,
+    channel: str = INVALIDATION_CHANNEL,
+    timeout: Optional[float] = None,
+    stop_after: Optional[int] = None,
+) -> None:
+    """
+    Invalidate `cache` whenever another process publishes a table change.
+
+    Blocks, so run it in a dedicated thread with its own connection.
+
+    :param conn: A psycopg connection in autocommit mode.
+    :param cache: The cache to invalidate.
+    :param channel: The NOTIFY channel.
+    :param timeout: Stop after this many seconds, or run forever.
+    :param stop_after: Stop after this many notifications, or run forever.
+    """
+    from psycopg import sql as pgsql
+
+    conn.execute(pgsql.SQL("LISTEN {}").format(pgsql.Identifier(channel)))
+    for notify in conn.notifies(timeout=timeout, stop_after=stop_after):
+        if notify.payload:
+            cache.invalidate_tags(notify.payload.split(","))
@@ -0,0 +1,207 @@
+# src/pydantic_sql/change_feed.py
+# Pushes row changes to async consumers with LISTEN/NOTIFY instead of polling tables
+# Notifications are decoded into models in batches, one batch per wakeup of the listening connection
+import asyncio
+import json
+import random
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+from pydantic import ValidationError as PydanticValidationError
+
+from .exceptions import ConfigurationError, ValidationError
+from .instrumentation import instrument
+
+
+class ChangeFeed:
+    """
+    An async iterator over batches of changes published with NOTIFY.
+
+    The feed owns a dedicated autocommit connection that LISTENs on
+    `channels`. Every payload is JSON, decoded into `model` (or left as
+    plain JSON values when no model is given). Each iteration yields all
+    notifications that arrived by the time the consumer asks, up to
+    `max_batch`, so a burst of changes costs one wakeup instead of one per
+    row:
+
+        async for users in ChangeFeed(conninfo, ["users_changed"], User):
+            ...
+
+    If the connection drops, the feed reconnects with capped exponential
+    backoff and LISTENs again. NOTIFY is not queued for absent listeners, so
+    `catch_up(conn)` is then awaited on the new connection to fetch what was
+    missed (e.g. rows newer than the last id the consumer saw); its rows are
+    yielded as a batch before live notifications resume. LISTEN is issued
+    first, so nothing falls in between, but a change may arrive twice and
+    consumers should be idempotent. To release the connection as soon as
+    the consumer stops early, iterate `contextlib.aclosing(feed.batches())`.
+
+    A payload (or catch-up row) that does not decode is left out of its
+    batch rather than ending the feed: it is counted in `invalid` and
+    passed to `on_error` with the ValidationError. At most `max_queued`
+    notifications wait for the consumer; beyond that the feed stops reading
+    and they queue up on the server instead.
+    """
+
+    def __init__(
+        self,
+        conninfo: str,
+        channels: Sequence[str],
+        model: Optional[Type[BaseModel]] = None,
+        catch_up: Optional[Callable[[Any], Awaitable[Iterable[Any]]]] = None,
+        catch_up_on_start: bool = False,
+        max_batch: int = 1000,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        connect: Optional[Callable[[], Awaitable[Any]]] = None,
+        on_error: Optional[Callable[[Any, ValidationError], None]] = None,
+        max_queued: int = 10_000,
+    ):
+        """
+        :param conninfo: Connection string for the dedicated connection.
+        :param channels: The NOTIFY channels to listen on.
+        :param model: Pydantic model each payload is decoded into.
+        :param catch_up: Coroutine function run after every reconnect with the
+            new connection; returns rows (dicts or models) missed while away.
+        :param catch_up_on_start: Also run `catch_up` on the first connection.
+        :param max_batch: Most items per yielded batch.
+        :param reconnect_delay: Backoff before the first reconnect attempt, in seconds.
+        :param max_reconnect_delay: Cap on the reconnect backoff, in seconds.
+        :param connect: Opens the connection instead of psycopg.AsyncConnection.connect.
+        :param on_error: Called with each undecodable notification (or catch-up row) and the error.
+        :param max_queued: Most notifications buffered for a slow consumer.
+        """
+        if not channels:
+            raise ConfigurationError("ChangeFeed needs at least one channel")
+        if max_batch < 1:
+            raise ConfigurationError("max_batch must be at least 1")
+        self.conninfo = conninfo
+        self.channels = list(channels)
+        self.model = model
+        self.catch_up = catch_up
+        self.catch_up_on_start = catch_up_on_start
+        self.max_batch = max_batch
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._connect = connect
+        self.on_error = on_error
+        self.max_queued = max_queued
+        self.invalid = 0
+        self._label = "listen:" + ",".join(self.channels)
+
+    def __aiter__(self) -> AsyncIterator[List[Any]]:
+        return self.batches()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before reconnect attempt `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_reconnect_delay, self.reconnect_delay * 2 ** (attempt - 1)))
+
+    async def batches(self) -> AsyncIterator[List[Any]]:
+        """Yield lists of decoded changes until the consumer stops iterating."""
+        import psycopg
+
+        attempt = 0
+        first = True
+        while True:
+            try:
+                conn = await self._listen()
+            except psycopg.OperationalError:
+                attempt += 1
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+            attempt = 0
+            reader = None
+            try:
+                if self.catch_up is not None and (self.catch_up_on_start or not first):
+                    # Notifications arriving meanwhile are buffered by the connection.
+                    rows = list(await self.catch_up(conn))
+                    for start in range(0, len(rows), self.max_batch):
+                        items = self._decode_rows(rows[start:start + self.max_batch])
+                        if items:
+                            yield items
+                first = False
+
+                queue: asyncio.Queue = asyncio.Queue(self.max_queued)
+                reader = asyncio.ensure_future(self._read(conn, queue))
+                while True:
+                    notifies, error = await self._drain(queue)
+                    items = self._decode_notifies(notifies) if notifies else None
+                    if items:
+                        yield items
+                    if error is not None:
+                        raise error
+            except psycopg.OperationalError:
+                pass
+            finally:
+                if reader is not None:
+                    reader.cancel()
+                    await asyncio.gather(reader, return_exceptions=True)
+                await conn.close()
+
+    async def _listen(self) -> Any:
+        import psycopg
+        from psycopg import sql as pgsql
+
+        if self._connect is not None:
+            conn = await self._connect()
+        else:
+            conn = await psycopg.AsyncConnection.connect(self.conninfo, autocommit=True)
+        try:
+            for channel in self.channels:
+                await conn.execute(pgsql.SQL("LISTEN {}").format(pgsql.Identifier(channel)))
+        except BaseException:
+            await conn.close()
+            raise
+        return conn
+
+    @staticmethod
+    async def _read(conn: Any, queue: asyncio.Queue) -> None:
+        # Runs in its own task; the connection lock is held for as long as it reads.
+        # put() only waits when the queue is full, so a wakeup's notifications still arrive together.
+        try:
+            async for notify in conn.notifies():
+                await queue.put(notify)
+        except Exception as e:
+            await queue.put(e)
+
+    async def _drain(self, queue: asyncio.Queue):
+        # Everything one wakeup delivered is queued before the consumer runs again.
+        notifies = []
+        item = await queue.get()
+        while True:
+            if isinstance(item, Exception):
+                return notifies, item
+            notifies.append(item)
+            if len(notifies) >= self.max_batch or queue.empty():
+                return notifies, None
+            item = queue.get_nowait()
+
+    def _decode_notifies(self, notifies: List[Any]) -> List[Any]:
+        with instrument("map", self._label) as event:
+            items = []
+            for notify in notifies:
+                try:
+                    if self.model is None:
+                        items.append(json.loads(notify.payload))
+                    else:
+                        items.append(self.model.model_validate_json(notify.payload))
+                except (ValueError, PydanticValidationError) as e:
+                    self._invalid(notify, ValidationError(f"Invalid payload on channel {notify.channel!r}: {e}"))
+            event.rows = len(items)
+        return items
+
+    def _invalid(self, item: Any, error: ValidationError) -> None:
+        self.invalid += 1
+        if self.on_error is not None:
+            self.on_error(item, error)
+
+    def _decode_rows(self, rows: List[Any]) -> List[Any]:
+        if self.model is None:
+            return rows
+        items = []
+        for row in rows:
+            try:
+                items.append(row if isinstance(row, self.model) else self.model.model_validate(row))
+            except PydanticValidationError as e:
+                self._invalid(row, ValidationError(f"Catch-up row does not match {self.model.__name__}: {e}"))
+        return items
@@ -0,0 +1,54 @@
+# src/pydantic_sql/cli/catalog.py
+# Collects the named queries of a project from its SQL files
+# Queries are annotated the way the generator expects: /* @name QueryName */ followed by the statement
+# The annotation comment may carry more "@key value" lines, e.g. "@result dataclass"
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+_NAMED_QUERY = re.compile(r"/\*\s*@name\s+(\w+)(.*?)\*/(.*?)(?=/\*\s*@name\s|\Z)", re.DOTALL)
+_OPTION = re.compile(r"@(\w+)[ \t]+([^\n@]*)")
+
+
+def parse_catalog(contents: str) -> Dict[str, str]:
+    """
+    Extract the named queries from the contents of one SQL file.
+
+    :param contents: The file contents.
+    :return: Query name -> SQL text, without the trailing semicolon.
+    """
+    return {
+        name: body.strip().rstrip(";").strip()
+        for name, _, body in _NAMED_QUERY.findall(contents)
+        if body.strip()
+    }
+
+
+def parse_options(contents: str) -> Dict[str, Dict[str, str]]:
+    """
+    Extract the extra annotations of each named query, e.g. {"GetUser": {"result": "dataclass"}}.
+
+    :param contents: The file contents.
+    """
+    return {
+        name: {key: value.strip() for key, value in _OPTION.findall(annotations)}
+        for name, annotations, _ in _NAMED_QUERY.findall(contents)
+    }
+
+
+def load_catalog(paths: Iterable[Union[str, Path]]) -> Dict[str, str]:
+    """
+    Load every named query from SQL files and directories of SQL files.
+
+    When two files define the same name, the first one found wins.
+
+    :param paths: Files or directories (searched recursively for *.sql).
+    :return: Query name -> SQL text.
+    """
+    catalog: Dict[str, str] = {}
+    for path in map(Path, paths):
+        files = sorted(path.rglob("*.sql")) if path.is_dir() else [path]
+        for file in files:
+            for name, sql in parse_catalog(file.read_text()).items():
+                catalog.setdefault(name, sql)
+    return catalog
@@ -0,0 +1,130 @@
+# src/pydantic_sql/cli/commands.py
+# Command-line entry point for code generation and the query analysis tools (generate, stats, analyze)
+# Usage: python -m pydantic_sql.cli.commands [--uri URI] <command> ...
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from ..exceptions import ConfigurationError
+from ..fingerprint import format_report, stat_statements_report
+from ..plan_review import PlanReport, analyze_catalog, diff_reports
+from .catalog import load_catalog, parse_catalog, parse_options
+
+
+def stats_command(args: argparse.Namespace) -> int:
+    import psycopg
+
+    catalog = load_catalog(args.paths)
+    with psycopg.connect(args.uri) as conn:
+        report = stat_statements_report(conn, catalog)
+    if args.json:
+        print(json.dumps([stats.model_dump() for stats in report], indent=2))
+    else:
+        print(format_report(report[: args.limit] if args.limit else report))
+    return 0
+
+
+def analyze_command(args: argparse.Namespace) -> int:
+    try:
+        from psycopg_pool import ConnectionPool
+    except ImportError as e:
+        raise ConfigurationError("The analyze command requires the psycopg_pool package") from e
+
+    catalog = load_catalog(args.paths)
+    params = json.loads(Path(args.params).read_text()) if args.params else {}
+    with ConnectionPool(args.uri, min_size=1, max_size=args.workers) as pool:
+        reports = analyze_catalog(pool, catalog, params, args.workers, args.seq_scan_rows, args.explosion_factor)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps([report.model_dump() for report in reports], indent=2))
+    for report in reports:
+        for problem in [report.error] if report.error else [finding.detail for finding in report.findings]:
+            print(f"{report.name}: {problem}")
+
+    if not args.baseline:
+        return 0
+    baseline = [PlanReport.model_validate(item) for item in json.loads(Path(args.baseline).read_text())]
+    regressions = diff_reports(baseline, reports, args.cost_factor)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def generate_command(args: argparse.Namespace) -> int:
+    import psycopg
+
+    from .python_generator import DescribeCache, describe_catalog, generate_module, generate_package
+
+    files = [file for path in map(Path, args.paths) for file in (sorted(path.rglob("*.sql")) if path.is_dir() else [path])]
+    all_specs = []
+    cache = DescribeCache()
+    with psycopg.connect(args.uri, autocommit=True) as conn:
+        for file in files:
+            contents = file.read_text()
+            catalog = parse_catalog(contents)
+            if not catalog:
+                continue
+            specs = describe_catalog(conn, catalog, file.name, parse_options(contents), cache)
+            if args.package:
+                all_specs += specs
+                continue
+            out_dir = Path(args.out_dir) if args.out_dir else file.parent
+            destination = out_dir / f"{file.stem}_queries.py"
+            destination.write_text(generate_module(specs, file.name, args.result_type))
+            print(f"{file} -> {destination} ({len(specs)} queries)")
+
+    if args.package:
+        generate_package(all_specs, Path(args.package), args.result_type)
+        print(f"{len(files)} files -> {args.package} ({len(all_specs)} queries)")
+    print(f"Described {cache.misses} distinct queries, reused {cache.hits}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pydantic-sql")
+    parser.add_argument("--uri", default="", help="DB connection URI (defaults to the libpq PG* environment variables)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stats = commands.add_parser("stats", help="Report pg_stat_statements figures per named query")
+    stats.add_argument("paths", nargs="+", help="SQL files or directories holding the query catalog")
+    stats.add_argument("--json", action="store_true", help="Print the report as JSON")
+    stats.add_argument("--limit", type=int, default=0, help="Only show the N most expensive queries")
+    stats.set_defaults(handler=stats_command)
+
+    analyze = commands.add_parser("analyze", help="Review the execution plan of every named query")
+    analyze.add_argument("paths", nargs="+", help="SQL files or directories holding the query catalog")
+    analyze.add_argument("--params", help="JSON file of representative values: {query: {param: value}}")
+    analyze.add_argument("--output", help="Write the JSON report to this file")
+    analyze.add_argument("--baseline", help="A previous JSON report; exit 1 on plan regressions against it")
+    analyze.add_argument("--workers", type=int, default=4, help="Queries explained concurrently")
+    analyze.add_argument("--seq-scan-rows", type=float, default=10_000, help="Flag sequential scans of relations this large")
+    analyze.add_argument("--explosion-factor", type=float, default=10, help="Flag joins this many times larger than their inputs")
+    analyze.add_argument("--cost-factor", type=float, default=1.5, help="Cost growth over the baseline that counts as a regression")
+    analyze.set_defaults(handler=analyze_command)
+
+    generate = commands.add_parser("generate", help="Generate Python query modules from SQL files")
+    generate.add_argument("paths", nargs="+", help="SQL files or directories of SQL files")
+    generate.add_argument("--out-dir", help="Write the modules here instead of next to each SQL file")
+    generate.add_argument(
+        "--package", help="Write one lazily loaded package with a module per query to this directory instead"
+    )
+    generate.add_argument(
+        "--result-type",
+        choices=("pydantic", "dataclass", "typeddict"),
+        default="pydantic",
+        help="Result type target; a query's own '@result' annotation overrides it",
+    )
+    generate.set_defaults(handler=generate_command)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
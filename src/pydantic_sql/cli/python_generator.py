@@ -0,0 +1,402 @@
+# src/pydantic_sql/cli/python_generator.py
+# Emits Python query modules from a catalog of named queries
+# Each query becomes a CompiledQuery with its positional SQL, OIDs, binder and mapper written out as code
+import keyword
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from ..exceptions import ConfigurationError, QueryError
+from ..fingerprint import canonical_sql
+from ..model_generator import format_imports, python_type
+from ..query_compiler import to_positional
+from ..type_introspector import ColumnInfo
+
+_STATEMENT_NAME = b"_pydantic_sql_describe"
+
+# Result type targets: validated Pydantic models (the default), or for hot
+# read paths slotted frozen dataclasses / TypedDicts built straight from the
+# row without validation, trusting the types the database sends.
+PYDANTIC = "pydantic"
+DATACLASS = "dataclass"
+TYPEDDICT = "typeddict"
+RESULT_TYPES = (PYDANTIC, DATACLASS, TYPEDDICT)
+
+
+class QuerySpec(BaseModel):
+    name: str
+    sql: str
+    positional_sql: str
+    param_names: List[str]
+    param_oids: List[int]
+    columns: List[ColumnInfo]
+    result_type: Optional[str] = None
+    source: Optional[str] = None
+
+
+def pascal_case(name: str) -> str:
+    parts = re.split(r"[^0-9A-Za-z]+|(?<=[a-z0-9])(?=[A-Z])", name)
+    return "".join(part[:1].upper() + part[1:] for part in parts if part)
+
+
+def snake_case(name: str) -> str:
+    parts = re.split(r"[^0-9A-Za-z]+|(?<=[a-z0-9])(?=[A-Z])", name)
+    return "_".join(part.lower() for part in parts if part)
+
+
+class DescribeCache:
+    """
+    Project-wide describe results, keyed by the canonical positional SQL of a query.
+
+    Placeholder names, comments and whitespace do not change what the server
+    reports, so copies of a lookup spread over many files are described once.
+    """
+
+    def __init__(self):
+        self.specs: Dict[str, QuerySpec] = {}
+        self.hits = 0
+        self.misses = 0
+
+
+def describe_query(conn: Any, name: str, sql: str, cache: Optional[DescribeCache] = None) -> QuerySpec:
+    """
+    Get the parameter and result types of a query from the server.
+
+    The query is prepared and described (no rows are read), then result
+    columns that come straight from a table column are marked non-null when
+    that column is NOT NULL; every other column is treated as nullable.
+
+    :param conn: An idle psycopg connection.
+    :param name: The query name.
+    :param sql: The query, with :name placeholders.
+    :param cache: Reuse the types of an identical query described before.
+    """
+    from psycopg import pq
+
+    positional, names = to_positional(sql)
+    key = canonical_sql(positional)
+    if cache is not None:
+        described = cache.specs.get(key)
+        if described is not None:
+            cache.hits += 1
+            return described.model_copy(update={"name": name, "sql": sql, "positional_sql": positional, "param_names": names})
+
+    pgconn = conn.pgconn
+    result = pgconn.prepare(_STATEMENT_NAME, positional.encode())
+    if result.status != pq.ExecStatus.COMMAND_OK:
+        raise QueryError(f"Query '{name}' is invalid: {result.error_message.decode().strip()}")
+    try:
+        description = pgconn.describe_prepared(_STATEMENT_NAME)
+        param_oids = [description.param_type(i) for i in range(description.nparams)]
+        fields = [
+            (description.fname(i).decode(), description.ftype(i), description.ftable(i), description.ftablecol(i))
+            for i in range(description.nfields)
+        ]
+    finally:
+        pgconn.exec_(b"DEALLOCATE " + _STATEMENT_NAME)
+
+    not_null = set()
+    table_columns = [(table, column) for _, _, table, column in fields if table]
+    if table_columns:
+        rows = conn.execute(
+            "SELECT attrelid, attnum FROM pg_attribute "
+            "WHERE attnotnull AND (attrelid, attnum) IN (SELECT * FROM unnest(%s::oid[], %s::int[]))",
+            ([table for table, _ in table_columns], [column for _, column in table_columns]),
+        ).fetchall()
+        not_null = set(rows)
+
+    columns = [
+        ColumnInfo(
+            name=field_name,
+            type_oid=type_oid,
+            nullable=(table, column) not in not_null,
+            table_oid=table,
+            column_num=column,
+        )
+        for field_name, type_oid, table, column in fields
+    ]
+    spec = QuerySpec(
+        name=name, sql=sql, positional_sql=positional, param_names=names, param_oids=param_oids, columns=columns
+    )
+    if cache is not None:
+        cache.misses += 1
+        cache.specs[key] = spec
+    return spec
+
+
+def _is_python_name(name: str) -> bool:
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+def _check_columns(spec: QuerySpec) -> None:
+    seen = set()
+    for column in spec.columns:
+        if column.name == "?column?":
+            raise QueryError(
+                f"Query '{spec.name}' contains an anonymous column. Consider giving the column an explicit name."
+            )
+        if not _is_python_name(column.name):
+            raise QueryError(f"Query '{spec.name}': column {column.name!r} is not a valid Python name; alias it")
+        if column.name in seen:
+            raise QueryError(f"Query '{spec.name}' returns column {column.name!r} more than once")
+        seen.add(column.name)
+
+
+def _class_block(name: str, base: Optional[str], fields: Sequence[str]) -> str:
+    header = f"class {name}({base}):\n" if base else f"class {name}:\n"
+    return header + "".join(f"    {field}\n" for field in fields)
+
+
+def _result_block(spec: QuerySpec, result_class: str, result_type: str, imports: set) -> Tuple[str, str]:
+    # Returns the class definition and the mapper expression.
+    fields = []
+    for column in spec.columns:
+        annotation, needed = python_type(column.type_oid, column.nullable)
+        imports.update(needed)
+        fields.append(f"{column.name}: {annotation}")
+
+    if result_type == DATACLASS:
+        imports.add("from dataclasses import dataclass")
+        block = "@dataclass(slots=True, frozen=True)\n" + _class_block(result_class, None, fields)
+        block += f"\n    @classmethod\n    def from_row(cls, row: tuple) -> \"{result_class}\":\n        return cls(*row)\n"
+        return block, f"lambda row: {result_class}(*row)"
+
+    if result_type == TYPEDDICT:
+        imports.add("from typing import TypedDict")
+        # Calling a TypedDict class just builds a dict, so the mapper builds it directly.
+        block = _class_block(result_class, "TypedDict", fields)
+        keys = ", ".join(f"{column.name!r}: row[{i}]" for i, column in enumerate(spec.columns))
+        return block, f"lambda row: {{{keys}}}"
+
+    imports.add("from pydantic import BaseModel")
+    values = ", ".join(f"{column.name}=row[{i}]" for i, column in enumerate(spec.columns))
+    return _class_block(result_class, "BaseModel", fields), f"lambda row: {result_class}({values})"
+
+
+def result_shape(spec: QuerySpec, result_type: str = PYDANTIC) -> Tuple:
+    """What decides a query's result class; queries with equal shapes share one class."""
+    return (spec.result_type or result_type,) + tuple((c.name, c.type_oid, c.nullable) for c in spec.columns)
+
+
+def generate_query(spec: QuerySpec, imports: set, result_type: str = PYDANTIC, shared_result: Optional[str] = None) -> str:
+    """
+    Generate the code for one query: its params/result types and its CompiledQuery.
+
+    :param spec: The described query.
+    :param imports: Collects the import lines the code needs.
+    :param result_type: PYDANTIC, DATACLASS or TYPEDDICT; `spec.result_type` overrides it.
+    :param shared_result: An already defined result class of the same shape;
+        the query's result name becomes an alias of it.
+    """
+    result_type = spec.result_type or result_type
+    if result_type not in RESULT_TYPES:
+        raise ConfigurationError(f"Query '{spec.name}': unknown result type {result_type!r}, expected one of {RESULT_TYPES}")
+    _check_columns(spec)
+    class_name = pascal_case(spec.name)
+    blocks = []
+
+    if spec.param_names:
+        imports.add("from typing import TypedDict")
+        fields = []
+        for param, oid in zip(spec.param_names, spec.param_oids):
+            annotation, needed = python_type(oid)
+            imports.update(needed)
+            fields.append((param, annotation))
+        if all(_is_python_name(param) for param in spec.param_names):
+            blocks.append(_class_block(f"{class_name}Params", "TypedDict", [f"{p}: {a}" for p, a in fields]))
+        else:
+            # Placeholders like :from or :to cannot be class fields; the functional form takes any key.
+            items = ", ".join(f"{param!r}: {annotation}" for param, annotation in fields)
+            blocks.append(f"{class_name}Params = TypedDict({class_name + 'Params'!r}, {{{items}}})\n")
+
+    mapper = None
+    if spec.columns and shared_result is not None:
+        _, mapper = _result_block(spec, shared_result, result_type, set())
+        blocks.append(f"{class_name}Result = {shared_result}\n")
+    elif spec.columns:
+        block, mapper = _result_block(spec, f"{class_name}Result", result_type, imports)
+        blocks.append(block)
+
+    arguments = [
+        f"name={spec.name!r}",
+        f"sql={spec.positional_sql!r}",
+        f"param_names={tuple(spec.param_names)!r}",
+        f"param_oids={tuple(spec.param_oids)!r}",
+        f"result_columns={tuple(column.name for column in spec.columns)!r}",
+        f"result_oids={tuple(column.type_oid for column in spec.columns)!r}",
+    ]
+    if spec.param_names:
+        # Same behavior as query_compiler.make_binder: a mapping, or an object with the names as attributes.
+        imports.add("from collections.abc import Mapping")
+        items = "".join(f"params[{param!r}], " for param in spec.param_names).rstrip(" ")
+        attributes = "".join(
+            f"params.{param}, " if _is_python_name(param) else f"getattr(params, {param!r}), "
+            for param in spec.param_names
+        ).rstrip(" ")
+        arguments.append(f"binder=lambda params: ({items}) if isinstance(params, Mapping) else ({attributes})")
+    if mapper is not None:
+        arguments.append(f"mapper={mapper}")
+
+    body = "".join(f"    {argument},\n" for argument in arguments)
+    blocks.append(f"{snake_case(spec.name)} = CompiledQuery(\n{body})\n")
+    return "\n\n".join(blocks)
+
+
+def generate_module(
+    specs: Sequence[QuerySpec],
+    source: Optional[str] = None,
+    result_type: str = PYDANTIC,
+    shared_results: Optional[Dict[str, Tuple[str, str]]] = None,
+) -> str:
+    """
+    Generate a Python module defining every query in `specs`.
+
+    A result class is defined once per shape; later queries returning the
+    same columns alias it.
+
+    :param specs: The described queries.
+    :param source: The SQL file the queries came from, for the header comment.
+    :param result_type: The default result type target for queries without their own.
+    :param shared_results: Query name -> (import line, class name) for results
+        whose class is defined in another module.
+    :return: The module source.
+    """
+    imports = {"from pydantic_sql.query_compiler import CompiledQuery"}
+    shared_results = shared_results or {}
+    defined: Dict[Tuple, str] = {}
+    blocks = []
+    for spec in specs:
+        shared = None
+        if spec.name in shared_results:
+            line, shared = shared_results[spec.name]
+            imports.add(line)
+        elif spec.columns:
+            shape = result_shape(spec, result_type)
+            shared = defined.get(shape)
+            defined.setdefault(shape, f"{pascal_case(spec.name)}Result")
+        blocks.append(generate_query(spec, imports, result_type, shared))
+    header = f"# Generated by pydantic_sql from {source}. Do not edit.\n" if source else "# Generated by pydantic_sql. Do not edit.\n"
+    return header + "\n".join(format_imports(imports)) + "\n\n\n" + "\n\n".join(blocks)
+
+
+def describe_catalog(
+    conn: Any,
+    catalog: Dict[str, str],
+    source: Optional[str] = None,
+    options: Optional[Dict[str, Dict[str, str]]] = None,
+    cache: Optional[DescribeCache] = None,
+) -> List[QuerySpec]:
+    """
+    Describe every query of one SQL file.
+
+    :param source: The file name, recorded on each spec.
+    :param options: Per-query annotations; an "@result" annotation sets the spec's result type.
+    :param cache: Shared across the files of a project, so repeated queries are described once.
+    """
+    options = options or {}
+    specs = []
+    for name, sql in catalog.items():
+        spec = describe_query(conn, name, sql, cache)
+        spec.result_type = options.get(name, {}).get("result")
+        spec.source = source
+        specs.append(spec)
+    return specs
+
+
+def exported_names(spec: QuerySpec) -> List[str]:
+    """The module-level names generate_query() defines for a query."""
+    class_name = pascal_case(spec.name)
+    names = [snake_case(spec.name)]
+    if spec.param_names:
+        names.append(f"{class_name}Params")
+    if spec.columns:
+        names.append(f"{class_name}Result")
+    return names
+
+
+_INDEX_TEMPLATE = """\
+# Generated by pydantic_sql. Do not edit.
+# Index of the query package: each query and its types are imported from their own module on first access.
+import importlib
+
+TYPE_CHECKING = False
+
+# Name -> module defining it
+_MODULES = {{
+{entries}}}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+    value = getattr(importlib.import_module(f".{{module}}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+{type_checking}"""
+
+
+def generate_index(specs: Sequence[QuerySpec]) -> str:
+    """
+    Generate the __init__ of a lazy query package.
+
+    Only a name -> module dict is built at import time, so importing the
+    package costs the same for ten queries or ten thousand; a query's module,
+    with its model classes, is imported when the query is first used.
+    """
+    entries = []
+    imports = []
+    for spec in specs:
+        module = _module_name(spec)
+        names = exported_names(spec)
+        entries += [f"    {name!r}: {module!r},\n" for name in names]
+        imports.append(f"    from .{module} import {', '.join(names)}\n")
+    return _INDEX_TEMPLATE.format(entries="".join(entries), type_checking="".join(imports) or "    pass\n")
+
+
+def _module_name(spec: QuerySpec) -> str:
+    # Underscored so the module never shares a name with the query object it defines.
+    return f"_{snake_case(spec.name)}"
+
+
+def generate_package(specs: Sequence[QuerySpec], package_dir: Path, result_type: str = PYDANTIC) -> None:
+    """
+    Write a consolidated, lazily loaded package: one module per query plus an index.
+
+    :param specs: Every query of the project.
+    :param package_dir: The package directory; created if missing.
+    :param result_type: The default result type target.
+    """
+    seen: Dict[str, QuerySpec] = {}
+    for spec in specs:
+        other = seen.setdefault(_module_name(spec), spec)
+        if other is not spec:
+            raise ConfigurationError(
+                f"Queries '{other.name}' ({other.source}) and '{spec.name}' ({spec.source}) "
+                "generate the same module name; rename one of them"
+            )
+
+    # One result class per shape across the project, in the module of the first query returning it.
+    owners: Dict[Tuple, QuerySpec] = {}
+    package_dir.mkdir(parents=True, exist_ok=True)
+    for spec in specs:
+        shared_results = {}
+        if spec.columns:
+            owner = owners.setdefault(result_shape(spec, result_type), spec)
+            if owner is not spec:
+                class_name = f"{pascal_case(owner.name)}Result"
+                shared_results[spec.name] = (f"from .{_module_name(owner)} import {class_name}", class_name)
+        source = generate_module([spec], spec.source, result_type, shared_results)
+        (package_dir / f"{_module_name(spec)}.py").write_text(source)
+    (package_dir / "__init__.py").write_text(generate_index(specs))
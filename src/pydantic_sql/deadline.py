@@ -0,0 +1,94 @@
+# src/pydantic_sql/deadline.py
+# Per-call query deadlines enforced by the server
+# Sets statement_timeout/lock_timeout for one transaction (or savepoint) and restores the previous values on exit
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Optional
+
+from .exceptions import handle_db_error
+
+# The select list is evaluated left to right, so the previous values are read before they are replaced.
+_SET_TIMEOUTS = (
+    "SELECT current_setting('statement_timeout'), current_setting('lock_timeout'),"
+    " set_config('statement_timeout', %s, true), set_config('lock_timeout', %s, true)"
+)
+_RESTORE_TIMEOUTS = (
+    "SELECT set_config('statement_timeout', %s, true), set_config('lock_timeout', %s, true)"
+)
+
+
+def _timeout_params(timeout: float, lock_timeout: Optional[float]) -> tuple:
+    # 0 disables a timeout in Postgres, so round up to at least 1ms.
+    statement_ms = max(int(timeout * 1000), 1)
+    lock_ms = statement_ms if lock_timeout is None else max(int(lock_timeout * 1000), 1)
+    return f"{statement_ms}ms", f"{lock_ms}ms"
+
+
+class Deadline:
+    """
+    An absolute point in time shared by every query of one request.
+
+    Create it when the request arrives and pass `deadline.remaining()` as the
+    timeout of each query, so the whole request, not each query, is bounded.
+    An adapter-wide default is simply a Deadline created per unit of work.
+    """
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+
+@contextmanager
+def deadline(conn: Any, timeout: float, lock_timeout: Optional[float] = None):
+    """
+    Run the block in a transaction bounded by `timeout` seconds.
+
+    The timeouts are set with SET LOCAL semantics, so they disappear when the
+    transaction ends and the connection goes back to its pool clean. Inside
+    an outer transaction the block runs in a savepoint, whose release would
+    keep them until the outer commit, so the previous values are put back
+    when the block exits normally (a rollback undoes them by itself). Errors
+    are converted with handle_db_error: a statement timeout raises
+    QueryTimeoutError and a lock that is not granted in time LockTimeoutError.
+
+    :param conn: A psycopg connection.
+    :param timeout: Seconds the statements may run (statement_timeout).
+    :param lock_timeout: Seconds to wait for any one lock, defaults to `timeout`.
+    """
+    import psycopg
+
+    try:
+        with conn.transaction():
+            previous = conn.execute(_SET_TIMEOUTS, _timeout_params(timeout, lock_timeout)).fetchone()[:2]
+            yield conn
+            conn.execute(_RESTORE_TIMEOUTS, previous)
+    except psycopg.Error as e:
+        raise handle_db_error(e, lock_timeout=True) from e
+
+
+@asynccontextmanager
+async def adeadline(conn: Any, timeout: float, lock_timeout: Optional[float] = None):
+    """
+    The asyncio counterpart of `deadline`.
+
+    If the awaiting task is cancelled while a query is running (the HTTP
+    caller went away), psycopg itself sends a cancel request before the
+    CancelledError reaches the block, so the transaction is rolled back and
+    the connection can be reused.
+    """
+    import psycopg
+
+    try:
+        async with conn.transaction():
+            cursor = await conn.execute(_SET_TIMEOUTS, _timeout_params(timeout, lock_timeout))
+            previous = (await cursor.fetchone())[:2]
+            yield conn
+            await conn.execute(_RESTORE_TIMEOUTS, previous)
+    except psycopg.Error as e:
+        raise handle_db_error(e, lock_timeout=True) from e
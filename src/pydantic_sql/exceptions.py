@@ -36,17 +36,74 @@ class DynamicParameterError(PydanticSQLException):
     """Raised when there's a validation error with Pydantic models."""
     pass
 
+class QueryTimeoutError(QueryError):
+    """Raised when a query is cancelled by its deadline (statement_timeout or a cancel request)."""
+    pass
+
+class LockNotAvailableError(QueryError):
+    """Raised when a lock could not be taken (SQLSTATE 55P03), e.g. by NOWAIT."""
+    pass
+
+class LockTimeoutError(LockNotAvailableError, QueryTimeoutError):
+    """Raised when a query gives up waiting for a lock while a lock_timeout deadline is active."""
+    pass
+
+class RetryableError(TransactionError):
+    """Raised when a transaction was rolled back because of contention; re-running it may succeed."""
+    pass
+
+class SerializationError(RetryableError):
+    """Raised when a transaction could not be serialized with concurrent ones (SQLSTATE 40001)."""
+    pass
+
+class DeadlockError(RetryableError):
+    """Raised when a transaction was chosen as a deadlock victim (SQLSTATE 40P01)."""
+    pass
+
+class ResultTooLargeError(QueryError):
+    """Raised when a result set grows past its memory budget."""
+    pass
+
 # You can add more specific exceptions as needed
 
-def handle_db_error(error: Exception) -> PydanticSQLException:
+# SQLSTATE codes mapped to the exception raised for them
+SQLSTATE_EXCEPTIONS = {
+    "57014": QueryTimeoutError,   # query_canceled
+    "55P03": LockNotAvailableError,  # lock_not_available
+    "40001": SerializationError,  # serialization_failure
+    "40P01": DeadlockError,       # deadlock_detected
+}
+
+# SQLSTATE classes (first two characters) for codes not listed above
+SQLSTATE_CLASS_EXCEPTIONS = {
+    "08": ConnectionError,   # connection_exception
+    "40": TransactionError,  # transaction_rollback
+}
+
+def handle_db_error(error: Exception, lock_timeout: bool = False) -> PydanticSQLException:
     """
     Convert database-specific errors to PydanticSQL exceptions.
+
+    psycopg errors carry their SQLSTATE in `error.sqlstate`. Codes listed in
+    SQLSTATE_EXCEPTIONS get their own exception type, then the code's class is
+    looked up in SQLSTATE_CLASS_EXCEPTIONS, and everything else becomes a
+    QueryError. The SQLSTATE is kept on the returned exception.
+
+    55P03 is raised both by lock_timeout and by NOWAIT or SKIP LOCKED-style
+    refusals, so it only becomes a LockTimeoutError when the caller says a
+    lock_timeout was in force; otherwise it is a plain LockNotAvailableError.
     
     :param error: The original database error.
+    :param lock_timeout: Whether a lock_timeout deadline was active.
     :return: A PydanticSQLException.
     """
-    # This is a placeholder implementation. You'll need to expand this
-    # to handle specific database errors and convert them to appropriate
-    # PydanticSQL exceptions.
-    return QueryError(str(error))
+    sqlstate = getattr(error, "sqlstate", None)
+    exception_class = SQLSTATE_EXCEPTIONS.get(sqlstate)
+    if exception_class is None:
+        exception_class = SQLSTATE_CLASS_EXCEPTIONS.get((sqlstate or "")[:2], QueryError)
+    elif lock_timeout and exception_class is LockNotAvailableError:
+        exception_class = LockTimeoutError
+    exception = exception_class(str(error))
+    exception.sqlstate = sqlstate
+    return exception
 
@@ -0,0 +1,161 @@
+# src/pydantic_sql/fingerprint.py
+# Normalizes SQL the way pg_stat_statements does and correlates queries with its statistics
+# Literals and placeholders become "?", comments are dropped and whitespace collapsed
+import hashlib
+import re
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+_TOKENS = re.compile(
+    r"""
+    (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<string>[EeBbXxNn]?'(?:[^']|'')*'|\$(?P<tag>[A-Za-z_]*)\$.*?\$(?P=tag)\$)
+    | (?P<ident>"(?:[^"]|"")*")
+    | (?P<param>%\(\w+\)s|%s|\$\d+|(?<!:):[A-Za-z_]\w*!?)
+    | (?P<number>(?<![\w.])(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?(?![\w.]))
+    | (?P<space>\s+)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+_NEGATED_CONSTANT = re.compile(r"([(,=<>+*/]|\b(?:and|or|in|then|else|when|select|values|by|between))\s*-\s*\?")
+_CONSTANT_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+# A single placeholder may be expanded to a list client-side, so IN (?) counts as a list too.
+_IN_LIST = re.compile(r"\bin \(\?\)")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normalize a query for matching against pg_stat_statements.
+
+    Constants (strings, numbers) and placeholders of every style (%s,
+    %(name)s, $1, :name) become "?", lists of them collapse to "?, ...",
+    comments are removed, whitespace is collapsed and everything outside
+    quoted identifiers is lower-cased. Two queries that pg_stat_statements
+    would count together normalize to the same text.
+
+    :param sql: The SQL text, or a query text taken from pg_stat_statements.
+    :return: The normalized text.
+    """
+    text = re.sub(" {2,}", " ", "".join(_scan(sql))).strip().rstrip(";").strip()
+    text = _NEGATED_CONSTANT.sub(r"\1 ?", text)
+    text = _CONSTANT_LIST.sub("?, ...", text)
+    return _IN_LIST.sub("in (?, ...)", text)
+
+
+def _scan(sql: str) -> List[str]:
+    parts = []
+    position = 0
+    for match in _TOKENS.finditer(sql):
+        parts.append(sql[position:match.start()].lower())
+        position = match.end()
+        kind = match.lastgroup if match.lastgroup != "tag" else "string"
+        if kind in ("string", "param", "number"):
+            parts.append("?")
+        elif kind == "ident":
+            parts.append(match.group())
+        else:
+            parts.append(" ")
+    parts.append(sql[position:].lower())
+    return parts
+
+
+def canonical_sql(sql: str) -> str:
+    """
+    Drop comments and collapse whitespace, keeping everything else as written.
+
+    Unlike `normalize_sql`, literals and placeholders are kept, since they can
+    change the types a query has, so two texts with the same canonical form
+    always describe the same. Used to key type inference.
+    """
+    parts = []
+    position = 0
+    for match in _TOKENS.finditer(sql):
+        if match.start() > position:
+            parts.append(sql[position:match.start()])
+        position = match.end()
+        if match.lastgroup not in ("comment", "space"):
+            parts.append(match.group())
+        elif parts and parts[-1] != " ":
+            # Whitespace inside literals is part of the literal, so runs are merged here, not with a regex.
+            parts.append(" ")
+    parts.append(sql[position:])
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def fingerprint(sql: str) -> str:
+    """
+    A stable identifier for the shape of a query.
+
+    :param sql: The SQL text.
+    :return: The first 16 hex digits of the SHA-1 of `normalize_sql(sql)`.
+    """
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+class StatementStats(BaseModel):
+    name: str
+    fingerprint: str
+    calls: int = 0
+    total_ms: float = 0.0
+    mean_ms: float = 0.0
+    rows: int = 0
+    shared_blks_hit: int = 0
+    shared_blks_read: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        blocks = self.shared_blks_hit + self.shared_blks_read
+        return self.shared_blks_hit / blocks if blocks else 1.0
+
+
+def stat_statements_report(conn: Any, catalog: Dict[str, str]) -> List[StatementStats]:
+    """
+    Join pg_stat_statements with a catalog of named queries.
+
+    Server rows are matched by normalized text, so rows for the same query
+    under different users, databases or queryids are summed together.
+    Catalog queries the server has not seen are reported with zero calls.
+
+    :param conn: A psycopg connection to a database with pg_stat_statements installed.
+    :param catalog: Query name -> SQL text.
+    :return: One entry per catalog query, by total time descending.
+    """
+    # Postgres 13 split total_time into planning and execution time.
+    time_column = "total_exec_time" if conn.info.server_version >= 130000 else "total_time"
+    rows = conn.execute(
+        f"SELECT query, calls, {time_column}, rows, shared_blks_hit, shared_blks_read FROM pg_stat_statements"
+    ).fetchall()
+
+    # Catalog queries of the same shape are one statement to the server, so each gets its figures.
+    by_fingerprint: Dict[str, List[StatementStats]] = {}
+    report = []
+    for name, sql in catalog.items():
+        stats = StatementStats(name=name, fingerprint=fingerprint(sql))
+        by_fingerprint.setdefault(stats.fingerprint, []).append(stats)
+        report.append(stats)
+
+    for query, calls, total_ms, row_count, blks_hit, blks_read in rows:
+        for stats in by_fingerprint.get(fingerprint(query), ()):
+            stats.calls += calls
+            stats.total_ms += total_ms
+            stats.rows += row_count
+            stats.shared_blks_hit += blks_hit
+            stats.shared_blks_read += blks_read
+
+    for stats in report:
+        stats.mean_ms = stats.total_ms / stats.calls if stats.calls else 0.0
+    return sorted(report, key=lambda stats: stats.total_ms, reverse=True)
+
+
+def format_report(report: List[StatementStats]) -> str:
+    """Render a report as a fixed-width text table."""
+    header = f"{'query':<40} {'calls':>10} {'total ms':>12} {'mean ms':>10} {'rows':>10} {'hit %':>6}"
+    lines = [header, "-" * len(header)]
+    for stats in report:
+        lines.append(
+            f"{stats.name[:40]:<40} {stats.calls:>10} {stats.total_ms:>12.1f} {stats.mean_ms:>10.3f} "
+            f"{stats.rows:>10} {stats.hit_ratio * 100:>6.1f}"
+        )
+    return "\n".join(lines)
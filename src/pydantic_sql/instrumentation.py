@@ -0,0 +1,238 @@
+# src/pydantic_sql/instrumentation.py
+# Before/after hooks around the compile, execute, fetch and map phases of a query
+# Includes an in-memory aggregator with HDR-style latency histograms per query
+import functools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .fingerprint import fingerprint
+
+PHASES = ("compile", "execute", "fetch", "map")
+
+_hooks: List["Hook"] = []
+
+
+class QueryEvent:
+    """What a hook learns about one phase of one query."""
+
+    __slots__ = ("phase", "query", "params_count", "rows", "bytes", "duration", "error")
+
+    def __init__(self, phase: str, query: str, params_count: int):
+        self.phase = phase
+        self.query = query
+        self.params_count = params_count
+        self.rows: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.duration: float = 0.0
+        self.error: Optional[BaseException] = None
+
+
+class Hook:
+    """Base class for instrumentation hooks; override either method."""
+
+    def before(self, event: QueryEvent) -> None:
+        pass
+
+    def after(self, event: QueryEvent) -> None:
+        pass
+
+    def slow_query(self, entry: Any) -> None:
+        """Called with each SlowQuery captured by a SlowQueryLog."""
+        pass
+
+
+def add_hook(hook: Hook) -> None:
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    _hooks.remove(hook)
+
+
+def dispatch_slow_query(entry: Any) -> None:
+    for hook in list(_hooks):
+        hook.slow_query(entry)
+
+
+@functools.lru_cache(maxsize=4096)
+def query_label(sql: str) -> str:
+    """
+    A short stable label for a query that has no name.
+
+    This is the query's fingerprint, so client-side figures line up with the
+    pg_stat_statements report for the same statement. Callers ask for it on
+    every execution, hooks or not, so labels are memoized per SQL text.
+    """
+    return fingerprint(sql)
+
+
+class _Span:
+    __slots__ = ("event", "_hooks", "_start")
+
+    def __init__(self, event: QueryEvent, hooks: List[Hook]):
+        self.event = event
+        self._hooks = hooks
+
+    def __enter__(self) -> QueryEvent:
+        for hook in self._hooks:
+            hook.before(self.event)
+        self._start = time.perf_counter()
+        return self.event
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.event.duration = time.perf_counter() - self._start
+        self.event.error = exc
+        for hook in self._hooks:
+            hook.after(self.event)
+        return False
+
+
+class _NullEvent:
+    # Accepts and drops the attributes callers set on a real event.
+    __slots__ = ()
+
+    def __setattr__(self, name, value) -> None:
+        pass
+
+
+class _NullSpan:
+    __slots__ = ()
+    _event = _NullEvent()
+
+    def __enter__(self) -> _NullEvent:
+        return self._event
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def instrument(phase: str, query: str, params_count: int = 0):
+    """
+    Time one phase of a query and report it to the registered hooks.
+
+    Use as `with instrument("execute", name, len(params)) as event:` and set
+    `event.rows` / `event.bytes` inside the block. With no hooks registered
+    this returns a shared no-op context manager without building an event.
+
+    :param phase: One of PHASES.
+    :param query: The query name or fingerprint.
+    :param params_count: The number of bound parameters.
+    """
+    if not _hooks:
+        return _NULL_SPAN
+    return _Span(QueryEvent(phase, query, params_count), list(_hooks))
+
+
+class LatencyHistogram:
+    """
+    A log-linear histogram of durations in microseconds.
+
+    Like HdrHistogram, each power of two is split into 32 linear sub-buckets,
+    so recorded values keep ~3% precision from 1us to hours in a few hundred
+    sparse buckets, and percentiles cost O(buckets) instead of O(samples).
+    """
+
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @classmethod
+    def bucket_index(cls, value: int) -> int:
+        shift = max(value.bit_length() - cls.SUB_BUCKET_BITS - 1, 0)
+        return shift * cls.SUB_BUCKETS + (value >> shift)
+
+    @classmethod
+    def bucket_value(cls, index: int) -> int:
+        """The lowest value that falls into bucket `index`."""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.SUB_BUCKETS - 1
+        return (index - shift * cls.SUB_BUCKETS) << shift
+
+    def record(self, seconds: float) -> None:
+        value = int(seconds * 1_000_000)
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> int:
+        """The value in microseconds at or below which `p` percent of samples fall."""
+        if not self.count:
+            return 0
+        target = max(p / 100 * self.count, 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self.bucket_value(index + 1) - 1, self.max)
+        return self.max
+
+
+class PhaseStats(BaseModel):
+    count: int
+    errors: int
+    rows: int
+    bytes: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class QueryStatsAggregator(Hook):
+    """
+    Collects per-query, per-phase latency histograms and row/byte totals.
+
+    Register it with add_hook() and read the figures with snapshot().
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def after(self, event: QueryEvent) -> None:
+        key = (event.query, event.phase)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = [LatencyHistogram(), 0, 0, 0]
+            stats[0].record(event.duration)
+            stats[1] += event.error is not None
+            stats[2] += event.rows or 0
+            stats[3] += event.bytes or 0
+
+    def snapshot(self) -> Dict[str, Dict[str, PhaseStats]]:
+        """Return {query: {phase: PhaseStats}} for everything recorded so far."""
+        result: Dict[str, Dict[str, PhaseStats]] = {}
+        with self._lock:
+            for (query, phase), (histogram, errors, rows, size) in self._stats.items():
+                result.setdefault(query, {})[phase] = PhaseStats(
+                    count=histogram.count,
+                    errors=errors,
+                    rows=rows,
+                    bytes=size,
+                    mean_ms=histogram.total / histogram.count / 1000,
+                    p50_ms=histogram.percentile(50) / 1000,
+                    p95_ms=histogram.percentile(95) / 1000,
+                    p99_ms=histogram.percentile(99) / 1000,
+                    max_ms=histogram.max / 1000,
+                )
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,189 @@
+# src/pydantic_sql/large_values.py
+# Reads large bytea/text values without extra copies
+# Values are exposed as memoryviews over the result buffer, or streamed in chunks into a writable
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterator, List, Sequence
+
+from psycopg import sql as pgsql
+from psycopg.adapt import Loader
+from psycopg.pq import Format, TransactionStatus
+from psycopg.rows import dict_row
+
+from .exceptions import ConfigurationError
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class MemoryViewLoader(Loader):
+    """
+    Load binary bytea values as memoryviews instead of bytes.
+
+    With the C implementation of psycopg the buffer handed to Python loaders
+    already points into the libpq result, so the view costs no copy. The view
+    keeps the result alive for as long as it is referenced.
+    """
+
+    format = Format.BINARY
+
+    def load(self, data: Any) -> memoryview:
+        return memoryview(data)
+
+
+def fetch_with_views(
+    conn: Any, sql: str, params: Any = None, columns: Sequence[str] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Run a query in binary mode, returning bytea columns in `columns` as memoryviews.
+
+    Other bytea columns are converted to bytes as usual. Models that declare
+    those fields as `bytes` copy the value again, so hand the views to code
+    that accepts a buffer (file writes, hashing, socket sends).
+
+    :param conn: A psycopg connection.
+    :param sql: The SQL text.
+    :param params: The query parameters.
+    :param columns: Names of the bytea columns to expose as views.
+    :return: A list of row dicts.
+    """
+    with conn.cursor(binary=True, row_factory=dict_row) as cur:
+        cur.adapters.register_loader("bytea", MemoryViewLoader)
+        rows = cur.execute(sql, params).fetchall()
+    keep = set(columns)
+    for row in rows:
+        for name, value in row.items():
+            if isinstance(value, memoryview) and name not in keep:
+                row[name] = value.tobytes()
+    return rows
+
+
+def iter_value_chunks(
+    conn: Any,
+    table: str,
+    column: str,
+    key_column: str,
+    key: Any,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    text: bool = False,
+) -> Iterator[memoryview]:
+    """
+    Yield a large bytea or text value in chunks using substring().
+
+    Only one chunk is held in memory at a time. For bytea columns set
+    `ALTER TABLE ... ALTER COLUMN ... SET STORAGE EXTERNAL` so the server can
+    read each slice directly instead of decompressing the whole value per chunk.
+
+    Every chunk is its own statement, so they must all see one snapshot or a
+    concurrent UPDATE could splice two versions of the value together. On an
+    idle connection the chunks are read in a REPEATABLE READ transaction of
+    their own; inside a transaction, the caller's must be REPEATABLE READ or
+    SERIALIZABLE, otherwise ConfigurationError is raised.
+
+    :param conn: A psycopg connection.
+    :param table: The table holding the value, resolved through the search_path like in a query.
+    :param column: The bytea or text column.
+    :param key_column: A unique column identifying the row.
+    :param key: The value of `key_column` for the row.
+    :param chunk_size: Bytes per chunk (characters for text columns).
+    :param text: Set for text columns; chunks are returned UTF-8 encoded.
+    """
+    # Each row carries the chunk and its length in substring() units
+    # (characters for text), which is what the next offset is counted in.
+    if text:
+        chunk, length = pgsql.SQL("convert_to(_v, 'UTF8')"), pgsql.SQL("char_length(_v)")
+    else:
+        chunk, length = pgsql.SQL("_v"), pgsql.SQL("octet_length(_v)")
+    with _one_snapshot(conn):
+        # regclass output is quoted and schema-qualified as needed, so "sales.files" works.
+        relation = conn.execute("SELECT %s::regclass::text", (table,)).fetchone()[0]
+        query = pgsql.SQL(
+            "SELECT {chunk}, {length} FROM (SELECT substring({column} FROM %s::int FOR %s::int) AS _v "
+            "FROM {table} WHERE {key} = %s) AS _chunk"
+        ).format(
+            chunk=chunk,
+            length=length,
+            column=pgsql.Identifier(column),
+            table=pgsql.SQL(relation),
+            key=pgsql.Identifier(key_column),
+        )
+        yield from _iter_chunks(conn, query, lambda offset: (offset + 1, chunk_size, key), chunk_size)
+
+
+def iter_large_object_chunks(conn: Any, oid: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Yield a large object (pg_largeobject) in chunks using lo_get().
+
+    The chunks are read in one snapshot, as in `iter_value_chunks`.
+
+    :param conn: A psycopg connection.
+    :param oid: The large object OID.
+    :param chunk_size: Bytes per chunk.
+    """
+    query = "SELECT _v, octet_length(_v) FROM lo_get(%s::oid, %s::bigint, %s::int) AS _v"
+    with _one_snapshot(conn):
+        yield from _iter_chunks(conn, query, lambda offset: (oid, offset, chunk_size), chunk_size)
+
+
+@contextmanager
+def _one_snapshot(conn: Any) -> Iterator[None]:
+    if conn.info.transaction_status == TransactionStatus.IDLE:
+        with conn.transaction():
+            conn.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            yield
+        return
+    isolation = conn.execute("SELECT current_setting('transaction_isolation')").fetchone()[0]
+    if isolation in ("read committed", "read uncommitted"):
+        raise ConfigurationError(
+            f"Reading a value in chunks needs one snapshot; the open transaction is {isolation}. "
+            "Use REPEATABLE READ, or call it outside a transaction"
+        )
+    yield
+
+
+def _iter_chunks(conn: Any, query: Any, params_for: Any, chunk_size: int) -> Iterator[memoryview]:
+    offset = 0
+    with conn.cursor(binary=True) as cur:
+        cur.adapters.register_loader("bytea", MemoryViewLoader)
+        while True:
+            row = cur.execute(query, params_for(offset)).fetchone()
+            if row is None or not row[1]:
+                return
+            chunk, length = row
+            yield chunk
+            if length < chunk_size:
+                return
+            offset += length
+
+
+def stream_value(
+    conn: Any,
+    table: str,
+    column: str,
+    key_column: str,
+    key: Any,
+    writer: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    text: bool = False,
+) -> int:
+    """
+    Copy a large bytea or text value into `writer` chunk by chunk.
+
+    :return: The number of bytes written.
+    """
+    written = 0
+    for chunk in iter_value_chunks(conn, table, column, key_column, key, chunk_size, text):
+        writer.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def stream_large_object(conn: Any, oid: int, writer: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Copy a large object into `writer` chunk by chunk.
+
+    :return: The number of bytes written.
+    """
+    written = 0
+    for chunk in iter_large_object_chunks(conn, oid, chunk_size):
+        writer.write(chunk)
+        written += len(chunk)
+    return written
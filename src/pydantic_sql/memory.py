@@ -0,0 +1,228 @@
+# src/pydantic_sql/memory.py
+# Per-execution memory accounting for fetched rows and mapped models
+# A budget can abort a result that grows too large, or switch it to streaming
+import tracemalloc
+from typing import Any, Iterator, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+from .exceptions import ConfigurationError, ResultTooLargeError
+from .instrumentation import instrument, query_label
+from .utils import estimate_size, unique_cursor_name
+
+ABORT = "abort"
+STREAM = "stream"
+
+
+class MemoryUsage(BaseModel):
+    query: str
+    rows: int = 0
+    raw_bytes: int = 0
+    model_bytes: int = 0
+    traced_peak_bytes: Optional[int] = None
+    streamed: bool = False
+
+    @property
+    def total_bytes(self) -> int:
+        return self.raw_bytes + self.model_bytes
+
+
+class MemoryBudget:
+    """
+    A limit on the estimated bytes one result may hold in memory.
+
+    With on_exceed=ABORT the fetch raises ResultTooLargeError; with STREAM the
+    rows materialized so far are kept and the rest are fetched and mapped
+    lazily as the caller iterates, so memory stays flat.
+    """
+
+    def __init__(self, max_bytes: int, on_exceed: str = ABORT):
+        if on_exceed not in (ABORT, STREAM):
+            raise ConfigurationError(f"Unknown on_exceed action: {on_exceed!r}")
+        self.max_bytes = max_bytes
+        self.on_exceed = on_exceed
+
+
+def estimate_rows_size(rows: Sequence[Any], sample_size: int = 20) -> int:
+    """
+    Estimate the size of a list of rows or models from an even sample of them.
+
+    Walking every object of a large result would cost more than fetching it,
+    so up to `sample_size` rows are measured and the mean is scaled up.
+    """
+    if not rows:
+        return 0
+    step = max(len(rows) // sample_size, 1)
+    sample = rows[::step][:sample_size]
+    return sum(estimate_size(row) for row in sample) * len(rows) // len(sample)
+
+
+class AccountedResult:
+    """
+    The rows of an accounted fetch and what they cost.
+
+    Iterate it once for the rows (models, or dicts without a model); the
+    rows are handed over rather than kept, so a second iteration raises
+    RuntimeError. `usage` is complete once the rows are materialized; when
+    the budget switched the result to streaming (`usage.streamed`), it is
+    complete only after the iteration finishes. Close it, or use it as a
+    context manager, to release the server-side cursor of a streamed result
+    early.
+    """
+
+    def __init__(self, items: List[Any], rest: Optional[Iterator[Any]], usage: MemoryUsage, cursor: Any):
+        self.usage = usage
+        self._items = items
+        self._rest = rest
+        self._cursor = cursor
+        self._iterated = False
+
+    @property
+    def streaming(self) -> bool:
+        return self._rest is not None
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._iterated:
+            raise RuntimeError("An AccountedResult can only be iterated once")
+        self._iterated = True
+        items, self._items = self._items, []
+        return self._iterate(items)
+
+    def _iterate(self, items: List[Any]) -> Iterator[Any]:
+        yield from items
+        if self._rest is not None:
+            try:
+                yield from self._rest
+            finally:
+                self.close()
+
+    def __len__(self) -> int:
+        if self.streaming:
+            raise TypeError("A streamed result has no length until it is consumed")
+        return len(self._items)
+
+    def close(self) -> None:
+        self._cursor.close()
+
+    def __enter__(self) -> "AccountedResult":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+
+def fetch_accounted(
+    conn: Any,
+    sql: str,
+    params: Any = None,
+    model: Optional[Type[BaseModel]] = None,
+    budget: Optional[MemoryBudget] = None,
+    batch_size: int = 1000,
+    trace: bool = False,
+) -> AccountedResult:
+    """
+    Fetch and map a query while accounting for the memory it takes.
+
+    Rows are read in batches from a server-side cursor. The estimated bytes of
+    raw rows and of mapped models are reported to instrumentation hooks as
+    `event.bytes` of the "fetch" and "map" phases, and checked against
+    `budget` after every batch.
+
+    :param conn: A psycopg connection, in a transaction (named cursors need one).
+    :param sql: The SQL text.
+    :param params: The query parameters.
+    :param model: Optional Pydantic model rows are mapped to.
+    :param budget: Optional memory budget.
+    :param batch_size: Rows per fetch.
+    :param trace: Also measure the peak Python allocation with tracemalloc.
+        Accurate but slow; meant for profiling sessions.
+    """
+    label = query_label(sql)
+    usage = MemoryUsage(query=label)
+    started_tracing = trace and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    cur = conn.cursor(unique_cursor_name("_pydantic_sql_accounted"))
+    try:
+        cur.execute(sql, params)
+        columns = [column.name for column in cur.description]
+
+        def map_rows(rows: List[tuple]) -> List[Any]:
+            dicts = [dict(zip(columns, row)) for row in rows]
+            return [model.model_validate(row) for row in dicts] if model is not None else dicts
+
+        def stream() -> Iterator[Any]:
+            while True:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
+                    return
+                usage.rows += len(batch)
+                usage.raw_bytes += estimate_rows_size(batch)
+                yield from map_rows(batch)
+
+        def over_budget() -> bool:
+            if budget is None or usage.total_bytes <= budget.max_bytes:
+                return False
+            if budget.on_exceed == ABORT:
+                raise ResultTooLargeError(
+                    f"Result of query {label} exceeds its memory budget: "
+                    f"~{usage.total_bytes} bytes after {usage.rows} rows (limit {budget.max_bytes})"
+                )
+            usage.streamed = True
+            return True
+
+        raw: List[tuple] = []
+        with instrument("fetch", label, len(params or ())) as event:
+            while not usage.streamed:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
+                    break
+                raw.extend(batch)
+                usage.rows += len(batch)
+                usage.raw_bytes += estimate_rows_size(batch)
+                over_budget()
+            event.rows = usage.rows
+            event.bytes = usage.raw_bytes
+
+        items: List[Any] = []
+        with instrument("map", label, len(params or ())) as event:
+            for start in range(0, len(raw), batch_size):
+                if usage.streamed:
+                    break
+                mapped = map_rows(raw[start:start + batch_size])
+                items.extend(mapped)
+                if model is not None:
+                    usage.model_bytes += estimate_rows_size(mapped)
+                    over_budget()
+            event.rows = len(items)
+            event.bytes = usage.model_bytes
+
+        if trace:
+            usage.traced_peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+    except BaseException:
+        cur.close()
+        raise
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    if not usage.streamed:
+        cur.close()
+        return AccountedResult(items, None, usage, cur)
+
+    # Rows fetched but not yet mapped are mapped lazily, then the cursor is streamed.
+    unmapped = raw[len(items):]
+    del raw
+
+    def rest() -> Iterator[Any]:
+        for start in range(0, len(unmapped), batch_size):
+            yield from map_rows(unmapped[start:start + batch_size])
+        unmapped.clear()
+        yield from stream()
+
+    return AccountedResult(items, rest(), usage, cur)
@@ -1,3 +1,115 @@
-# PydanticModelGenerator:
+# src/pydantic_sql/model_generator.py
 # Converts PostgreSQL types to Python/Pydantic types
-# Generates Pydantic models for query parameters and results
\ No newline at end of file
+# Generates Pydantic models for query parameters and results
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# psycopg loads inet as ip_interface() and cidr as ip_network() values.
+_INET = (
+    "Union[IPv4Interface, IPv6Interface]",
+    ("from ipaddress import IPv4Interface, IPv6Interface", "from typing import Union"),
+)
+_CIDR = (
+    "Union[IPv4Network, IPv6Network]",
+    ("from ipaddress import IPv4Network, IPv6Network", "from typing import Union"),
+)
+
+# Builtin type OID -> (annotation, import line(s) needed for it)
+PG_TYPES: Dict[int, Tuple[str, Union[None, str, Tuple[str, ...]]]] = {
+    16: ("bool", None),  # bool
+    17: ("bytes", None),  # bytea
+    18: ("str", None),  # char
+    19: ("str", None),  # name
+    20: ("int", None),  # int8
+    21: ("int", None),  # int2
+    23: ("int", None),  # int4
+    25: ("str", None),  # text
+    26: ("int", None),  # oid
+    114: ("Any", "from typing import Any"),  # json
+    142: ("str", None),  # xml
+    650: _CIDR,  # cidr
+    700: ("float", None),  # float4
+    701: ("float", None),  # float8
+    790: ("str", None),  # money
+    869: _INET,  # inet
+    1042: ("str", None),  # bpchar
+    1043: ("str", None),  # varchar
+    1082: ("date", "from datetime import date"),
+    1083: ("time", "from datetime import time"),
+    1114: ("datetime", "from datetime import datetime"),  # timestamp
+    1184: ("datetime", "from datetime import datetime"),  # timestamptz
+    1186: ("timedelta", "from datetime import timedelta"),  # interval
+    1266: ("time", "from datetime import time"),  # timetz
+    1700: ("Decimal", "from decimal import Decimal"),  # numeric
+    2950: ("UUID", "from uuid import UUID"),
+    3802: ("Any", "from typing import Any"),  # jsonb
+}
+
+# Array type OID -> element type OID
+PG_ARRAY_TYPES: Dict[int, int] = {
+    1000: 16,
+    1001: 17,
+    1005: 21,
+    1007: 23,
+    1009: 25,
+    1014: 1042,
+    1015: 1043,
+    1016: 20,
+    1021: 700,
+    1022: 701,
+    1041: 869,
+    651: 650,
+    1115: 1114,
+    1182: 1082,
+    1183: 1083,
+    1185: 1184,
+    1231: 1700,
+    2951: 2950,
+    199: 114,
+    3807: 3802,
+}
+
+_ANY = ("Any", "from typing import Any")
+
+
+def python_type(oid: int, nullable: bool = False) -> Tuple[str, Set[str]]:
+    """
+    The annotation for a PostgreSQL type and the imports it needs.
+
+    Unknown OIDs (enums, domains, composites) map to Any.
+
+    :param oid: The type OID.
+    :param nullable: Wrap the annotation in Optional.
+    :return: The annotation text and a set of import lines.
+    """
+    imports: Set[str] = set()
+    if oid in PG_ARRAY_TYPES:
+        element, type_import = PG_TYPES.get(PG_ARRAY_TYPES[oid], _ANY)
+        annotation = f"List[{element}]"
+        imports.add("from typing import List")
+    else:
+        annotation, type_import = PG_TYPES.get(oid, _ANY)
+    if isinstance(type_import, str):
+        imports.add(type_import)
+    elif type_import:
+        imports.update(type_import)
+    if nullable:
+        annotation = f"Optional[{annotation}]"
+        imports.add("from typing import Optional")
+    return annotation, imports
+
+
+def format_imports(imports: Iterable[str]) -> List[str]:
+    """Merge "from x import a" lines per module and sort them, stdlib style."""
+    names: Dict[str, Set[str]] = {}
+    plain: Set[str] = set()
+    for line in imports:
+        if line.startswith("from "):
+            module, _, imported = line[len("from "):].partition(" import ")
+            names.setdefault(module, set()).update(name.strip() for name in imported.split(","))
+        else:
+            plain.add(line)
+    lines = sorted(plain)
+    # Relative imports (of a generated package's own modules) go last.
+    modules = sorted(names, key=lambda module: (module.startswith("."), module))
+    lines += [f"from {module} import {', '.join(sorted(names[module]))}" for module in modules]
+    return lines
@@ -0,0 +1,222 @@
+# src/pydantic_sql/pagination.py
+# Keyset (seek) pagination over an arbitrary SELECT
+# Each page seeks past the last key seen instead of using OFFSET, so every page costs O(page_size)
+import base64
+import json
+import re
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+from psycopg import sql as pgsql
+from psycopg.rows import dict_row
+
+from .exceptions import ParameterError
+from .instrumentation import instrument, query_label
+
+_ORDER_ITEM = re.compile(r"^\s*(\w+)(?:\s+(ASC|DESC))?\s*$", re.IGNORECASE)
+
+_TAGGED_TYPES = {
+    "datetime": (datetime, datetime.fromisoformat),
+    "date": (date, date.fromisoformat),
+    "time": (time, time.fromisoformat),
+    "decimal": (Decimal, Decimal),
+    "uuid": (uuid.UUID, uuid.UUID),
+}
+
+
+class Page(BaseModel):
+    items: List[Any]
+    cursor: Optional[str] = None
+    has_more: bool = False
+
+
+def parse_order_by(order_by: Sequence[str]) -> List[Tuple[str, bool]]:
+    """
+    Parse "column [ASC|DESC]" items into (column, descending) pairs.
+
+    :param order_by: The key columns, most significant first.
+    """
+    keys = []
+    for item in order_by:
+        match = _ORDER_ITEM.match(item)
+        if match is None:
+            raise ParameterError(f"Invalid keyset order item: {item!r}")
+        keys.append((match.group(1), (match.group(2) or "").upper() == "DESC"))
+    if not keys:
+        raise ParameterError("Keyset pagination needs at least one order_by column")
+    return keys
+
+
+def _encode_value(value: Any) -> Any:
+    # datetime is checked before date because it is a subclass.
+    for tag, (kind, _) in _TAGGED_TYPES.items():
+        if isinstance(value, kind):
+            return {"$": tag, "v": value.isoformat() if hasattr(value, "isoformat") else str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _TAGGED_TYPES[value["$"]][1](value["v"])
+    return value
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """Encode the last-seen key tuple as an opaque, URL-safe token."""
+    payload = json.dumps([_encode_value(value) for value in key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    """Decode a token produced by `encode_cursor`."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return [_decode_value(value) for value in json.loads(base64.urlsafe_b64decode(padded))]
+    # Tampered tokens: bad base64/JSON, unknown tags, or values the tagged type rejects
+    # (Decimal raises InvalidOperation, an ArithmeticError; UUID(5) raises AttributeError).
+    except (ValueError, KeyError, TypeError, ArithmeticError, AttributeError) as e:
+        raise ParameterError(f"Invalid pagination cursor: {token!r}") from e
+
+
+def _seek_condition(keys: List[Tuple[str, bool]], named: bool) -> pgsql.Composable:
+    def placeholder(i: int) -> pgsql.Placeholder:
+        return pgsql.Placeholder(f"_key_{i}") if named else pgsql.Placeholder()
+
+    columns = [pgsql.Identifier(column) for column, _ in keys]
+    directions = {descending for _, descending in keys}
+    if len(directions) == 1:
+        # One direction: a row comparison the planner can run as a single index seek.
+        op = pgsql.SQL("<" if directions.pop() else ">")
+        return pgsql.SQL("({}) {} ({})").format(
+            pgsql.SQL(", ").join(columns), op, pgsql.SQL(", ").join(placeholder(i) for i in range(len(keys)))
+        )
+
+    # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+    # Placeholders are numbered per position, so positional params repeat values.
+    branches = []
+    for i, (_, descending) in enumerate(keys):
+        parts = [pgsql.SQL("{} = {}").format(columns[j], placeholder(j)) for j in range(i)]
+        parts.append(pgsql.SQL("{} {} {}").format(columns[i], pgsql.SQL("<" if descending else ">"), placeholder(i)))
+        branches.append(pgsql.SQL("({})").format(pgsql.SQL(" AND ").join(parts)))
+    return pgsql.SQL("({})").format(pgsql.SQL(" OR ").join(branches))
+
+
+def keyset_query(
+    sql: str, params: Any, order_by: Sequence[str], page_size: int, after: Optional[Sequence[Any]] = None
+) -> Tuple[pgsql.Composed, Any]:
+    """
+    Wrap a SELECT in a keyset-paginated query.
+
+    The query fetches page_size + 1 rows so the caller can tell whether
+    another page exists. The order_by columns must be selected by `sql`,
+    be non-null and together be unique, or rows will be skipped.
+
+    :param sql: The user SELECT, without ORDER BY/LIMIT.
+    :param params: Parameters of `sql`, named (dict) or positional.
+    :param order_by: Key columns as "column [ASC|DESC]".
+    :param page_size: Rows per page.
+    :param after: The last key of the previous page, or None for the first page.
+    :return: The composed query and its parameters.
+    """
+    keys = parse_order_by(order_by)
+    named = isinstance(params, dict)
+    query_params: Any = dict(params) if named else list(params or ())
+
+    where = pgsql.SQL("")
+    if after is not None:
+        if len(after) != len(keys):
+            raise ParameterError("Cursor does not match the order_by columns")
+        where = pgsql.SQL(" WHERE ") + _seek_condition(keys, named)
+        if named:
+            query_params.update({f"_key_{i}": value for i, value in enumerate(after)})
+        elif len({d for _, d in keys}) == 1:
+            query_params.extend(after)
+        else:
+            for i in range(len(keys)):
+                query_params.extend(after[: i + 1])
+
+    order = pgsql.SQL(", ").join(
+        pgsql.SQL("{} {}").format(pgsql.Identifier(column), pgsql.SQL("DESC" if descending else "ASC"))
+        for column, descending in keys
+    )
+    limit = pgsql.Placeholder("_page_limit") if named else pgsql.Placeholder()
+    if named:
+        query_params["_page_limit"] = page_size + 1
+    else:
+        query_params.append(page_size + 1)
+    query = pgsql.SQL("SELECT * FROM ({}) AS _page{} ORDER BY {} LIMIT {}").format(
+        pgsql.SQL(sql), where, order, limit
+    )
+    return query, query_params
+
+
+def fetch_page(
+    conn: Any,
+    sql: str,
+    order_by: Sequence[str],
+    page_size: int = 100,
+    params: Any = None,
+    model: Optional[Type[BaseModel]] = None,
+    cursor: Optional[str] = None,
+) -> Page:
+    """
+    Fetch one page, starting after `cursor`.
+
+    This is the entry point for web endpoints: hand `page.cursor` to the client
+    and pass it back on the next request.
+
+    :param conn: A psycopg connection.
+    :param sql: The user SELECT, without ORDER BY/LIMIT.
+    :param order_by: Key columns as "column [ASC|DESC]".
+    :param page_size: Rows per page.
+    :param params: Parameters of `sql`.
+    :param model: Optional Pydantic model rows are mapped to.
+    :param cursor: A token from a previous page, or None for the first page.
+    """
+    keys = parse_order_by(order_by)
+    after = decode_cursor(cursor) if cursor is not None else None
+    query, query_params = keyset_query(sql, params, order_by, page_size, after)
+    label = query_label(sql)
+    with conn.cursor(row_factory=dict_row) as cur:
+        with instrument("execute", label, len(query_params)):
+            cur.execute(query, query_params)
+        with instrument("fetch", label, len(query_params)) as event:
+            rows = cur.fetchall()
+            event.rows = len(rows)
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor([rows[-1][column] for column, _ in keys]) if rows else cursor
+    items = rows
+    if model is not None:
+        with instrument("map", label, len(query_params)) as event:
+            items = [model.model_validate(row) for row in rows]
+            event.rows = len(items)
+    return Page(items=items, cursor=next_cursor, has_more=has_more)
+
+
+def paginate(
+    conn: Any,
+    sql: str,
+    order_by: Sequence[str],
+    page_size: int = 100,
+    params: Any = None,
+    model: Optional[Type[BaseModel]] = None,
+    cursor: Optional[str] = None,
+) -> Iterator[Page]:
+    """
+    Iterate over every page of a query, carrying the last-seen key between pages.
+
+    Takes the same arguments as `fetch_page`. Stopping early and resuming
+    later with the last page's `cursor` continues exactly where it left off.
+    """
+    while True:
+        page = fetch_page(conn, sql, order_by, page_size, params, model, cursor)
+        if page.items:
+            yield page
+        if not page.has_more:
+            return
+        cursor = page.cursor
@@ -0,0 +1,227 @@
+# src/pydantic_sql/parallel_scan.py
+# Splits a single-table SELECT into key ranges and scans them concurrently
+# Each range runs on its own pooled connection; bounded queues keep memory flat
+import queue
+import threading
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+from psycopg import sql as pgsql
+from psycopg.rows import class_row, dict_row
+
+from .exceptions import ConfigurationError, ParameterError
+
+Range = Tuple[Optional[Any], Optional[Any]]
+
+_DONE = object()
+
+
+def split_range(low: int, high: int, chunks: int) -> List[Range]:
+    """
+    Split the integer key range [low, high] into `chunks` half-open ranges.
+
+    The first range has no lower bound and the last no upper bound, so rows
+    inserted outside [low, high] after the bounds were read are still scanned.
+    """
+    if chunks < 1:
+        raise ParameterError("chunks must be at least 1")
+    if not isinstance(low, int) or not isinstance(high, int):
+        raise ConfigurationError(
+            f"Cannot split a {type(low).__name__} key evenly; ANALYZE the table so pg_stats has a histogram"
+        )
+    step = max((high - low + 1) // chunks, 1)
+    points = [low + step * i for i in range(1, chunks) if low + step * i <= high]
+    return _ranges_from_points(points)
+
+
+def _ranges_from_points(points: Sequence[Any]) -> List[Range]:
+    bounds = [None, *points, None]
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def key_ranges(conn: Any, table: str, key_column: str, chunks: int, use_stats: bool = True) -> List[Range]:
+    """
+    Compute scan ranges for `table`.
+
+    With `use_stats` the split points come from the planner histogram in
+    pg_stats, which gives ranges of roughly equal row counts for any key
+    type without touching the table. Without stats, or if the table has not
+    been analyzed, an integer key is split evenly between min() and max();
+    other key types then raise ConfigurationError.
+
+    :param conn: A psycopg connection.
+    :param table: The table name, resolved through the search_path like in a query.
+    :param key_column: The column to split on; should be indexed.
+    :param chunks: The number of ranges wanted.
+    """
+    if use_stats:
+        row = conn.execute(
+            "SELECT s.histogram_bounds::text FROM pg_stats s "
+            "JOIN pg_class c ON c.relname = s.tablename "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = s.schemaname "
+            "WHERE c.oid = %s::regclass AND s.attname = %s",
+            (table, key_column),
+        ).fetchone()
+        if row is not None and row[0] is not None:
+            # Let the server cast the bounds back to the column's own type.
+            bounds = conn.execute(
+                pgsql.SQL("SELECT unnest(%s::{}[])").format(pgsql.SQL(_column_type(conn, table, key_column))),
+                (row[0],),
+            ).fetchall()
+            bounds = [b[0] for b in bounds]
+            if len(bounds) > 2:
+                inner = bounds[1:-1]
+                step = len(inner) / chunks
+                points = sorted({inner[int(step * i)] for i in range(1, chunks)})
+                return _ranges_from_points(points)
+
+    # Resolve the name like the pg_stats path does; regclass output is quoted and qualified as needed.
+    relation = conn.execute("SELECT %s::regclass::text", (table,)).fetchone()[0]
+    low, high = conn.execute(
+        pgsql.SQL("SELECT min({key}), max({key}) FROM {table}").format(
+            key=pgsql.Identifier(key_column), table=pgsql.SQL(relation)
+        )
+    ).fetchone()
+    if low is None:
+        return [(None, None)]
+    return split_range(low, high, chunks)
+
+
+def _column_type(conn: Any, table: str, column: str) -> str:
+    return conn.execute(
+        "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = %s::regclass AND attname = %s",
+        (table, column),
+    ).fetchone()[0]
+
+
+def _range_query(sql: str, params: Any, key_column: str, key_range: Range) -> Tuple[pgsql.Composed, Any]:
+    # Wrap the user's SELECT; Postgres pushes the range predicate down into it.
+    named = isinstance(params, dict)
+    conditions = []
+    extra = {} if named else []
+    for op, value, name in ((">=", key_range[0], "_scan_low"), ("<", key_range[1], "_scan_high")):
+        if value is None:
+            continue
+        placeholder = pgsql.Placeholder(name) if named else pgsql.Placeholder()
+        conditions.append(pgsql.SQL("{} {} {}").format(pgsql.Identifier(key_column), pgsql.SQL(op), placeholder))
+        if named:
+            extra[name] = value
+        else:
+            extra.append(value)
+    where = pgsql.SQL(" AND ").join(conditions) if conditions else pgsql.SQL("true")
+    query = pgsql.SQL("SELECT * FROM ({}) AS _scan WHERE {}").format(pgsql.SQL(sql), where)
+    if named:
+        return query, {**params, **extra}
+    return query, [*(params or ()), *extra]
+
+
+def parallel_scan(
+    pool: Any,
+    sql: str,
+    key_column: str,
+    ranges: Sequence[Range],
+    params: Any = None,
+    model: Optional[Type[BaseModel]] = None,
+    workers: int = 4,
+    ordered: bool = True,
+    batch_size: int = 1000,
+    max_batches: int = 4,
+    snapshot: bool = False,
+) -> Iterator[Any]:
+    """
+    Scan key ranges of a single-table SELECT concurrently on pooled connections.
+
+    Each range streams in batches of `batch_size` rows into a queue holding at
+    most `max_batches` batches. Unordered, the workers share one queue of
+    workers * max_batches batches, so memory stays flat however large the
+    table is. Ordered, every range keeps its own queue until the consumer
+    reaches it: a range that finishes while an earlier one is still being
+    drained stays buffered, up to max_batches batches each, so the bound is
+    len(ranges) * max_batches * batch_size rows. Use fewer, larger ranges
+    (or ordered=False) when that is too much.
+
+    By default every range runs in its own transaction, so rows committed
+    while the scan is running may show up in ranges that start later and
+    not in earlier ones. With `snapshot` one connection exports a
+    REPEATABLE READ snapshot (pg_export_snapshot) and every range imports it,
+    so the whole scan sees the table as of a single moment.
+
+    :param pool: A psycopg_pool.ConnectionPool with at least `workers` connections.
+    :param sql: A SELECT over one table that exposes `key_column`.
+    :param key_column: The column the ranges split on.
+    :param ranges: Ranges from `key_ranges` or `split_range`.
+    :param params: Parameters of `sql`.
+    :param model: Optional Pydantic model rows are mapped to.
+    :param workers: The number of concurrent connections.
+    :param ordered: Yield ranges in order (rows keep the order `sql` gives them
+        within a range). Unordered mode yields batches as soon as any worker has one.
+    :param snapshot: Scan all ranges in one exported snapshot; the pool then
+        needs workers + 1 connections.
+    """
+    stop = threading.Event()
+    snapshot_id: Optional[str] = None
+    row_factory = class_row(model) if model is not None else dict_row
+    queues = [queue.Queue(max_batches) for _ in ranges] if ordered else [queue.Queue(max_batches * workers)]
+
+    def put(q: queue.Queue, item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan(index: int, key_range: Range) -> None:
+        q = queues[index] if ordered else queues[0]
+        if stop.is_set():
+            return
+        try:
+            query, query_params = _range_query(sql, params, key_column, key_range)
+            with pool.connection() as conn, conn.transaction():
+                if snapshot_id is not None:
+                    conn.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                    conn.execute(pgsql.SQL("SET TRANSACTION SNAPSHOT {}").format(pgsql.Literal(snapshot_id)))
+                # A named (server-side) cursor keeps the range on the server
+                # until each batch is fetched.
+                with conn.cursor(f"_pydantic_sql_scan_{index}", row_factory=row_factory) as cur:
+                    cur.execute(query, query_params)
+                    while not stop.is_set():
+                        batch = cur.fetchmany(batch_size)
+                        if not batch or not put(q, batch):
+                            break
+            put(q, _DONE)
+        except Exception as e:
+            put(q, e)
+
+    with ExitStack() as stack:
+        if snapshot:
+            # The exporting transaction must stay open until every range has imported the snapshot.
+            exporter = stack.enter_context(pool.connection())
+            stack.enter_context(exporter.transaction())
+            exporter.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            snapshot_id = exporter.execute("SELECT pg_export_snapshot()").fetchone()[0]
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+        try:
+            # The executor starts ranges in submission order, so in ordered mode
+            # the range being consumed is always running and blocked workers
+            # can only be ahead of it.
+            for index, key_range in enumerate(ranges):
+                executor.submit(scan, index, key_range)
+
+            remaining = len(ranges)
+            current = 0
+            while remaining:
+                item = queues[current if ordered else 0].get()
+                if item is _DONE:
+                    remaining -= 1
+                    current += 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield from item
+        finally:
+            stop.set()
@@ -0,0 +1,138 @@
+# src/pydantic_sql/pipeline.py
+# Overlaps network I/O with model validation for large fetches
+# A producer thread pulls raw row batches while the caller's thread (or a process pool) maps the previous ones
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+from .utils import unique_cursor_name
+
+_DONE = object()
+
+
+def validate_batch(model: Type[BaseModel], columns: Sequence[str], rows: List[tuple]) -> List[BaseModel]:
+    """
+    Map raw row tuples to models.
+
+    A module-level function so it can be pickled and sent to a process pool.
+    """
+    return [model.model_validate(dict(zip(columns, row))) for row in rows]
+
+
+def pipelined_map(
+    batches: Iterable[List[Any]],
+    mapper: Callable[[List[Any]], List[Any]],
+    max_pending: int = 2,
+    executor: Optional[Executor] = None,
+) -> Iterator[Any]:
+    """
+    Map batches while the next ones are being produced, preserving order.
+
+    `batches` is consumed on a background thread into a queue of at most
+    `max_pending` batches. Without an executor the caller's thread maps each
+    batch as it arrives; with one, up to `max_pending` batches are mapped in
+    parallel and their results yielded in submission order.
+
+    :param batches: An iterable of row batches, typically doing I/O.
+    :param mapper: Turns one batch into a list of results.
+    :param max_pending: The bound on both queued raw batches and in-flight mapped batches.
+    :param executor: Optional executor, e.g. a ProcessPoolExecutor for validator-heavy models.
+    """
+    raw: queue.Queue = queue.Queue(max_pending)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for batch in batches:
+                while not stop.is_set():
+                    try:
+                        raw.put(batch, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            raw.put(_DONE)
+        except Exception as e:
+            raw.put(e)
+
+    producer = threading.Thread(target=produce, name="pydantic-sql-fetch", daemon=True)
+    producer.start()
+    pending: deque = deque()
+    try:
+        while True:
+            item = raw.get()
+            if isinstance(item, Exception):
+                raise item
+            if item is _DONE:
+                break
+            if executor is None:
+                yield from mapper(item)
+                continue
+            pending.append(executor.submit(mapper, item))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        stop.set()
+        for future in pending:
+            future.cancel()
+        # Unblock a producer waiting on a full queue, then wait for it to
+        # let go of the cursor before the caller reuses the connection.
+        while producer.is_alive():
+            try:
+                raw.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+def _fetch_batches(cur: Any, batch_size: int) -> Iterator[List[tuple]]:
+    while True:
+        batch = cur.fetchmany(batch_size)
+        if not batch:
+            return
+        yield batch
+
+
+def pipelined_fetch(
+    conn: Any,
+    sql: str,
+    params: Any = None,
+    model: Optional[Type[BaseModel]] = None,
+    batch_size: int = 1000,
+    max_pending: int = 2,
+    executor: Optional[Executor] = None,
+) -> Iterator[Any]:
+    """
+    Run a query on a server-side cursor and map its rows in a pipeline.
+
+    Throughput approaches max(I/O, validation) instead of their sum. Rows are
+    yielded in query order as models, or as dicts when no model is given.
+
+    :param conn: A psycopg connection, used only by the fetching thread while iterating.
+    :param sql: The SQL text.
+    :param params: The query parameters.
+    :param model: Optional Pydantic model rows are mapped to.
+    :param batch_size: Rows per network fetch and per mapped batch.
+    :param max_pending: Batches buffered between the stages.
+    :param executor: Optional executor for mapping; must be a process pool to
+        get CPU parallelism for Python validators.
+    """
+    with conn.cursor(unique_cursor_name("_pydantic_sql_pipeline")) as cur:
+        cur.execute(sql, params)
+        columns = [column.name for column in cur.description]
+        if model is not None:
+            mapper = partial(validate_batch, model, columns)
+        else:
+            mapper = partial(_rows_to_dicts, columns)
+        yield from pipelined_map(_fetch_batches(cur, batch_size), mapper, max_pending, executor)
+
+
+def _rows_to_dicts(columns: Sequence[str], rows: List[tuple]) -> List[dict]:
+    return [dict(zip(columns, row)) for row in rows]
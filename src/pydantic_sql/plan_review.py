@@ -0,0 +1,260 @@
+# src/pydantic_sql/plan_review.py
+# Static review of the execution plans of cataloged queries
+# Flags large sequential scans, row explosions and missing-index candidates, and diffs reports against a baseline
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .fingerprint import fingerprint
+from .query_compiler import to_positional
+from .utils import strip_comments_and_literals
+
+_STATEMENT_NAME = "_pydantic_sql_plan_review"
+
+_FILTER_COLUMN = re.compile(
+    r"(?<![:\w])([A-Za-z_]\w*)(?:\)|::[\w ]+?(?:\[\])?)*\s*(?:=|<>|<=|>=|<|>|!?~~\*?|\bIS\b)",
+    re.IGNORECASE,
+)
+_NOT_COLUMNS = {"and", "or", "not", "null", "true", "false", "any", "all"}
+
+_JOIN_NODES = {"Nested Loop", "Hash Join", "Merge Join"}
+_EXPLOSION_MIN_ROWS = 1000
+
+
+class Finding(BaseModel):
+    kind: str  # "seq_scan", "missing_index" or "row_explosion"
+    relation: Optional[str] = None
+    columns: List[str] = []
+    rows: float = 0
+    detail: str
+
+
+class PlanReport(BaseModel):
+    name: str
+    fingerprint: str
+    total_cost: float = 0.0
+    plan_rows: float = 0.0
+    findings: List[Finding] = []
+    plan: Optional[Any] = None
+    error: Optional[str] = None
+
+
+class RelationInfo(BaseModel):
+    rows: float
+    indexed_columns: List[str] = []
+
+
+def explain_query(conn: Any, sql: str, values: Optional[Mapping[str, Any]] = None) -> Any:
+    """
+    Get the JSON plan of a cataloged query without running it.
+
+    The query is prepared and then explained with EXECUTE. With
+    representative `values` the planner builds the custom plan real calls
+    would get; without them it is forced to the generic plan, which does not
+    depend on parameter values at all. Everything runs in a transaction that
+    is rolled back. VERBOSE is used so scan nodes carry their "Schema".
+
+    :param conn: A psycopg connection.
+    :param sql: The query, with :name placeholders.
+    :param values: Representative parameter values by name.
+    """
+    from psycopg import sql as pgsql
+
+    positional, names = to_positional(sql)
+    generic = values is None or any(name not in values for name in names)
+    arguments = ", ".join(
+        "NULL" if generic else pgsql.Literal(values[name]).as_string(conn) for name in names
+    )
+    execute = f"EXECUTE {_STATEMENT_NAME}" + (f"({arguments})" if names else "")
+
+    prepared = False
+    try:
+        with conn.transaction(force_rollback=True):
+            conn.execute(f"PREPARE {_STATEMENT_NAME} AS {positional}")
+            prepared = True
+            mode = "force_generic_plan" if generic else "force_custom_plan"
+            conn.execute(f"SET LOCAL plan_cache_mode = {mode}")
+            return conn.execute(f"EXPLAIN (FORMAT JSON, VERBOSE) {execute}").fetchone()[0]
+    finally:
+        # Prepared statements survive the rollback. DEALLOCATE only once it is
+        # done, since a failed EXPLAIN leaves the transaction aborted.
+        if prepared:
+            with conn.transaction():
+                conn.execute(f"DEALLOCATE {_STATEMENT_NAME}")
+
+
+def walk(node: Mapping[str, Any]) -> Iterator[Mapping[str, Any]]:
+    """Yield a plan node and all of its descendants, depth first."""
+    yield node
+    for child in node.get("Plans", ()):
+        yield from walk(child)
+
+
+def filter_columns(expression: str) -> List[str]:
+    """The column names compared in a plan Filter expression."""
+    columns = []
+    for match in _FILTER_COLUMN.finditer(strip_comments_and_literals(expression)):
+        column = match.group(1)
+        if column.lower() not in _NOT_COLUMNS and column not in columns:
+            columns.append(column)
+    return columns
+
+
+def relation_key(node: Mapping[str, Any]) -> Optional[str]:
+    """The schema-qualified relation a plan node scans, e.g. "public.orders"."""
+    relation = node.get("Relation Name")
+    if relation is None or "Schema" not in node:
+        return relation
+    return f"{node['Schema']}.{relation}"
+
+
+def review_plan(
+    plan: Mapping[str, Any],
+    relations: Mapping[str, RelationInfo],
+    seq_scan_rows: float = 10_000,
+    explosion_factor: float = 10,
+) -> List[Finding]:
+    """
+    Review one plan tree.
+
+    :param plan: The top "Plan" node of an EXPLAIN (FORMAT JSON) result.
+    :param relations: Size and leading index columns of the relations in the
+        plan, by `relation_key`.
+    :param seq_scan_rows: Sequential scans of relations at least this large are flagged.
+    :param explosion_factor: Joins estimated to return this many times more
+        rows than their largest input are flagged.
+    """
+    findings = []
+    for node in walk(plan):
+        node_type = node.get("Node Type")
+        relation = relation_key(node)
+        info = relations.get(relation) if relation else None
+
+        if node_type == "Seq Scan" and info is not None and info.rows >= seq_scan_rows:
+            findings.append(
+                Finding(
+                    kind="seq_scan",
+                    relation=relation,
+                    rows=info.rows,
+                    detail=f"Sequential scan of {relation} (~{int(info.rows)} rows)",
+                )
+            )
+            unindexed = [c for c in filter_columns(node.get("Filter", "")) if c not in info.indexed_columns]
+            if unindexed:
+                findings.append(
+                    Finding(
+                        kind="missing_index",
+                        relation=relation,
+                        columns=unindexed,
+                        rows=info.rows,
+                        detail=f"Filter on {relation}({', '.join(unindexed)}) has no index leading with these columns",
+                    )
+                )
+
+        if node_type in _JOIN_NODES:
+            largest_input = max((child.get("Plan Rows", 0) for child in node.get("Plans", ())), default=0)
+            rows = node.get("Plan Rows", 0)
+            if rows >= _EXPLOSION_MIN_ROWS and rows > explosion_factor * max(largest_input, 1):
+                findings.append(
+                    Finding(
+                        kind="row_explosion",
+                        rows=rows,
+                        detail=f"{node_type} estimated at {int(rows)} rows from inputs of at most {int(largest_input)}",
+                    )
+                )
+    return findings
+
+
+def relation_info(conn: Any, names: List[str]) -> Dict[str, RelationInfo]:
+    """Estimated row counts and leading index columns of the named "schema.relation"s."""
+    rows = conn.execute(
+        """
+        SELECT n.nspname || '.' || c.relname, c.reltuples,
+               coalesce(array_agg(DISTINCT a.attname) FILTER (WHERE a.attname IS NOT NULL), '{}')
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_index i ON i.indrelid = c.oid
+        LEFT JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = i.indkey[0]
+        WHERE n.nspname || '.' || c.relname = ANY(%s) AND c.relkind IN ('r', 'p', 'm')
+        GROUP BY n.nspname, c.relname, c.reltuples
+        """,
+        (names,),
+    ).fetchall()
+    return {name: RelationInfo(rows=max(tuples, 0), indexed_columns=list(columns)) for name, tuples, columns in rows}
+
+
+def analyze_catalog(
+    pool: Any,
+    catalog: Mapping[str, str],
+    params: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    workers: int = 4,
+    seq_scan_rows: float = 10_000,
+    explosion_factor: float = 10,
+) -> List[PlanReport]:
+    """
+    Explain and review every query of a catalog, `workers` at a time.
+
+    :param pool: A connection pool (anything with a `connection()` context manager).
+    :param catalog: Query name -> SQL text with :name placeholders.
+    :param params: Query name -> representative parameter values.
+    :param workers: How many queries to explain concurrently.
+    :return: One report per query, in catalog order.
+    """
+    params = params or {}
+
+    def explain(item: Tuple[str, str]) -> PlanReport:
+        name, sql = item
+        report = PlanReport(name=name, fingerprint=fingerprint(sql))
+        try:
+            with pool.connection() as conn:
+                report.plan = explain_query(conn, sql, params.get(name))
+        except Exception as e:
+            report.error = f"{type(e).__name__}: {e}"
+        return report
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        reports = list(executor.map(explain, catalog.items()))
+
+    names = sorted(
+        {relation_key(node) for r in reports if r.plan for node in walk(r.plan[0]["Plan"]) if "Relation Name" in node}
+    )
+    with pool.connection() as conn:
+        relations = relation_info(conn, names) if names else {}
+
+    for report in reports:
+        if report.plan:
+            top = report.plan[0]["Plan"]
+            report.total_cost = top.get("Total Cost", 0.0)
+            report.plan_rows = top.get("Plan Rows", 0.0)
+            report.findings = review_plan(top, relations, seq_scan_rows, explosion_factor)
+    return reports
+
+
+def diff_reports(baseline: List[PlanReport], current: List[PlanReport], cost_factor: float = 1.5) -> List[str]:
+    """
+    Compare two reports and describe the plan regressions.
+
+    A query regresses when it gains a finding it did not have, its estimated
+    cost grows by more than `cost_factor`, or it no longer plans at all.
+    Queries missing from the baseline are new and not compared.
+    """
+    previous = {report.name: report for report in baseline}
+    regressions = []
+    for report in current:
+        before = previous.get(report.name)
+        if before is None:
+            continue
+        if report.error and not before.error:
+            regressions.append(f"{report.name}: no longer plans ({report.error})")
+            continue
+        known = {(f.kind, f.relation, tuple(f.columns)) for f in before.findings}
+        for finding in report.findings:
+            if (finding.kind, finding.relation, tuple(finding.columns)) not in known:
+                regressions.append(f"{report.name}: {finding.detail}")
+        if before.total_cost and report.total_cost > before.total_cost * cost_factor:
+            regressions.append(
+                f"{report.name}: estimated cost rose from {before.total_cost:.1f} to {report.total_cost:.1f}"
+            )
+    return regressions
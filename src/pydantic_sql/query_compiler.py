@@ -1,3 +1,228 @@
-# QueryCompiler:
-# Combines parsed SQL, type information, and generated models
-# Creates executable query objects
\ No newline at end of file
+# src/pydantic_sql/query_compiler.py
+# Combines parsed SQL, type information, and generated models into executable query objects
+# Positional SQL, parameter order, OIDs, binder and mapper are fixed at generation time, so a call does no parsing
+import re
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+
+from .exceptions import handle_db_error
+from .instrumentation import instrument
+
+# pgtyped-style :name placeholders (optionally :name! for non-null). Comments,
+# string literals, quoted identifiers and ::casts are matched first so they are
+# left alone.
+_PLACEHOLDER = re.compile(
+    r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\$(\w*)\$.*?\$\1\$|\"(?:[^\"]|\"\")*\"|::|:(\w+)!?",
+    re.DOTALL,
+)
+
+
+def to_positional(sql: str) -> Tuple[str, List[str]]:
+    """
+    Rewrite :name placeholders to $n.
+
+    :return: The rewritten SQL and the parameter names in $n order; a name
+        used twice maps to the same $n.
+    """
+    names: List[str] = []
+
+    def replace(match: re.Match) -> str:
+        name = match.group(2)
+        if name is None:
+            return match.group()
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+
+    return _PLACEHOLDER.sub(replace, sql), names
+
+
+# Parameter OID -> (psycopg.types.numeric wrapper name, Python types it is applied to).
+# psycopg picks int2/int4/int8/numeric by an int's size, and its prepared-statement
+# cache is keyed by those types, so without pinning one query gets several entries.
+_NUMERIC_WRAPPERS = {
+    21: ("Int2", (int,)),
+    23: ("Int4", (int,)),
+    20: ("Int8", (int,)),
+    26: ("Oid", (int,)),
+    1700: ("IntNumeric", (int,)),
+    700: ("Float4", (int, float)),
+    701: ("Float8", (int, float)),
+}
+
+
+def _param_wrappers(param_oids: Sequence[int]) -> tuple:
+    from psycopg.types import numeric
+
+    wrappers = []
+    for oid in param_oids:
+        name, types = _NUMERIC_WRAPPERS.get(oid, (None, ()))
+        wrappers.append((getattr(numeric, name), types) if name else None)
+    return tuple(wrappers)
+
+
+def make_binder(param_names: Sequence[str]) -> Callable[[Any], tuple]:
+    """
+    Build a function turning params into the $n argument tuple.
+
+    Params can be a mapping or any object with the names as attributes (a
+    Pydantic model, a dataclass). Generated modules emit an equivalent inline
+    lambda instead; this is for queries compiled at runtime.
+    """
+    names = tuple(param_names)
+
+    def bind(params: Any) -> tuple:
+        if isinstance(params, Mapping):
+            return tuple(params[name] for name in names)
+        return tuple(getattr(params, name) for name in names)
+
+    return bind
+
+
+class CompiledQuery:
+    """
+    A query ready to run: positional SQL plus its prebuilt binder and mapper.
+
+    Generated modules create one per cataloged query. `run` sends `sql` as-is
+    through a RawCursor (which takes $n placeholders natively) with
+    prepare=True, so after the first call on a connection it is served from
+    psycopg's prepared-statement cache. Integer and float arguments are sent
+    as the types in `param_oids`, so every call of the query hits the same
+    cache entry, including one made by pydantic_sql.warmup.
+    """
+
+    __slots__ = (
+        "name",
+        "sql",
+        "param_names",
+        "param_oids",
+        "result_columns",
+        "result_oids",
+        "binder",
+        "mapper",
+        "_wrappers",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        sql: str,
+        param_names: Sequence[str] = (),
+        param_oids: Sequence[int] = (),
+        result_columns: Sequence[str] = (),
+        result_oids: Sequence[int] = (),
+        binder: Optional[Callable[[Any], tuple]] = None,
+        mapper: Optional[Callable[[tuple], Any]] = None,
+    ):
+        self.name = name
+        self.sql = sql
+        self.param_names = tuple(param_names)
+        self.param_oids = tuple(param_oids)
+        self.result_columns = tuple(result_columns)
+        self.result_oids = tuple(result_oids)
+        self.binder = binder or make_binder(self.param_names)
+        self.mapper = mapper
+        self._wrappers: Optional[tuple] = None
+
+    @classmethod
+    def from_sql(cls, name: str, sql: str, mapper: Optional[Callable[[tuple], Any]] = None) -> "CompiledQuery":
+        """Compile a :name-style query at runtime, for queries that are not generated."""
+        positional, names = to_positional(sql)
+        return cls(name, positional, names, mapper=mapper)
+
+    def __repr__(self) -> str:
+        return f"CompiledQuery({self.name!r})"
+
+    def run(self, conn: Any, params: Any = None) -> List[Any]:
+        """
+        Execute the query and map every row.
+
+        :param conn: A psycopg connection.
+        :param params: A mapping or object with one entry per parameter name.
+        :return: Mapped rows, or raw tuples when there is no mapper; an empty
+            list for statements that return no rows.
+        """
+        import psycopg
+
+        args = self.bind(params)
+        try:
+            rows = self._fetch(conn, args)
+        except psycopg.Error as e:
+            raise handle_db_error(e) from e
+        return [] if rows is None else self._map(rows, len(args))
+
+    def run_one(self, conn: Any, params: Any = None) -> Optional[Any]:
+        """Like `run`, but return only the first row (or None)."""
+        rows = self.run(conn, params)
+        return rows[0] if rows else None
+
+    async def arun(self, conn: Any, params: Any = None) -> List[Any]:
+        """The asyncio counterpart of `run`, for AsyncConnection."""
+        import psycopg
+
+        args = self.bind(params)
+        try:
+            rows = await self._afetch(conn, args)
+        except psycopg.Error as e:
+            raise handle_db_error(e) from e
+        return [] if rows is None else self._map(rows, len(args))
+
+    def bind(self, params: Any = None) -> tuple:
+        """The $n arguments for `params`, numbers wrapped as their `param_oids` types."""
+        if not self.param_names:
+            return ()
+        args = self.binder(params)
+        if self._wrappers is None:
+            self._wrappers = _param_wrappers(self.param_oids)
+        if not any(self._wrappers):
+            return args
+        return tuple(
+            wrapper[0](arg) if wrapper and type(arg) in wrapper[1] else arg
+            for arg, wrapper in zip(args, self._wrappers)
+        )
+
+    def placeholder_args(self) -> tuple:
+        """
+        Arguments of the same types `bind` produces, for warming the statement up.
+
+        Numeric parameters get 0 and the rest NULL, which psycopg sends untyped
+        like it sends str values.
+        """
+        if self._wrappers is None:
+            self._wrappers = _param_wrappers(self.param_oids)
+        wrappers = self._wrappers or (None,) * len(self.param_names)
+        return tuple(wrapper[0](0) if wrapper else None for wrapper in wrappers)
+
+    def _fetch(self, conn: Any, args: tuple) -> Optional[List[tuple]]:
+        import psycopg
+
+        with psycopg.RawCursor(conn) as cur:
+            with instrument("execute", self.name, len(args)):
+                cur.execute(self.sql, args, prepare=True)
+            if cur.description is None:
+                return None
+            with instrument("fetch", self.name, len(args)) as event:
+                rows = cur.fetchall()
+                event.rows = len(rows)
+        return rows
+
+    async def _afetch(self, conn: Any, args: tuple) -> Optional[List[tuple]]:
+        import psycopg
+
+        async with psycopg.AsyncRawCursor(conn) as cur:
+            with instrument("execute", self.name, len(args)):
+                await cur.execute(self.sql, args, prepare=True)
+            if cur.description is None:
+                return None
+            with instrument("fetch", self.name, len(args)) as event:
+                rows = await cur.fetchall()
+                event.rows = len(rows)
+        return rows
+
+    def _map(self, rows: List[tuple], params_count: int) -> List[Any]:
+        if self.mapper is None:
+            return rows
+        mapper = self.mapper
+        with instrument("map", self.name, params_count) as event:
+            items = [mapper(row) for row in rows]
+            event.rows = len(items)
+        return items
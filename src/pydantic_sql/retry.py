@@ -0,0 +1,141 @@
+# src/pydantic_sql/retry.py
+# Re-runs a transactional unit of work on serialization failures and deadlocks
+# Retries use capped exponential backoff with full jitter
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from .exceptions import ConfigurationError, RetryableError, handle_db_error
+
+T = TypeVar("T")
+
+ISOLATION_LEVELS = ("READ COMMITTED", "REPEATABLE READ", "SERIALIZABLE")
+
+
+class RetryStats(BaseModel):
+    transactions: int = 0
+    attempts: int = 0
+    retries: int = 0
+    failures: int = 0
+    retries_by_sqlstate: Dict[str, int] = {}
+
+
+class TransactionRunner:
+    """
+    Runs units of work in a transaction and retries them on contention.
+
+    `work` receives the connection and must do all of its database access
+    through it: on a retryable error the whole transaction is rolled back and
+    `work` is called again from the start, so it must not have side effects
+    outside the database. The connection must not be in a transaction
+    already: a nested one would be a savepoint, where neither the isolation
+    level can be set nor a serialization failure be retried.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 0.01,
+        max_delay: float = 1.0,
+        isolation_level: Optional[str] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if max_attempts < 1:
+            raise ConfigurationError("max_attempts must be at least 1")
+        if isolation_level is not None and isolation_level.upper() not in ISOLATION_LEVELS:
+            raise ConfigurationError(f"Unknown isolation level: {isolation_level!r}")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.isolation_level = isolation_level.upper() if isolation_level else None
+        self._sleep = sleep
+        self._stats = RetryStats()
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def run(self, conn: Any, work: Callable[[Any], T]) -> T:
+        """
+        Run `work(conn)` in a transaction, retrying on RetryableError.
+
+        :param conn: A psycopg connection, outside any transaction.
+        :param work: The unit of work.
+        :return: Whatever `work` returns from the attempt that committed.
+        """
+        import psycopg
+
+        _check_idle(conn)
+        self._count(transactions=1)
+        attempt = 1
+        while True:
+            self._count(attempts=1)
+            try:
+                with conn.transaction():
+                    if self.isolation_level:
+                        conn.execute(f"SET TRANSACTION ISOLATION LEVEL {self.isolation_level}")
+                    return work(conn)
+            except (psycopg.Error, RetryableError) as e:
+                error = self._classify(e, attempt)
+                if error is not None:
+                    raise error from e
+            self._sleep(self.backoff(attempt))
+            attempt += 1
+
+    async def arun(self, conn: Any, work: Callable[[Any], Awaitable[T]]) -> T:
+        """The asyncio counterpart of `run`, for AsyncConnection and async work."""
+        import psycopg
+
+        _check_idle(conn)
+        self._count(transactions=1)
+        attempt = 1
+        while True:
+            self._count(attempts=1)
+            try:
+                async with conn.transaction():
+                    if self.isolation_level:
+                        await conn.execute(f"SET TRANSACTION ISOLATION LEVEL {self.isolation_level}")
+                    return await work(conn)
+            except (psycopg.Error, RetryableError) as e:
+                error = self._classify(e, attempt)
+                if error is not None:
+                    raise error from e
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+
+    def stats(self) -> RetryStats:
+        with self._lock:
+            return self._stats.model_copy(deep=True)
+
+    def _classify(self, e: Exception, attempt: int) -> Optional[Exception]:
+        # Returns the exception to raise, or None to retry.
+        error = e if isinstance(e, RetryableError) else handle_db_error(e)
+        if not isinstance(error, RetryableError) or attempt >= self.max_attempts:
+            self._count(failures=1)
+            return error
+        with self._lock:
+            self._stats.retries += 1
+            sqlstate = getattr(error, "sqlstate", None) or "unknown"
+            self._stats.retries_by_sqlstate[sqlstate] = self._stats.retries_by_sqlstate.get(sqlstate, 0) + 1
+        return None
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self._stats, name, getattr(self._stats, name) + value)
+
+
+def _check_idle(conn: Any) -> None:
+    from psycopg import pq
+
+    status = conn.info.transaction_status
+    if status != pq.TransactionStatus.IDLE:
+        raise ConfigurationError(
+            f"TransactionRunner needs a connection outside any transaction, got one that is {status.name}; "
+            "a retried unit of work cannot run inside an outer transaction"
+        )
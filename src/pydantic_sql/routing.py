@@ -0,0 +1,154 @@
+# src/pydantic_sql/routing.py
+# Routes queries between a primary pool and read-replica pools
+# Read-only statements go to replicas, everything else to the primary
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+from .exceptions import ConfigurationError
+from .utils import is_read_only
+
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+
+
+class RoutingSession:
+    """
+    Tracks writes made by one logical session (a request, a unit of work).
+
+    After the session writes, its reads are pinned to the primary so it sees
+    its own changes. With `stick_for` the pin expires after that many seconds,
+    which should comfortably exceed replica lag; without it the pin lasts for
+    the rest of the session.
+    """
+
+    def __init__(self, stick_for: Optional[float] = None):
+        self.stick_for = stick_for
+        self._last_write: Optional[float] = None
+
+    def mark_write(self) -> None:
+        self._last_write = time.monotonic()
+
+    @property
+    def pinned_to_primary(self) -> bool:
+        if self._last_write is None:
+            return False
+        return self.stick_for is None or time.monotonic() - self._last_write < self.stick_for
+
+
+class ReplicaRouter:
+    """
+    Picks a connection pool for each statement.
+
+    `primary` and `replicas` are psycopg_pool ConnectionPool or
+    AsyncConnectionPool instances (anything with a `connection()` context
+    manager works). Replicas are chosen round-robin or by fewest outstanding
+    requests; with no replicas everything goes to the primary.
+    """
+
+    def __init__(self, primary: Any, replicas: Sequence[Any] = (), strategy: str = ROUND_ROBIN):
+        if strategy not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise ConfigurationError(f"Unknown replica routing strategy: {strategy!r}")
+        self.primary = primary
+        self.replicas: List[Any] = list(replicas)
+        self.strategy = strategy
+        self._cycle = itertools.cycle(range(len(self.replicas)))
+        self._outstanding: Dict[int, int] = {id(pool): 0 for pool in [primary, *self.replicas]}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_conninfo(
+        cls, primary: str, replicas: Sequence[str] = (), strategy: str = ROUND_ROBIN, **pool_kwargs: Any
+    ) -> "ReplicaRouter":
+        """
+        Build a router with one psycopg_pool.ConnectionPool per connection string.
+
+        :param primary: Connection string of the primary.
+        :param replicas: Connection strings of the replicas.
+        :param strategy: ROUND_ROBIN or LEAST_OUTSTANDING.
+        :param pool_kwargs: Passed to every ConnectionPool.
+        """
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as e:
+            raise ConfigurationError("Replica routing requires the psycopg_pool package") from e
+        return cls(
+            ConnectionPool(primary, **pool_kwargs),
+            [ConnectionPool(conninfo, **pool_kwargs) for conninfo in replicas],
+            strategy,
+        )
+
+    def session(self, stick_for: Optional[float] = None) -> RoutingSession:
+        return RoutingSession(stick_for)
+
+    def choose(self, sql: str, read_only: Optional[bool] = None, session: Optional[RoutingSession] = None) -> Any:
+        """
+        Return the pool a statement should run on.
+
+        :param sql: The SQL text.
+        :param read_only: Overrides the read-only classification of `sql`.
+        :param session: The session the statement belongs to, if any.
+        """
+        if read_only is None:
+            read_only = is_read_only(sql)
+        with self._lock:
+            return self._route(read_only, session)
+
+    def _route(self, read_only: bool, session: Optional[RoutingSession]) -> Any:
+        # Called with the lock held.
+        if not read_only or not self.replicas or (session is not None and session.pinned_to_primary):
+            return self.primary
+        if self.strategy == LEAST_OUTSTANDING:
+            return min(self.replicas, key=lambda pool: self._outstanding[id(pool)])
+        return self.replicas[next(self._cycle)]
+
+    @contextmanager
+    def connection(self, sql: str, read_only: Optional[bool] = None, session: Optional[RoutingSession] = None):
+        """
+        Borrow a connection from the pool `sql` routes to.
+
+        Non-read-only statements mark `session` as having written.
+        """
+        if read_only is None:
+            read_only = is_read_only(sql)
+        pool = self._acquire(read_only, session)
+        try:
+            with pool.connection() as conn:
+                yield conn
+        finally:
+            self._release(pool)
+            if not read_only and session is not None:
+                session.mark_write()
+
+    @asynccontextmanager
+    async def aconnection(self, sql: str, read_only: Optional[bool] = None, session: Optional[RoutingSession] = None):
+        """The asyncio counterpart of `connection`, for AsyncConnectionPool targets."""
+        if read_only is None:
+            read_only = is_read_only(sql)
+        pool = self._acquire(read_only, session)
+        try:
+            async with pool.connection() as conn:
+                yield conn
+        finally:
+            self._release(pool)
+            if not read_only and session is not None:
+                session.mark_write()
+
+    def outstanding(self) -> Dict[int, int]:
+        """Outstanding requests per target: 0 is the primary, 1..N the replicas."""
+        with self._lock:
+            return {i: self._outstanding[id(pool)] for i, pool in enumerate([self.primary, *self.replicas])}
+
+    def _acquire(self, read_only: bool, session: Optional[RoutingSession]) -> Any:
+        # Choosing and counting in one critical section keeps concurrent
+        # LEAST_OUTSTANDING callers from all picking the same replica.
+        with self._lock:
+            pool = self._route(read_only, session)
+            self._outstanding[id(pool)] += 1
+        return pool
+
+    def _release(self, pool: Any) -> None:
+        with self._lock:
+            self._outstanding[id(pool)] -= 1
@@ -0,0 +1,195 @@
+# src/pydantic_sql/sharding.py
+# Routes queries across databases sharded by a key parameter
+# Single-shard queries go to one pool, the rest scatter to all shards and gather as a stream
+import asyncio
+import heapq
+import zlib
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+from psycopg.rows import dict_row
+
+from .exceptions import ConfigurationError
+
+_DONE = object()
+
+
+def default_shard_for(value: Any, shard_count: int) -> int:
+    """
+    Map a shard-key value to a shard index.
+
+    Integers are taken modulo the shard count; anything else is hashed with
+    CRC32 so the mapping is stable across processes (unlike hash()).
+    """
+    if isinstance(value, int):
+        return value % shard_count
+    return zlib.crc32(str(value).encode()) % shard_count
+
+
+async def _close_all(streams: List[AsyncIterator[Dict[str, Any]]]) -> None:
+    # Close every stream even if one fails, so each shard returns its connection.
+    errors = await asyncio.gather(*(stream.aclose() for stream in streams), return_exceptions=True)
+    for error in errors:
+        if isinstance(error, BaseException):
+            raise error
+
+
+class _Descending:
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+class ShardRouter:
+    """
+    Executes queries against a set of shards, each an AsyncConnectionPool.
+
+    Queries whose named parameters contain `shard_key` run on the one shard
+    that owns the value. All other queries run concurrently on every shard
+    and their rows are yielded as they arrive, or k-way merged when the
+    caller says how the per-shard results are ordered.
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[Any],
+        shard_key: str = "user_id",
+        shard_for: Callable[[Any, int], int] = default_shard_for,
+        queue_size: int = 1000,
+    ):
+        if not shards:
+            raise ConfigurationError("ShardRouter needs at least one shard")
+        self.shards = list(shards)
+        self.shard_key = shard_key
+        self.shard_for = shard_for
+        self.queue_size = queue_size
+
+    def shard_index(self, params: Any) -> Optional[int]:
+        """Return the shard owning `params`, or None if the query must fan out."""
+        if isinstance(params, BaseModel):
+            params = params.model_dump()
+        if isinstance(params, dict) and params.get(self.shard_key) is not None:
+            return self.shard_for(params[self.shard_key], len(self.shards))
+        return None
+
+    async def fetch(
+        self,
+        sql: str,
+        params: Any = None,
+        model: Optional[Type[BaseModel]] = None,
+        order_by: Sequence[str] = (),
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Stream the rows of a query from the shard(s) it touches.
+
+        :param sql: The SQL text with psycopg placeholders.
+        :param params: Query parameters; the shard key is looked up by name.
+        :param model: Optional Pydantic model each row is validated into.
+        :param order_by: Columns the SQL's ORDER BY sorts on. When given, fan-out
+            results are k-way merged instead of interleaved in arrival order.
+        :param descending: Whether that ORDER BY is descending.
+        :param limit: Stop after this many merged rows. Put the same LIMIT in
+            `sql` so each shard returns at most that many.
+        """
+        index = self.shard_index(params)
+        if index is not None:
+            streams = [self._stream(self.shards[index], sql, params)]
+        else:
+            streams = [self._stream(pool, sql, params) for pool in self.shards]
+
+        if order_by and len(streams) > 1:
+            rows = self._merge(streams, order_by, descending)
+        else:
+            rows = self._interleave(streams)
+
+        count = 0
+        try:
+            async for row in rows:
+                yield model.model_validate(row) if model is not None else row
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+        finally:
+            await rows.aclose()
+
+    async def _stream(self, pool: Any, sql: str, params: Any) -> AsyncIterator[Dict[str, Any]]:
+        async with pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                async for row in cur.stream(sql, params):
+                    yield row
+
+    async def _interleave(self, streams: List[AsyncIterator[Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+        if len(streams) == 1:
+            try:
+                async for row in streams[0]:
+                    yield row
+            finally:
+                await _close_all(streams)
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        async def drain(stream: AsyncIterator[Dict[str, Any]]) -> None:
+            try:
+                async for row in stream:
+                    await queue.put(row)
+                await queue.put(_DONE)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await queue.put(e)
+
+        tasks = [asyncio.ensure_future(drain(stream)) for stream in streams]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if item is _DONE:
+                    remaining -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # A task cancelled before it started never ran its stream, so the
+            # streams are closed here rather than inside drain().
+            await _close_all(streams)
+
+    async def _merge(
+        self, streams: List[AsyncIterator[Dict[str, Any]]], order_by: Sequence[str], descending: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        def sort_key(row: Dict[str, Any]) -> tuple:
+            # NULLs sort last ascending and first descending, as in Postgres.
+            values = tuple((row[column] is None, row[column]) for column in order_by)
+            return _Descending(values) if descending else values
+
+        heap = []
+        try:
+            firsts = await asyncio.gather(*(anext(stream, _DONE) for stream in streams), return_exceptions=True)
+            for row in firsts:
+                if isinstance(row, BaseException):
+                    raise row
+            for index, row in enumerate(firsts):
+                if row is not _DONE:
+                    heap.append((sort_key(row), index, row))
+            heapq.heapify(heap)
+            while heap:
+                _, index, row = heapq.heappop(heap)
+                yield row
+                following = await anext(streams[index], _DONE)
+                if following is not _DONE:
+                    heapq.heappush(heap, (sort_key(following), index, following))
+        finally:
+            await _close_all(streams)
@@ -0,0 +1,104 @@
+# src/pydantic_sql/singleflight.py
+# Coalesces identical in-flight read queries
+# Concurrent callers with the same SQL and params share one execution and one result
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+from .cache import cache_key
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Shares one execution between threads running the same read-only query.
+
+    The first caller for a key runs the loader; callers arriving while it is
+    running block and receive the same result, or the same exception.
+    Combine with ResultCache by wrapping the cache loader, so an expired hot
+    key is refreshed by one query instead of dozens:
+
+        cache.get_or_load(sql, params, lambda: flight.run(sql, params, load, read_only=True))
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def run(self, sql: str, params: Any, loader: Callable[[], Any], read_only: bool = False) -> Any:
+        """
+        Execute a query through the single-flight layer.
+
+        :param sql: The compiled SQL text.
+        :param params: The query parameters.
+        :param loader: Executes the query and returns its mapped result.
+        :param read_only: Only read-only queries are coalesced; writes always run.
+        :return: The (possibly shared) result.
+        """
+        if not read_only:
+            return loader()
+        return self.do(cache_key(sql, params), loader)
+
+
+class AsyncSingleFlight:
+    """
+    The asyncio counterpart of SingleFlight.
+
+    The shared execution runs in its own task, so cancelling one waiter does
+    not cancel the query for the others.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        self._tasks.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter was cancelled.
+            task.exception()
+
+    async def run(
+        self, sql: str, params: Any, loader: Callable[[], Awaitable[Any]], read_only: bool = False
+    ) -> Any:
+        if not read_only:
+            return await loader()
+        return await self.do(cache_key(sql, params), loader)
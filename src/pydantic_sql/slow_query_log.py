@@ -0,0 +1,183 @@
+# src/pydantic_sql/slow_query_log.py
+# Captures execution plans of slow and sampled queries
+# Plans are taken in the background on a separate connection and kept in a bounded ring buffer
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from pydantic import BaseModel
+
+from .deadline import deadline
+from .instrumentation import dispatch_slow_query, query_label
+from .utils import is_read_only
+
+
+class SlowQuery(BaseModel):
+    fingerprint: str
+    sql: str
+    params_shape: Union[Dict[str, str], List[str], None]
+    duration_ms: float
+    sampled: bool
+    analyzed: bool = False
+    plan: Optional[Any] = None
+    error: Optional[str] = None
+    captured_at: float
+
+
+def params_shape(params: Any) -> Union[Dict[str, str], List[str], None]:
+    """Describe parameters by type name only, so values never end up in the log."""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {name: type(value).__name__ for name, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+
+class SlowQueryLog:
+    """
+    Records the plans of queries slower than `threshold` seconds, plus a
+    random `sample_rate` fraction of all other queries.
+
+    The plan is taken with EXPLAIN (FORMAT JSON) on a connection from `pool`,
+    adding BUFFERS on Postgres 13+ where it reports planning buffers, in a
+    background worker, so the caller is never delayed. With
+    `analyze=True` read-only statements are run with EXPLAIN ANALYZE inside a
+    transaction that is always rolled back; other statements are only planned,
+    never executed again. Each entry is kept in a ring buffer of `capacity`
+    entries and passed to the `slow_query` method of every instrumentation hook.
+
+    During an incident every query is slow, so capture is throttled to spare
+    the database: a fingerprint is not explained again while a capture of it
+    is pending or for `cooldown` seconds after one, and at most `max_pending`
+    captures wait at a time. Executions left out are counted in `skipped`.
+    """
+
+    def __init__(
+        self,
+        pool: Any,
+        threshold: float = 0.5,
+        sample_rate: float = 0.0,
+        capacity: int = 100,
+        analyze: bool = False,
+        explain_timeout: float = 5.0,
+        executor: Optional[Executor] = None,
+        random_fn: Callable[[], float] = random.random,
+        cooldown: float = 60.0,
+        max_pending: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.pool = pool
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.analyze = analyze
+        self.explain_timeout = explain_timeout
+        self._entries: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="pydantic_sql_explain")
+        self._random = random_fn
+        self.cooldown = cooldown
+        self.max_pending = max_pending
+        self.skipped = 0
+        self._clock = clock
+        self._pending: Set[str] = set()
+        # Fingerprint -> when its last capture finished
+        self._explained_at: Dict[str, float] = {}
+        self._closed = False
+
+    @contextmanager
+    def track(self, sql: str, params: Any = None):
+        """Time the block as one execution of `sql` and record it if it qualifies."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(sql, params, time.perf_counter() - start)
+
+    def record(self, sql: str, params: Any, duration: float) -> bool:
+        """
+        Consider one execution of `sql` for plan capture.
+
+        :param sql: The SQL text that was executed.
+        :param params: Its parameters (only their types are kept).
+        :param duration: How long it took, in seconds.
+        :return: True if a plan capture was scheduled; always False once closed.
+        """
+        slow = duration >= self.threshold
+        if not slow and not (self.sample_rate and self._random() < self.sample_rate):
+            return False
+        key = query_label(sql)
+        with self._lock:
+            if self._closed:
+                return False
+            recent = self._explained_at.get(key)
+            if (
+                key in self._pending
+                or len(self._pending) >= self.max_pending
+                or (recent is not None and self._clock() - recent < self.cooldown)
+            ):
+                self.skipped += 1
+                return False
+            self._pending.add(key)
+        try:
+            self._executor.submit(self._capture, key, sql, params, duration, not slow)
+        except RuntimeError:
+            # Closed by another thread in between.
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        return True
+
+    def entries(self) -> List[SlowQuery]:
+        """The captured entries, oldest first."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """Wait for pending captures and stop the background worker; later records are ignored."""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+
+    def _capture(self, key: str, sql: str, params: Any, duration: float, sampled: bool) -> None:
+        analyze = self.analyze and is_read_only(sql)
+        entry = SlowQuery(
+            fingerprint=key,
+            sql=sql,
+            params_shape=params_shape(params),
+            duration_ms=duration * 1000,
+            sampled=sampled,
+            analyzed=analyze,
+            captured_at=time.time(),
+        )
+        try:
+            with self.pool.connection() as conn:
+                if analyze:
+                    options = "ANALYZE, BUFFERS, FORMAT JSON"
+                elif conn.info.server_version >= 130000:
+                    options = "FORMAT JSON, BUFFERS"
+                else:
+                    # Before Postgres 13, BUFFERS without ANALYZE is an error.
+                    options = "FORMAT JSON"
+                with conn.transaction(force_rollback=True), deadline(conn, self.explain_timeout):
+                    row = conn.execute(f"EXPLAIN ({options}) {sql}", params).fetchone()
+            entry.plan = row[0]
+        except Exception as e:
+            entry.error = f"{type(e).__name__}: {e}"
+
+        with self._lock:
+            self._entries.append(entry)
+            self._pending.discard(key)
+            now = self._clock()
+            if len(self._explained_at) >= 10_000:
+                # Forget fingerprints whose cooldown is over, so the map stays small.
+                self._explained_at = {k: t for k, t in self._explained_at.items() if now - t < self.cooldown}
+            self._explained_at[key] = now
+        dispatch_slow_query(entry)
@@ -2,10 +2,17 @@
 # Queries PostgreSQL system catalogs
 # Retrieves detailed type information for parameters and result columns
 # Handles special types (enums, arrays, etc.)
-from typing import Dict, List, Tuple, Any
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple, Any
 
 from pydantic import BaseModel
 
+from .fingerprint import canonical_sql
+
+if TYPE_CHECKING:
+    import asyncpg
+
 class PostgreSQLType(BaseModel):
     oid: int
     typname: str
@@ -25,14 +32,22 @@ class TypeIntrospector:
     def __init__(self, db_url: str):
         self.db_url = db_url
         self.type_cache: Dict[int, PostgreSQLType] = {}
+        # Canonical SQL -> inferred types, so repeated query texts are introspected once
+        self.inference_cache: Dict[str, Tuple[Dict[str, Any], List[ColumnInfo]]] = {}
 
     async def connect(self) -> asyncpg.Connection:
+        import asyncpg
+
         return await asyncpg.connect(self.db_url)
 
     async def infer_types(self, parsed_sql: Any) -> Tuple[Dict[str, Any], List[ColumnInfo]]:
+        key = canonical_sql(parsed_sql.sql)
+        if key in self.inference_cache:
+            return self.inference_cache[key]
         async with await self.connect() as conn:
             param_types = await self._infer_param_types(conn, parsed_sql)
             result_types = await self._infer_result_types(conn, parsed_sql)
+        self.inference_cache[key] = (param_types, result_types)
         return param_types, result_types
 
     async def _infer_param_types(self, conn: asyncpg.Connection, parsed_sql: Any) -> Dict[str, Any]:
@@ -0,0 +1,231 @@
+# src/pydantic_sql/utils.py
+# Helpers for inspecting raw SQL text and Python values
+import itertools
+import re
+import sys
+from typing import Any, Set
+
+_COMMENTS_AND_LITERALS = re.compile(
+    r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\$\$.*?\$\$",
+    re.DOTALL,
+)
+
+_NAME = r'(?:"[^"]+"|[A-Za-z_][\w$]*)'
+_QUALIFIED_NAME = rf"({_NAME}(?:\s*\.\s*{_NAME})?)"
+
+_READ_TABLE_PATTERN = re.compile(
+    rf"\b(?:FROM|JOIN|USING)\s+(?:ONLY\s+)?{_QUALIFIED_NAME}",
+    re.IGNORECASE,
+)
+
+_WRITE_TABLE_PATTERN = re.compile(
+    rf"\b(?:INSERT\s+INTO|UPDATE(?:\s+ONLY)?|DELETE\s+FROM(?:\s+ONLY)?"
+    rf"|TRUNCATE(?:\s+TABLE)?(?:\s+ONLY)?|MERGE\s+INTO|COPY)\s+{_QUALIFIED_NAME}",
+    re.IGNORECASE,
+)
+
+# Words that can follow FROM/JOIN/UPDATE without naming a table,
+# e.g. "FOR UPDATE OF", "DO UPDATE SET", "EXTRACT(YEAR FROM ...)".
+_NOT_TABLES = {"set", "of", "nowait", "skip", "lateral", "select", "values"}
+
+# FROM, USING and TRUNCATE take a comma-separated list of relations.
+_LIST_KEYWORDS = {"from", "using", "truncate"}
+_ALIAS = re.compile(rf"\s+(?:AS\s+)?({_NAME})(?:\s*\([^)]*\))?", re.IGNORECASE)
+_LIST_ITEM = re.compile(rf"\s*,\s*(?:(?:ONLY|LATERAL)\s+)?(?:{_QUALIFIED_NAME}|(\())", re.IGNORECASE)
+_NEXT_COMMA = re.compile(r"\s*,")
+_CALL = re.compile(r"\s*\(")
+# Words that end a relation list item instead of aliasing it.
+_CLAUSE_WORDS = {
+    "where", "join", "inner", "left", "right", "full", "cross", "natural", "on", "using", "group", "order",
+    "having", "limit", "offset", "window", "union", "intersect", "except", "returning", "for", "set",
+    "restart", "continue", "cascade", "restrict", "tablesample", "with",
+}
+
+# After a JOIN target, the ON/USING condition runs until one of these words or a comma at depth 0.
+_JOIN_TAIL_TOKEN = re.compile(r"[(),]|[A-Za-z_]\w*")
+_JOIN_TAIL_END = {
+    "where", "join", "group", "order", "having", "limit", "offset", "fetch", "window", "union", "intersect",
+    "except", "returning", "for", "select", "from", "set", "values",
+}
+
+# Tag of cache entries whose tables could not all be identified; any write invalidates them.
+ANY_TABLE = "*"
+
+
+_cursor_ids = itertools.count(1)
+
+
+def unique_cursor_name(prefix: str) -> str:
+    """
+    A server-side cursor name no other call in this process uses.
+
+    Named cursors live until their transaction ends, so a fixed name fails
+    with DuplicateCursor while an earlier result on the connection is open.
+    """
+    return f"{prefix}_{next(_cursor_ids)}"
+
+
+def strip_comments_and_literals(sql: str) -> str:
+    """
+    Blank out comments and string literals so keyword scans don't match inside them.
+
+    :param sql: The SQL text.
+    :return: The SQL text with comments and literals replaced by a single space.
+    """
+    return _COMMENTS_AND_LITERALS.sub(" ", sql)
+
+
+def _table_name(name: str) -> str:
+    # Tags use the unqualified, case-folded table name. Qualified and
+    # unqualified references to the same table must land on the same tag.
+    last = re.split(r"\s*\.\s*", name)[-1]
+    if last.startswith('"'):
+        return last[1:-1]
+    return last.lower()
+
+
+def _collect_tables(pattern: re.Pattern, sql: str) -> Set[str]:
+    tables = set()
+    text = strip_comments_and_literals(sql)
+    for match in pattern.finditer(text):
+        keyword = match.group().split(None, 1)[0].lower()
+        name = _table_name(match.group(1))
+        if keyword == "join":
+            # "a JOIN b ON ..., c": the FROM list goes on after the join condition.
+            _collect_after_join(text, match.end(), tables)
+        if name.lower() in _NOT_TABLES:
+            continue
+        tables.add(name)
+        if keyword in _LIST_KEYWORDS:
+            _collect_list(text, match.end(), tables)
+    return tables
+
+
+def _collect_after_join(text: str, position: int, tables: Set[str]) -> None:
+    # Skips the alias and join condition of a JOIN target and follows a comma list after it, if any.
+    depth = 0
+    for token in _JOIN_TAIL_TOKEN.finditer(text, position):
+        value = token.group()
+        if value == "(":
+            depth += 1
+        elif value == ")":
+            if depth == 0:
+                return
+            depth -= 1
+        elif depth == 0:
+            if value == ",":
+                _collect_list(text, token.start(), tables)
+                return
+            if value.lower() in _JOIN_TAIL_END:
+                return
+
+
+def _collect_list(text: str, position: int, tables: Set[str]) -> None:
+    # Follows "a [AS] x, b y, ..." after the first relation of a FROM/USING/TRUNCATE list.
+    while True:
+        if _CALL.match(text, position):
+            # A set-returning function: it may read any table, and the list cannot be followed past it.
+            tables.add(ANY_TABLE)
+            return
+        alias = _ALIAS.match(text, position)
+        if alias is not None and alias.group(1).lower() not in _CLAUSE_WORDS:
+            position = alias.end()
+        item = _LIST_ITEM.match(text, position)
+        if item is None:
+            if _NEXT_COMMA.match(text, position):
+                # A list item this scan cannot read, e.g. a function call: give up on precision.
+                tables.add(ANY_TABLE)
+            return
+        if item.group(2):
+            # A subquery; its own FROM is scanned separately.
+            return
+        name = _table_name(item.group(1))
+        if name.lower() in _NOT_TABLES:
+            tables.add(ANY_TABLE)
+            return
+        tables.add(name)
+        position = item.end()
+
+
+def referenced_tables(sql: str) -> Set[str]:
+    """
+    Return every table a statement reads from or writes to.
+
+    This is a lexical scan, not a parse: it may report a few extra names
+    (function calls in FROM, CTE names). Where a relation list holds an item
+    it cannot read, the result includes ANY_TABLE so the caller can treat
+    the statement as depending on every table. Tables reached through views
+    or functions are not seen.
+
+    :param sql: The SQL text.
+    :return: A set of unqualified table names, possibly with ANY_TABLE.
+    """
+    return _collect_tables(_READ_TABLE_PATTERN, sql) | written_tables(sql)
+
+
+def written_tables(sql: str) -> Set[str]:
+    """
+    Return the tables a statement modifies (INSERT, UPDATE, DELETE, TRUNCATE, MERGE, COPY).
+
+    :param sql: The SQL text.
+    :return: A set of unqualified table names.
+    """
+    return _collect_tables(_WRITE_TABLE_PATTERN, sql)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory held by a query result in bytes.
+
+    Walks lists, tuples, dicts and Pydantic models recursively. Shared objects
+    are counted once.
+
+    :param value: A row, a model, or a list of either.
+    :return: The approximate size in bytes.
+    """
+    seen: Set[int] = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+    return total
+
+
+_FIRST_KEYWORD = re.compile(r"^\s*\(*\s*([A-Za-z]+)")
+
+_READ_ONLY_STATEMENTS = {"select", "with", "values", "table", "show"}
+
+_WRITE_IN_READ_PATTERN = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+)?UPDATE\b|\bFOR\s+(?:KEY\s+)?SHARE\b"
+    r"|\b(?:INSERT|UPDATE|DELETE|MERGE)\b|\bINTO\b|\b(?:nextval|setval|pg_advisory\w*)\s*\(",
+    re.IGNORECASE,
+)
+
+
+def is_read_only(sql: str) -> bool:
+    """
+    Decide whether a statement is safe to run on a read replica.
+
+    Only plain SELECT/WITH/VALUES/TABLE/SHOW statements qualify. Locking
+    clauses (FOR UPDATE/SHARE), data-modifying CTEs, SELECT INTO and sequence
+    or advisory-lock functions all count as writes.
+
+    :param sql: The SQL text.
+    :return: True if the statement does not write.
+    """
+    stripped = strip_comments_and_literals(sql)
+    match = _FIRST_KEYWORD.match(stripped)
+    if match is None or match.group(1).lower() not in _READ_ONLY_STATEMENTS:
+        return False
+    return _WRITE_IN_READ_PATTERN.search(stripped) is None
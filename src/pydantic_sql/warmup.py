@@ -0,0 +1,147 @@
+# src/pydantic_sql/warmup.py
+# Prepares hot queries on every new pool connection before it is handed out
+# Queries run once with prepare=True in pipelined batches, filling psycopg's prepared-statement cache in about one round trip per batch
+import time
+from types import ModuleType
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+from .exceptions import ConfigurationError
+from .query_compiler import CompiledQuery
+from .utils import is_read_only
+
+
+def collect_queries(source: Union[ModuleType, Iterable[Any]]) -> List[CompiledQuery]:
+    """
+    The distinct CompiledQuery objects in `source`.
+
+    :param source: Query objects, or a generated query module or package.
+        A module contributes the CompiledQuery objects named in its
+        `__all__`; on a lazy package this imports its query modules.
+    """
+    if isinstance(source, ModuleType):
+        names = getattr(source, "__all__", None) or [name for name in dir(source) if not name.startswith("_")]
+        source = [getattr(source, name) for name in names]
+    queries = {}
+    for query in source:
+        if isinstance(query, CompiledQuery):
+            queries.setdefault(query.sql, query)
+    return list(queries.values())
+
+
+class Warmup:
+    """
+    A pool `configure` callback that prepares queries on each new connection.
+
+    Pass it to psycopg_pool: `ConnectionPool(conninfo, configure=Warmup(queries))`,
+    or `AsyncConnectionPool(conninfo, configure=Warmup(queries).aconfigure)`.
+    The pool only hands the connection out once the callback returns.
+
+    Each read-only query is executed once, in autocommit, through a RawCursor
+    with prepare=True and CompiledQuery.placeholder_args(), which is how
+    CompiledQuery.run sends it too. psycopg prepares the statement on the
+    server and records it in the connection's prepared-statement cache, so
+    the first request skips the parse and its extra round trip. The cache is
+    keyed by the argument types: calls whose non-numeric arguments are not
+    str (dates, UUIDs, ...) miss it and are prepared on first use as before.
+    Writes are not warmed, since warming executes the query. Keep the list
+    to cheap lookups and within the connection's `prepared_max`.
+
+    Queries go out `batch_size` at a time, each batch in one pipeline.
+    Warming stops once `budget` seconds have passed, leaving the rest to be
+    prepared on first use. A query that fails (e.g. its table does not
+    exist yet) is skipped, not raised.
+    """
+
+    def __init__(
+        self,
+        queries: Union[ModuleType, Iterable[Any]],
+        budget: float = 1.0,
+        batch_size: int = 50,
+        configure: Optional[Callable[[Any], Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param queries: Query objects, or a generated query module or package.
+        :param budget: Seconds a connection may spend warming up.
+        :param batch_size: Statements per pipeline.
+        :param configure: Another configure callback, run before warming up
+            (a coroutine function when used through `aconfigure`).
+        :param clock: Time source, for tests.
+        """
+        if budget <= 0 or batch_size < 1:
+            raise ConfigurationError("budget must be positive and batch_size at least 1")
+        self.queries = [query for query in collect_queries(queries) if is_read_only(query.sql)]
+        self.budget = budget
+        self.batch_size = batch_size
+        self.configure = configure
+        self._clock = clock
+
+    def _batches(self):
+        for start in range(0, len(self.queries), self.batch_size):
+            yield self.queries[start:start + self.batch_size]
+
+    def __call__(self, conn: Any) -> None:
+        import psycopg
+
+        if self.configure is not None:
+            self.configure(conn)
+        deadline = self._clock() + self.budget
+        autocommit = conn.autocommit
+        # In autocommit nothing is left open, and ROLLBACK would clear psycopg's cache.
+        conn.autocommit = True
+        try:
+            for batch in self._batches():
+                if self._clock() >= deadline:
+                    break
+                cursors = [psycopg.RawCursor(conn) for _ in batch]
+                try:
+                    with conn.pipeline():
+                        for cur, query in zip(cursors, batch):
+                            cur.execute(query.sql, query.placeholder_args(), prepare=True)
+                except psycopg.Error:
+                    # The pipeline stops at the first error; redo the batch one query at a time.
+                    # Queries that made it are already cached and just run again.
+                    for cur, query in zip(cursors, batch):
+                        if self._clock() >= deadline:
+                            break
+                        try:
+                            cur.execute(query.sql, query.placeholder_args(), prepare=True)
+                        except psycopg.Error:
+                            pass
+                finally:
+                    for cur in cursors:
+                        cur.close()
+        finally:
+            conn.autocommit = autocommit
+
+    async def aconfigure(self, conn: Any) -> None:
+        """The asyncio counterpart of `__call__`, for AsyncConnectionPool."""
+        import psycopg
+
+        if self.configure is not None:
+            await self.configure(conn)
+        deadline = self._clock() + self.budget
+        autocommit = conn.autocommit
+        await conn.set_autocommit(True)
+        try:
+            for batch in self._batches():
+                if self._clock() >= deadline:
+                    break
+                cursors = [psycopg.AsyncRawCursor(conn) for _ in batch]
+                try:
+                    async with conn.pipeline():
+                        for cur, query in zip(cursors, batch):
+                            await cur.execute(query.sql, query.placeholder_args(), prepare=True)
+                except psycopg.Error:
+                    for cur, query in zip(cursors, batch):
+                        if self._clock() >= deadline:
+                            break
+                        try:
+                            await cur.execute(query.sql, query.placeholder_args(), prepare=True)
+                        except psycopg.Error:
+                            pass
+                finally:
+                    for cur in cursors:
+                        await cur.close()
+        finally:
+            await conn.set_autocommit(autocommit)
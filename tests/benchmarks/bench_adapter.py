@@ -0,0 +1,220 @@
+# tests/benchmarks/bench_adapter.py
+# Micro-benchmarks for the adapter hot paths
+# Usage (from the repo root): python tests/benchmarks/bench_adapter.py [--output results.json] [--baseline old.json]
+# Database benchmarks run against the test database from tests/setup_test_db.py, which is recreated first.
+"""
+Time the adapter's hot paths (compiling SQL, binding parameters, mapping rows,
+and database round trips) and compare the results with a saved baseline.
+"""
+import argparse
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "examples"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from pydantic import create_model  # noqa: E402
+
+from pydantic_sql.fingerprint import normalize_sql  # noqa: E402
+from pydantic_sql.pagination import keyset_query  # noqa: E402
+from pydantic_sql.pipeline import pipelined_fetch, validate_batch  # noqa: E402
+from pydantic_sql.query_compiler import CompiledQuery, to_positional  # noqa: E402
+
+JOIN_SQL = """
+    SELECT o.id, o.quantity, o.total_price, u.name AS user_name, u.email, p.name AS product_name, p.price
+    FROM orders o JOIN users u ON u.id = o.user_id JOIN products p ON p.id = o.product_id
+    WHERE u.age >= :min_age AND p.price < :max_price AND o.quantity IN (:q1, :q2, :q3)
+    ORDER BY o.order_date DESC
+"""
+
+WIDE_COLUMNS = 60
+
+
+def measure(fn: Callable[[], object], rounds: int, min_time: float = 0.05) -> Dict[str, float]:
+    """
+    Time `fn` in `rounds` rounds, each repeating it until `min_time` has passed.
+
+    :return: Per-call median/min/max in microseconds.
+    """
+    # Calibrate the number of calls per round once, so every round does the same work.
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        if time.perf_counter() - start >= min_time or calls >= 1 << 20:
+            break
+        calls *= 2
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - start) / calls * 1_000_000)
+    return {
+        "median_us": statistics.median(samples),
+        "min_us": min(samples),
+        "max_us": max(samples),
+        "calls_per_round": calls,
+        "rounds": rounds,
+    }
+
+
+def pure_benchmarks() -> Dict[str, Callable[[], object]]:
+    narrow_row = {"id": 1, "name": "Electronics", "description": "Gadgets"}
+    wide_model = create_model("Wide", **{f"c{i}": (int, ...) for i in range(WIDE_COLUMNS)})
+    wide_row = {f"c{i}": i for i in range(WIDE_COLUMNS)}
+    # Same fields as examples/models.py Category; importing that module needs email-validator for User.
+    Category = create_model("Category", id=(int, ...), name=(str, ...), description=(Optional[str], None))
+
+    columns = list(narrow_row)
+    narrow_rows = [tuple(narrow_row.values())] * 1000
+
+    # The binder a generated module builds for JOIN_SQL: int4 and numeric parameters.
+    positional, names = to_positional(JOIN_SQL)
+    join_query = CompiledQuery("JoinOrders", positional, names, [23, 1700, 23, 23, 23])
+    join_params = {"min_age": 18, "max_price": Decimal("1000"), "q1": 1, "q2": 2, "q3": 3}
+    JoinParams = create_model("JoinParams", **{name: (object, ...) for name in names})
+    join_model = JoinParams(**join_params)
+    return {
+        "compile/to_positional": lambda: to_positional(JOIN_SQL),
+        "compile/normalize_sql": lambda: normalize_sql(JOIN_SQL),
+        "compile/keyset_query": lambda: keyset_query(
+            "SELECT * FROM orders WHERE user_id = %(user_id)s", {"user_id": 1}, ["order_date DESC", "id DESC"], 50,
+            [datetime.now(timezone.utc), 10],
+        ),
+        "bind/mapping": lambda: join_query.bind(join_params),
+        "bind/model": lambda: join_query.bind(join_model),
+        "map/narrow_row": lambda: Category.model_validate(narrow_row),
+        "map/wide_row": lambda: wide_model.model_validate(wide_row),
+        "map/narrow_batch_1000": lambda: validate_batch(Category, columns, narrow_rows),
+    }
+
+
+def db_benchmarks(conn) -> Dict[str, Callable[[], object]]:
+    from psycopg.rows import dict_row
+
+    from models import Order, User
+
+    point_sql = "SELECT * FROM users WHERE id = %s"
+    # Every :name in JOIN_SQL is used once, so $n order is the order of the %s placeholders.
+    join_sql = re.sub(r"\$\d+", "%s", to_positional(JOIN_SQL)[0])
+    join_params = (18, Decimal("1000"), 1, 2, 3)
+    user_rows = [(f"Bench {i}", f"bench{i}@example.com", 30) for i in range(500)]
+
+    def point_raw():
+        return conn.execute(point_sql, (1,)).fetchone()
+
+    def point_mapped():
+        with conn.cursor(row_factory=dict_row) as cur:
+            return User.model_validate(cur.execute(point_sql, (1,)).fetchone())
+
+    def join_raw():
+        return conn.execute(join_sql, join_params).fetchall()
+
+    def orders_mapped():
+        with conn.cursor(row_factory=dict_row) as cur:
+            return [Order.model_validate(row) for row in cur.execute("SELECT * FROM orders").fetchall()]
+
+    def insert_executemany():
+        with conn.transaction(force_rollback=True), conn.cursor() as cur:
+            cur.executemany("INSERT INTO users (name, email, age) VALUES (%s, %s, %s)", user_rows)
+
+    def insert_copy():
+        with conn.transaction(force_rollback=True), conn.cursor() as cur:
+            with cur.copy("COPY users (name, email, age) FROM STDIN") as copy:
+                for row in user_rows:
+                    copy.write_row(row)
+
+    def stream_raw():
+        with conn.transaction(), conn.cursor() as cur:
+            return sum(1 for _ in cur.stream("SELECT * FROM generate_series(1, 10000) AS g(id)"))
+
+    def stream_pipelined():
+        with conn.transaction():
+            return sum(1 for _ in pipelined_fetch(conn, "SELECT * FROM orders", batch_size=1000, model=Order))
+
+    return {
+        "e2e/point_lookup_raw": point_raw,
+        "e2e/point_lookup_mapped": point_mapped,
+        "e2e/join_raw": join_raw,
+        "e2e/orders_mapped": orders_mapped,
+        "bulk/insert_500_executemany": insert_executemany,
+        "bulk/insert_500_copy": insert_copy,
+        "stream/generate_series_10k": stream_raw,
+        "stream/orders_pipelined": stream_pipelined,
+    }
+
+
+def compare(baseline: Dict, results: Dict, threshold: float) -> List[str]:
+    """Benchmarks whose median got slower than the baseline by more than `threshold` (0.2 = 20%)."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            continue
+        ratio = result["median_us"] / before["median_us"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {before['median_us']:.1f}us -> {result['median_us']:.1f}us ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="A previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown over the baseline (0.2 = 20%%)")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--no-db", action="store_true", help="Skip the benchmarks that need Postgres")
+    args = parser.parse_args(argv)
+
+    benchmarks = pure_benchmarks()
+    conn = None
+    if not args.no_db:
+        import psycopg
+
+        from setup_test_db import DB_HOST, DB_NAME, DB_PASSWORD, DB_USER, setup_test_db
+
+        setup_test_db()
+        conn = psycopg.connect(dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD, host=DB_HOST, autocommit=True)
+        benchmarks.update(db_benchmarks(conn))
+
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "benchmarks": {},
+    }
+    try:
+        for name, fn in benchmarks.items():
+            if args.filter in name:
+                results["benchmarks"][name] = result = measure(fn, args.rounds)
+                print(f"{name:<40} {result['median_us']:>12.2f} us  (min {result['min_us']:.2f})")
+    finally:
+        if conn is not None:
+            conn.close()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(json.loads(Path(args.baseline).read_text()), results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
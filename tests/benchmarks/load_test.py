@@ -0,0 +1,372 @@
+# tests/benchmarks/load_test.py
+# Concurrent load generator for judging pooling, caching and async behaviour under contention
+# Usage (from the repo root): python tests/benchmarks/load_test.py --workers 32 --duration 30 --mix point=70,join=20,insert=9,bulk=1 [--async]
+# Runs against the test database from tests/setup_test_db.py; pass --setup to recreate it first.
+# Statements go through ReplicaRouter, reads through ResultCache and SingleFlight (see --no-cache, --no-singleflight).
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from pydantic_sql.cache import ResultCache  # noqa: E402
+from pydantic_sql.instrumentation import LatencyHistogram  # noqa: E402
+from pydantic_sql.routing import LEAST_OUTSTANDING, ROUND_ROBIN, ReplicaRouter  # noqa: E402
+from pydantic_sql.singleflight import AsyncSingleFlight, SingleFlight  # noqa: E402
+
+BULK_ROWS = 200
+# Users (and their orders) inserted by tests/setup_test_db.sql, ids 1..SEEDED_USERS.
+SEEDED_USERS = 5
+
+# Each operation is one (sql, params factory, read-only) statement.
+# Bulk loads are handled separately because they use COPY.
+OPERATIONS: Dict[str, Tuple[str, Callable[[random.Random], Any], bool]] = {
+    "point": ("SELECT * FROM users WHERE id = %s", lambda r: (r.randint(1, SEEDED_USERS),), True),
+    "join": (
+        "SELECT o.id, o.quantity, o.total_price, u.name, p.name, p.price FROM orders o "
+        "JOIN users u ON u.id = o.user_id JOIN products p ON p.id = o.product_id WHERE u.id = %s",
+        lambda r: (r.randint(1, SEEDED_USERS),),
+        True,
+    ),
+    "insert": (
+        "INSERT INTO users (name, email, age) VALUES (%s, %s, %s)",
+        lambda r: ("Load Test", f"load-{uuid.uuid4().hex}@example.com", r.randint(18, 90)),
+        False,
+    ),
+}
+
+_BULK_COPY = "COPY users (name, email, age) FROM STDIN"
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse "point=70,join=20" into operation weights."""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name not in OPERATIONS and name != "bulk":
+            raise SystemExit(f"Unknown operation {name!r} in --mix")
+        weights[name] = int(weight or 1)
+    return weights
+
+
+def _bulk_rows() -> List[tuple]:
+    return [("Bulk Load", f"bulk-{uuid.uuid4().hex}@example.com", 40) for _ in range(BULK_ROWS)]
+
+
+class Recorder:
+    """Thread-safe per-operation latency, pool-wait histogram and error counts."""
+
+    def __init__(self):
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.wait = LatencyHistogram()
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, duration: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            if error is not None:
+                self.errors[type(error).__name__] = self.errors.get(type(error).__name__, 0) + 1
+                return
+            self.latency.setdefault(operation, LatencyHistogram()).record(duration)
+
+    def record_wait(self, wait: float) -> None:
+        with self._lock:
+            self.wait.record(wait)
+
+
+class Workload:
+    """
+    Runs operations the way an application on this adapter would.
+
+    Every statement borrows its connection through the ReplicaRouter. Reads
+    are coalesced with SingleFlight and served from the ResultCache; writes
+    invalidate the cache entries of the tables they touch. Operation latency
+    is measured end to end, so cache hits count; pool waits only when a
+    connection was actually borrowed.
+    """
+
+    def __init__(self, router: ReplicaRouter, recorder: Recorder, cache: Optional[ResultCache], use_singleflight: bool):
+        self.router = router
+        self.recorder = recorder
+        self.cache = cache
+        self.flight = SingleFlight() if use_singleflight else None
+        self.aflight = AsyncSingleFlight() if use_singleflight else None
+
+    def run(self, operation: str, rng: random.Random) -> None:
+        if operation == "bulk":
+            requested = time.perf_counter()
+            with self.router.connection(_BULK_COPY, read_only=False) as conn:
+                self.recorder.record_wait(time.perf_counter() - requested)
+                with conn.transaction(), conn.cursor() as cur, cur.copy(_BULK_COPY) as copy:
+                    for row in _bulk_rows():
+                        copy.write_row(row)
+            self._invalidate(_BULK_COPY)
+            return
+        sql, params, read_only = OPERATIONS[operation]
+        params = params(rng)
+        if not read_only:
+            self._execute(sql, params, read_only)
+            self._invalidate(sql)
+            return
+
+        def load() -> List[tuple]:
+            return self._execute(sql, params, read_only)
+
+        if self.flight is not None:
+            load_once = load
+
+            def load() -> List[tuple]:
+                return self.flight.run(sql, params, load_once, read_only=True)
+
+        if self.cache is not None:
+            self.cache.get_or_load(sql, params, load)
+        else:
+            load()
+
+    def _execute(self, sql: str, params: Any, read_only: bool) -> List[tuple]:
+        requested = time.perf_counter()
+        with self.router.connection(sql, read_only) as conn:
+            self.recorder.record_wait(time.perf_counter() - requested)
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute(sql, params)
+                return cur.fetchall() if cur.description is not None else []
+
+    async def arun(self, operation: str, rng: random.Random) -> None:
+        if operation == "bulk":
+            requested = time.perf_counter()
+            async with self.router.aconnection(_BULK_COPY, read_only=False) as conn:
+                self.recorder.record_wait(time.perf_counter() - requested)
+                async with conn.transaction(), conn.cursor() as cur, cur.copy(_BULK_COPY) as copy:
+                    for row in _bulk_rows():
+                        await copy.write_row(row)
+            self._invalidate(_BULK_COPY)
+            return
+        sql, params, read_only = OPERATIONS[operation]
+        params = params(rng)
+        if not read_only:
+            await self._aexecute(sql, params, read_only)
+            self._invalidate(sql)
+            return
+
+        def load():
+            if self.aflight is not None:
+                return self.aflight.run(sql, params, lambda: self._aexecute(sql, params, read_only), read_only=True)
+            return self._aexecute(sql, params, read_only)
+
+        if self.cache is not None:
+            await self.cache.aget_or_load(sql, params, load)
+        else:
+            await load()
+
+    async def _aexecute(self, sql: str, params: Any, read_only: bool) -> List[tuple]:
+        requested = time.perf_counter()
+        async with self.router.aconnection(sql, read_only) as conn:
+            self.recorder.record_wait(time.perf_counter() - requested)
+            async with conn.transaction(), conn.cursor() as cur:
+                await cur.execute(sql, params)
+                return await cur.fetchall() if cur.description is not None else []
+
+    def _invalidate(self, sql: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate_sql(sql)
+
+
+def run_sync(workload: Workload, weights: Dict[str, int], workers: int, duration: float) -> None:
+    deadline = time.monotonic() + duration
+    names, odds = list(weights), list(weights.values())
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            operation = rng.choices(names, odds)[0]
+            start = time.perf_counter()
+            error = None
+            try:
+                # PoolTimeout is raised while borrowing, so it is counted like any other failure.
+                workload.run(operation, rng)
+            except Exception as e:
+                error = e
+            workload.recorder.record(operation, time.perf_counter() - start, error)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+async def run_async(workload: Workload, weights: Dict[str, int], workers: int, duration: float) -> None:
+    deadline = time.monotonic() + duration
+    names, odds = list(weights), list(weights.values())
+
+    async def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            operation = rng.choices(names, odds)[0]
+            start = time.perf_counter()
+            error = None
+            try:
+                await workload.arun(operation, rng)
+            except Exception as e:
+                error = e
+            workload.recorder.record(operation, time.perf_counter() - start, error)
+
+    await asyncio.gather(*(worker(i) for i in range(workers)))
+
+
+def sample_pool(pools: List[Any], interval: float, samples: List[Dict[str, Any]], stop: threading.Event) -> None:
+    """Record the pools' combined size and queue every `interval` seconds until `stop` is set."""
+    start = time.monotonic()
+    while not stop.wait(interval):
+        stats = [pool.get_stats() for pool in pools]
+        samples.append(
+            {
+                "t": round(time.monotonic() - start, 2),
+                "connections": sum(s.get("pool_size", 0) for s in stats),
+                "available": sum(s.get("pool_available", 0) for s in stats),
+                "waiting": sum(s.get("requests_waiting", 0) for s in stats),
+            }
+        )
+
+
+def pool_stats(pools: List[Any]) -> Dict[str, int]:
+    """The pools' get_stats() counters, summed."""
+    totals: Dict[str, int] = {}
+    for pool in pools:
+        for name, value in pool.get_stats().items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
+
+
+def _percentiles(histogram: LatencyHistogram) -> Dict[str, float]:
+    return {
+        "count": histogram.count,
+        "p50_ms": histogram.percentile(50) / 1000,
+        "p95_ms": histogram.percentile(95) / 1000,
+        "p99_ms": histogram.percentile(99) / 1000,
+        "max_ms": histogram.max / 1000,
+    }
+
+
+def report(
+    workload: Workload, elapsed: float, samples: List[Dict[str, Any]], final_stats: Dict[str, int]
+) -> Dict:
+    recorder = workload.recorder
+    total = sum(histogram.count for histogram in recorder.latency.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "rps": round(total / elapsed, 1),
+        "errors": recorder.errors,
+        "operations": {name: _percentiles(histogram) for name, histogram in sorted(recorder.latency.items())},
+        "pool_wait": _percentiles(recorder.wait),
+        "cache": workload.cache.stats().model_dump() if workload.cache is not None else None,
+        "pool_stats": final_stats,
+        "pool_samples": samples,
+    }
+
+
+def print_report(result: Dict) -> None:
+    print(f"{result['requests']} requests in {result['elapsed_s']}s: {result['rps']} req/s, errors: {result['errors'] or 'none'}")
+    print(f"{'operation':<12} {'count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stats in [*result["operations"].items(), ("pool wait", result["pool_wait"])]:
+        print(
+            f"{name:<12} {stats['count']:>8} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+            f"{stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}"
+        )
+    if result["cache"] is not None:
+        print(f"cache: {result['cache']['hits']} hits, {result['cache']['misses']} misses")
+    print("connections over time: " + " ".join(f"{s['t']}s:{s['connections']}" for s in result["pool_samples"]))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent load test against the test database")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent threads or tasks")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--mix", default="point=70,join=20,insert=9,bulk=1", help="Operation weights")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use asyncio tasks and AsyncConnectionPool")
+    parser.add_argument("--min-size", type=int, default=4, help="Pool min_size")
+    parser.add_argument("--max-size", type=int, default=16, help="Pool max_size")
+    parser.add_argument("--pool-timeout", type=float, default=30.0, help="Seconds to wait for a pooled connection")
+    parser.add_argument("--replica", action="append", default=[], help="Conninfo of a read replica (repeatable)")
+    parser.add_argument("--strategy", choices=[ROUND_ROBIN, LEAST_OUTSTANDING], default=ROUND_ROBIN, help="Replica routing")
+    parser.add_argument("--cache-ttl", type=float, default=1.0, help="Seconds reads stay in the result cache")
+    parser.add_argument("--no-cache", action="store_true", help="Send every read to the database")
+    parser.add_argument("--no-singleflight", action="store_true", help="Do not coalesce identical concurrent reads")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between pool samples")
+    parser.add_argument("--setup", action="store_true", help="Recreate the test database first")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    from psycopg_pool import AsyncConnectionPool, ConnectionPool
+    from setup_test_db import DB_HOST, DB_NAME, DB_PASSWORD, DB_USER, setup_test_db
+
+    if args.setup:
+        setup_test_db()
+    conninfo = f"dbname={DB_NAME} user={DB_USER} password={DB_PASSWORD} host={DB_HOST}"
+    weights = parse_mix(args.mix)
+    pool_kwargs = dict(min_size=args.min_size, max_size=args.max_size, timeout=args.pool_timeout)
+    cache = None if args.no_cache else ResultCache(default_ttl=args.cache_ttl)
+    samples: List[Dict[str, Any]] = []
+    stop = threading.Event()
+
+    def workload_for(pools: List[Any]) -> Workload:
+        router = ReplicaRouter(pools[0], pools[1:], args.strategy)
+        return Workload(router, Recorder(), cache, not args.no_singleflight)
+
+    start = time.monotonic()
+    if args.use_async:
+
+        async def run() -> Tuple[Workload, Dict[str, int]]:
+            pools = [AsyncConnectionPool(info, open=False, **pool_kwargs) for info in [conninfo, *args.replica]]
+            for pool in pools:
+                await pool.open()
+            try:
+                workload = workload_for(pools)
+                sampler = threading.Thread(target=sample_pool, args=(pools, args.sample_interval, samples, stop))
+                sampler.start()
+                try:
+                    await run_async(workload, weights, args.workers, args.duration)
+                finally:
+                    stop.set()
+                    sampler.join()
+                return workload, pool_stats(pools)
+            finally:
+                for pool in pools:
+                    await pool.close()
+
+        workload, final_stats = asyncio.run(run())
+    else:
+        pools = [ConnectionPool(info, open=True, **pool_kwargs) for info in [conninfo, *args.replica]]
+        try:
+            workload = workload_for(pools)
+            sampler = threading.Thread(target=sample_pool, args=(pools, args.sample_interval, samples, stop))
+            sampler.start()
+            try:
+                run_sync(workload, weights, args.workers, args.duration)
+            finally:
+                stop.set()
+                sampler.join()
+            final_stats = pool_stats(pools)
+        finally:
+            for pool in pools:
+                pool.close()
+
+    result = report(workload, time.monotonic() - start, samples, final_stats)
+    print_report(result)
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
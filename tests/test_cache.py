@@ -0,0 +1,145 @@
+# tests/test_cache.py
+
+import asyncio
+from decimal import Decimal
+
+from pydantic_sql.cache import ResultCache, cache_key
+from pydantic_sql.utils import ANY_TABLE, referenced_tables, written_tables
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_normalizes_params():
+    sql = "SELECT * FROM users WHERE id = %(id)s AND name = %(name)s"
+    assert cache_key(sql, {"id": 1, "name": "a"}) == cache_key(sql, {"name": "a", "id": 1})
+    assert cache_key(sql, {"id": 1}) != cache_key(sql, {"id": "1"})
+    assert cache_key(sql, {"id": 1}) != cache_key(sql, {"id": Decimal(1)})
+
+
+def test_table_tags():
+    sql = """
+    SELECT o.*, u.name FROM public.orders o
+    JOIN "Users" u ON o.user_id = u.id -- FROM comments
+    WHERE u.name <> 'FROM products'
+    FOR UPDATE OF o
+    """
+    assert referenced_tables(sql) == {"orders", "Users"}
+    assert written_tables("UPDATE products SET stock = 0") == {"products"}
+    assert written_tables(
+        "INSERT INTO categories (name) VALUES ('x') ON CONFLICT (name) DO UPDATE SET name = 'y'"
+    ) == {"categories"}
+    assert written_tables("SELECT * FROM products") == set()
+
+
+def test_relation_lists():
+    assert referenced_tables("SELECT * FROM categories c, products AS p WHERE c.id = p.category_id") == {
+        "categories",
+        "products",
+    }
+    assert referenced_tables("DELETE FROM orders USING users u, carts WHERE true") == {"orders", "users", "carts"}
+    assert written_tables("TRUNCATE a, ONLY b RESTART IDENTITY") == {"a", "b"}
+    assert referenced_tables("SELECT * FROM a, generate_series(1, 3) g, b") == {"a", "generate_series", ANY_TABLE}
+
+
+def test_relation_lists_after_joins():
+    assert referenced_tables("SELECT * FROM a JOIN b ON a.id=b.id, c") == {"a", "b", "c"}
+    assert referenced_tables("SELECT * FROM a NATURAL JOIN b, c") == {"a", "b", "c"}
+    assert referenced_tables("SELECT * FROM a, b JOIN c USING (id), d") == {"a", "b", "c", "d"}
+    # Commas inside the join condition or after the FROM clause are not list separators.
+    assert referenced_tables("SELECT x, y FROM a JOIN b ON b.id = f(a.x, a.y) ORDER BY x, y") == {"a", "b"}
+
+
+def test_hit_miss_and_ttl():
+    clock = FakeClock()
+    cache = ResultCache(default_ttl=10, clock=clock)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return [{"id": 1}]
+
+    sql = "SELECT * FROM categories"
+    assert cache.get_or_load(sql, None, load) == [{"id": 1}]
+    assert cache.get_or_load(sql, None, load) == [{"id": 1}]
+    assert len(calls) == 1
+
+    clock.now = 11
+    cache.get_or_load(sql, None, load)
+    assert len(calls) == 2
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expirations) == (1, 2, 1)
+
+
+def test_lru_eviction_by_bytes():
+    cache = ResultCache(max_bytes=2000)
+    cache.put("a", "x" * 800)
+    cache.put("b", "x" * 800)
+    cache.get("a")
+    cache.put("c", "x" * 800)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.stats().evictions == 1
+
+
+def test_write_invalidates_dependent_entries():
+    notified = []
+    cache = ResultCache(on_invalidate=notified.append)
+    cache.get_or_load("SELECT * FROM products JOIN categories ON true", None, lambda: [1])
+    cache.get_or_load("SELECT * FROM users", None, lambda: [2])
+
+    assert cache.invalidate_sql("UPDATE categories SET name = 'x'") == 1
+    assert notified == [{"categories"}]
+    assert cache.stats().entries == 1
+
+
+def test_any_table_entries_drop_on_every_write():
+    cache = ResultCache()
+    cache.put("k", [1], tags={ANY_TABLE})
+    assert cache.invalidate_sql("UPDATE users SET name = 'x'") == 1
+    assert cache.get("k") is None
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    cache = ResultCache()
+    calls = []
+
+    def load():
+        calls.append(1)
+        # Another request writes to products while this one is still reading.
+        cache.invalidate_sql("UPDATE products SET stock = 0")
+        return [1]
+
+    sql = "SELECT * FROM products"
+    assert cache.get_or_load(sql, None, load) == [1]
+    assert cache.get_or_load(sql, None, lambda: [2]) == [2]
+    assert cache.get_or_load(sql, None, lambda: [3]) == [2]
+
+
+def test_async_get_or_load():
+    cache = ResultCache()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return [1]
+
+    async def racing_load():
+        cache.invalidate_sql("UPDATE products SET stock = 0")
+        return [0]
+
+    async def main():
+        sql = "SELECT * FROM products"
+        assert await cache.aget_or_load(sql, None, racing_load) == [0]
+        assert await cache.aget_or_load(sql, None, load) == [1]
+        assert await cache.aget_or_load(sql, None, load) == [1]
+
+    asyncio.run(main())
+    assert calls == [1]
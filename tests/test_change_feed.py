@@ -0,0 +1,143 @@
+# tests/test_change_feed.py
+
+import asyncio
+import json
+from contextlib import aclosing
+
+import psycopg
+import pytest
+from psycopg import Notify
+from pydantic import BaseModel
+
+from pydantic_sql.change_feed import ChangeFeed
+from pydantic_sql.exceptions import ConfigurationError, ValidationError
+
+
+class Order(BaseModel):
+    id: int
+    status: str
+
+
+def notify(id, status="new", channel="orders"):
+    return Notify(channel, json.dumps({"id": id, "status": status}), 1)
+
+
+class FakeConnection:
+    """Delivers scripted packets of notifications; a None packet drops the connection."""
+
+    def __init__(self, packets):
+        self.packets = list(packets)
+        self.statements = []
+        self.closed = False
+
+    async def execute(self, statement):
+        self.statements.append(statement.as_string(None) if hasattr(statement, "as_string") else statement)
+
+    async def notifies(self):
+        while self.packets:
+            packet = self.packets.pop(0)
+            if packet is None:
+                raise psycopg.OperationalError("server closed the connection")
+            for item in packet:
+                yield item
+            await asyncio.sleep(0)
+        await asyncio.Event().wait()
+
+    async def close(self):
+        self.closed = True
+
+
+def feed(connections, **kwargs):
+    connections = list(connections)
+
+    async def connect():
+        return connections.pop(0)
+
+    kwargs.setdefault("reconnect_delay", 0)
+    return ChangeFeed("", ["orders"], Order, connect=connect, **kwargs)
+
+
+async def take(iterator, count):
+    batches = []
+    async with aclosing(iterator.batches()) as stream:
+        async for batch in stream:
+            batches.append(batch)
+            if len(batches) == count:
+                break
+    return batches
+
+
+def test_batches_follow_wakeups():
+    conn = FakeConnection([[notify(1), notify(2), notify(3)], [notify(4)]])
+    batches = asyncio.run(take(feed([conn]), 2))
+    assert [[order.id for order in batch] for batch in batches] == [[1, 2, 3], [4]]
+    assert conn.statements == ['LISTEN "orders"'] and conn.closed
+
+
+def test_max_batch_splits_a_wakeup():
+    conn = FakeConnection([[notify(i) for i in range(5)]])
+    batches = asyncio.run(take(feed([conn], max_batch=2), 3))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_reconnects_and_catches_up():
+    first = FakeConnection([[notify(1)], None])
+    second = FakeConnection([[notify(3)]])
+    seen = []
+
+    async def catch_up(conn):
+        seen.append(conn)
+        return [{"id": 2, "status": "paid"}]
+
+    batches = asyncio.run(take(feed([first, second], catch_up=catch_up), 3))
+    assert [[order.id for order in batch] for batch in batches] == [[1], [2], [3]]
+    assert seen == [second] and first.closed
+    assert second.statements == ['LISTEN "orders"']
+
+
+def test_catch_up_on_start():
+    async def catch_up(conn):
+        return [Order(id=0, status="old")]
+
+    conn = FakeConnection([[notify(1)]])
+    batches = asyncio.run(take(feed([conn], catch_up=catch_up, catch_up_on_start=True), 2))
+    assert [batch[0].id for batch in batches] == [0, 1]
+
+
+def test_invalid_payloads_are_skipped_and_reported():
+    errors = []
+    conn = FakeConnection([[notify(1), Notify("orders", "{not json", 1), notify(2)], [Notify("orders", "[]", 1)], [notify(3)]])
+    changes = feed([conn], on_error=lambda item, error: errors.append((item.payload, type(error))))
+    batches = asyncio.run(take(changes, 2))
+    assert [[order.id for order in batch] for batch in batches] == [[1, 2], [3]]
+    assert errors == [("{not json", ValidationError), ("[]", ValidationError)] and changes.invalid == 2
+
+
+def test_slow_consumer_is_bounded():
+    conn = FakeConnection([[notify(i) for i in range(10)]])
+    changes = feed([conn], max_queued=3)
+
+    async def run():
+        stream = changes.batches()
+        first = await stream.__anext__()
+        await asyncio.sleep(0.01)
+        second = await stream.__anext__()
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    # The reader stopped at a full queue instead of buffering all ten.
+    assert [order.id for order in first] == [0, 1, 2] and [order.id for order in second] == [3, 4, 5]
+
+
+def test_without_model_yields_json():
+    async def connect():
+        return FakeConnection([[notify(1)]])
+
+    batches = asyncio.run(take(ChangeFeed("", ["orders"], connect=connect), 1))
+    assert batches == [[{"id": 1, "status": "new"}]]
+
+
+def test_needs_channels():
+    with pytest.raises(ConfigurationError):
+        ChangeFeed("", [])
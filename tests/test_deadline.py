@@ -0,0 +1,143 @@
+# tests/test_deadline.py
+
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+
+import psycopg
+import pytest
+
+from pydantic_sql.deadline import Deadline, _timeout_params, adeadline, deadline
+from pydantic_sql.exceptions import LockTimeoutError, QueryTimeoutError
+
+
+class FakeCursor:
+    def __init__(self, row):
+        self.row = row
+
+    def fetchone(self):
+        return self.row
+
+
+class FakeConnection:
+    """
+    Tracks statement_timeout/lock_timeout the way the server scopes them: a
+    local setting is undone by rolling back its transaction or savepoint,
+    survives a savepoint release, and is dropped at the outermost commit.
+    """
+
+    def __init__(self, error=None):
+        self.session = {"statement_timeout": "0", "lock_timeout": "0"}
+        self.settings = dict(self.session)
+        self.frames = []
+        self.error = error
+
+    def execute(self, query, params=None):
+        if params is None:
+            if self.error is not None:
+                raise self.error
+            return FakeCursor(None)
+        if query.startswith("SELECT current_setting"):
+            previous = (self.settings["statement_timeout"], self.settings["lock_timeout"])
+        else:
+            previous = ()
+        self.settings["statement_timeout"], self.settings["lock_timeout"] = params
+        return FakeCursor(previous + params)
+
+    @contextmanager
+    def transaction(self):
+        self.frames.append(dict(self.settings))
+        try:
+            yield
+        except BaseException:
+            self.settings = self.frames.pop()
+            raise
+        self.frames.pop()
+        if not self.frames:
+            self.settings = dict(self.session)
+
+
+class AsyncFakeConnection(FakeConnection):
+    async def execute(self, query, params=None):
+        cursor = FakeConnection.execute(self, query, params)
+
+        class AsyncCursor:
+            async def fetchone(self):
+                return cursor.row
+
+        return AsyncCursor()
+
+    @asynccontextmanager
+    async def transaction(self):
+        with FakeConnection.transaction(self):
+            yield
+
+
+def test_timeout_params():
+    assert _timeout_params(2.5, None) == ("2500ms", "2500ms")
+    assert _timeout_params(2.5, 0.1) == ("2500ms", "100ms")
+    # A zero timeout would disable the limit, so it is rounded up.
+    assert _timeout_params(0, 0) == ("1ms", "1ms")
+
+
+def test_deadline_remaining():
+    deadline = Deadline(60)
+    assert 59 < deadline.remaining() <= 60
+    assert not deadline.expired
+    assert Deadline(-1).expired
+
+
+def test_deadline_sets_timeouts_for_the_block():
+    conn = FakeConnection()
+    with deadline(conn, 2, lock_timeout=0.5):
+        assert conn.settings == {"statement_timeout": "2000ms", "lock_timeout": "500ms"}
+    assert conn.settings == {"statement_timeout": "0", "lock_timeout": "0"}
+
+
+def test_deadline_restores_previous_timeouts_in_outer_transaction():
+    conn = FakeConnection()
+    with conn.transaction():
+        conn.execute("SELECT set_config", ("30000ms", "10000ms"))
+        with deadline(conn, 1):
+            assert conn.settings["statement_timeout"] == "1000ms"
+        # The savepoint was released; the outer transaction keeps its own limits.
+        assert conn.settings == {"statement_timeout": "30000ms", "lock_timeout": "10000ms"}
+        with pytest.raises(RuntimeError):
+            with deadline(conn, 1):
+                raise RuntimeError
+        assert conn.settings == {"statement_timeout": "30000ms", "lock_timeout": "10000ms"}
+
+
+def test_deadline_converts_timeouts():
+    conn = FakeConnection(psycopg.errors.QueryCanceled("canceling statement due to statement timeout"))
+    with pytest.raises(QueryTimeoutError):
+        with deadline(conn, 1):
+            conn.execute("SELECT pg_sleep(2)")
+    conn = FakeConnection(psycopg.errors.LockNotAvailable("canceling statement due to lock timeout"))
+    with pytest.raises(LockTimeoutError):
+        with deadline(conn, 1):
+            conn.execute("LOCK users")
+    assert conn.settings == {"statement_timeout": "0", "lock_timeout": "0"}
+
+
+def test_adeadline_restores_previous_timeouts():
+    async def run():
+        conn = AsyncFakeConnection()
+        async with conn.transaction():
+            await conn.execute("SELECT set_config", ("30000ms", "10000ms"))
+            async with adeadline(conn, 1):
+                assert conn.settings["statement_timeout"] == "1000ms"
+            assert conn.settings["statement_timeout"] == "30000ms"
+        return conn
+
+    conn = asyncio.run(run())
+    assert conn.settings == {"statement_timeout": "0", "lock_timeout": "0"}
+
+
+def test_adeadline_converts_timeouts():
+    async def run():
+        conn = AsyncFakeConnection(psycopg.errors.QueryCanceled("canceling statement due to statement timeout"))
+        async with adeadline(conn, 1):
+            await conn.execute("SELECT pg_sleep(2)")
+
+    with pytest.raises(QueryTimeoutError):
+        asyncio.run(run())
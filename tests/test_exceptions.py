@@ -0,0 +1,50 @@
+# tests/test_exceptions.py
+
+from psycopg import errors
+
+from pydantic_sql.exceptions import (
+    DeadlockError,
+    LockNotAvailableError,
+    LockTimeoutError,
+    QueryError,
+    QueryTimeoutError,
+    RetryableError,
+    SerializationError,
+    TransactionError,
+    handle_db_error,
+)
+
+
+def test_timeouts_are_classified_by_sqlstate():
+    error = handle_db_error(errors.QueryCanceled("canceling statement due to statement timeout"))
+    assert isinstance(error, QueryTimeoutError)
+    assert error.sqlstate == "57014"
+
+    error = handle_db_error(errors.LockNotAvailable("canceling statement due to lock timeout"), lock_timeout=True)
+    assert isinstance(error, LockTimeoutError)
+    assert isinstance(error, QueryTimeoutError)
+    assert isinstance(error, LockNotAvailableError)
+
+
+def test_lock_refusals_are_not_timeouts():
+    error = handle_db_error(errors.LockNotAvailable('could not obtain lock on row in relation "jobs"'))
+    assert type(error) is LockNotAvailableError
+    assert not isinstance(error, QueryTimeoutError)
+    assert error.sqlstate == "55P03"
+
+
+def test_unknown_errors_become_query_errors():
+    error = handle_db_error(errors.UndefinedTable('relation "nope" does not exist'))
+    assert type(error) is QueryError
+    assert error.sqlstate == "42P01"
+    assert type(handle_db_error(ValueError("x"))) is QueryError
+
+
+def test_contention_errors_are_retryable():
+    assert isinstance(handle_db_error(errors.SerializationFailure("could not serialize access")), SerializationError)
+    assert isinstance(handle_db_error(errors.DeadlockDetected("deadlock detected")), DeadlockError)
+    assert isinstance(handle_db_error(errors.SerializationFailure("x")), RetryableError)
+
+    error = handle_db_error(errors.TransactionIntegrityConstraintViolation("x"))
+    assert type(error) is TransactionError
+    assert not isinstance(error, RetryableError)
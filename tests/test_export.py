@@ -0,0 +1,83 @@
+# tests/test_export.py
+
+import gzip
+import io
+from contextlib import contextmanager
+
+import pytest
+
+from pydantic_sql.exceptions import ParameterError
+from pydantic_sql.export import copy_statement, export_query
+
+CHUNKS = [b"id,name\n", b"1,Electronics\n2,Books\n"]
+
+
+class FakeCursor:
+    rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @contextmanager
+    def copy(self, statement, params):
+        self.statement = statement
+        yield iter(CHUNKS)
+        self.rowcount = 2
+
+
+class FailingCursor(FakeCursor):
+    @contextmanager
+    def copy(self, statement, params):
+        def chunks():
+            yield CHUNKS[0]
+            raise RuntimeError("connection lost")
+
+        yield chunks()
+
+
+class FakeConnection:
+    def __init__(self, cursor=FakeCursor):
+        self.cursor_class = cursor
+
+    def cursor(self, **kwargs):
+        return self.cursor_class()
+
+
+def test_copy_statement():
+    statement = copy_statement("SELECT * FROM categories")
+    assert statement.as_string(None) == "COPY (SELECT * FROM categories) TO STDOUT (FORMAT csv, HEADER true)"
+    statement = copy_statement("SELECT 1", format="binary")
+    assert statement.as_string(None) == "COPY (SELECT 1) TO STDOUT (FORMAT binary)"
+    with pytest.raises(ParameterError):
+        copy_statement("SELECT 1", format="json")
+
+
+def test_export_to_file_object():
+    out = io.BytesIO()
+    result = export_query(FakeConnection(), "SELECT * FROM categories", out)
+    assert out.getvalue() == b"".join(CHUNKS)
+    assert (result.rows, result.bytes_copied, result.bytes_written) == (2, 30, 30)
+
+
+def test_export_gzip_to_path(tmp_path):
+    path = tmp_path / "categories.csv.gz"
+    result = export_query(FakeConnection(), "SELECT * FROM categories", path, compress=True)
+    assert gzip.decompress(path.read_bytes()) == b"".join(CHUNKS)
+    assert result.bytes_copied == 30
+    assert result.bytes_written == path.stat().st_size
+
+
+def test_failed_export_keeps_the_previous_file(tmp_path):
+    path = tmp_path / "categories.csv"
+    path.write_bytes(b"previous export\n")
+    with pytest.raises(RuntimeError):
+        export_query(FakeConnection(FailingCursor), "SELECT * FROM categories", path)
+    assert path.read_bytes() == b"previous export\n"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["categories.csv"]
+
+    with pytest.raises(RuntimeError):
+        export_query(FakeConnection(FailingCursor), "SELECT * FROM categories", tmp_path / "new.csv")
+    assert [entry.name for entry in tmp_path.iterdir()] == ["categories.csv"]
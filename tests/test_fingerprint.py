@@ -0,0 +1,91 @@
+# tests/test_fingerprint.py
+
+from types import SimpleNamespace
+
+from pydantic_sql.cli.catalog import parse_catalog
+from pydantic_sql.fingerprint import canonical_sql, fingerprint, normalize_sql, stat_statements_report
+
+
+def test_placeholder_styles_normalize_alike():
+    variants = [
+        "SELECT * FROM users WHERE id = %(id)s AND name = %(name)s",
+        "select *\n  from users -- by id\n where id = $1 and name = $2;",
+        "SELECT * FROM users WHERE id = 42 AND name = 'o''brien'",
+        "SELECT * FROM users /* inline */ WHERE id = :id AND name = %s",
+    ]
+    assert {normalize_sql(sql) for sql in variants} == {"select * from users where id = ? and name = ?"}
+
+
+def test_lists_and_negative_constants_collapse():
+    assert normalize_sql("SELECT 1 FROM t WHERE a IN (1, 2, 3) AND b = -5") == normalize_sql(
+        "SELECT 1 FROM t WHERE a IN ($1) AND b = $2"
+    )
+
+
+def test_quoted_identifiers_keep_case():
+    assert normalize_sql('SELECT "Name" FROM "Users"') == 'select "Name" from "Users"'
+    assert fingerprint('SELECT "Name" FROM t') != fingerprint("SELECT name FROM t")
+
+
+def test_catalog_parsing():
+    catalog = parse_catalog(
+        "/* @name GetUser */\nSELECT * FROM users WHERE id = :id;\n\n/* @name ListUsers */\nSELECT * FROM users;\n"
+    )
+    assert catalog == {"GetUser": "SELECT * FROM users WHERE id = :id", "ListUsers": "SELECT * FROM users"}
+
+
+class FakeConn:
+    def __init__(self, rows, server_version=150000):
+        self.info = SimpleNamespace(server_version=server_version)
+        self.rows = rows
+        self.executed = None
+
+    def execute(self, sql):
+        self.executed = sql
+        return SimpleNamespace(fetchall=lambda: self.rows)
+
+
+def test_stat_statements_report_sums_by_fingerprint():
+    conn = FakeConn(
+        [
+            ("SELECT * FROM users WHERE id = $1", 10, 50.0, 10, 90, 10),
+            ("select * from users where id = $1", 5, 25.0, 5, 10, 0),
+            ("SELECT * FROM orders", 1, 500.0, 100, 0, 0),
+        ]
+    )
+    report = stat_statements_report(conn, {"GetUser": "SELECT * FROM users WHERE id = %(id)s", "Unused": "SELECT 1"})
+    assert "total_exec_time" in conn.executed
+    assert [stats.name for stats in report] == ["GetUser", "Unused"]
+    user = report[0]
+    assert (user.calls, user.total_ms, user.mean_ms, user.rows) == (15, 75.0, 5.0, 15)
+    assert user.hit_ratio == 100 / 110
+    assert report[1].calls == 0
+
+
+def test_same_shape_catalog_queries_each_get_an_entry():
+    conn = FakeConn([("SELECT * FROM users WHERE id = $1", 10, 50.0, 10, 90, 10)])
+    report = stat_statements_report(
+        conn, {"GetUser": "SELECT * FROM users WHERE id = :id", "FindUser": "select * from users where id = :user_id"}
+    )
+    assert sorted((stats.name, stats.calls) for stats in report) == [("FindUser", 10), ("GetUser", 10)]
+
+
+def test_query_label_is_memoized():
+    from pydantic_sql.instrumentation import query_label
+
+    sql = "SELECT * FROM memo_test WHERE id = %s"
+    assert query_label(sql) == fingerprint(sql)
+    hits = query_label.cache_info().hits
+    query_label(sql)
+    assert query_label.cache_info().hits == hits + 1
+
+
+def test_stat_statements_report_old_servers():
+    conn = FakeConn([], server_version=120000)
+    stat_statements_report(conn, {})
+    assert "total_time" in conn.executed and "total_exec_time" not in conn.executed
+
+
+def test_canonical_sql_keeps_literals():
+    assert canonical_sql("SELECT  a, 'x  -- y' -- note\n FROM t /* z */ WHERE id = $1 ;") == "SELECT a, 'x  -- y' FROM t WHERE id = $1"
+    assert canonical_sql("SELECT 1") != canonical_sql("SELECT 2")
@@ -0,0 +1,68 @@
+# tests/test_import_time.py
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = str(Path(__file__).parent.parent / "src")
+
+# Cumulative microseconds `import pydantic_sql` may take; generous for slow CI machines.
+IMPORT_BUDGET_US = 20_000
+
+
+def run_python(code, *flags):
+    env = {**os.environ, "PYTHONPATH": SRC}
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+
+def test_import_stays_under_budget():
+    result = run_python("import pydantic_sql", "-X", "importtime")
+    match = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| pydantic_sql$", result.stderr, re.MULTILINE)
+    assert match is not None, result.stderr
+    assert int(match.group(1)) < IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import pydantic_sql",
+        "from pydantic_sql import ResultCache, TransactionRunner, Deadline, QueryError",
+        "from pydantic_sql.plan_review import analyze_catalog",
+        "from pydantic_sql.cli.commands import main",
+    ],
+)
+def test_psycopg_is_loaded_lazily(statement):
+    result = run_python(f"{statement}; import sys; print('psycopg' in sys.modules)")
+    assert result.stdout.strip() == "False"
+
+
+def test_lazy_attributes():
+    import pydantic_sql
+    from pydantic_sql.cache import ResultCache
+
+    assert pydantic_sql.ResultCache is ResultCache
+    assert "ResultCache" in dir(pydantic_sql)
+    assert pydantic_sql.fingerprint.fingerprint("SELECT 1") == pydantic_sql.fingerprint.fingerprint("select 2")
+    with pytest.raises(AttributeError):
+        pydantic_sql.no_such_name
+
+
+def test_missing_dependency_of_a_submodule_is_not_hidden():
+    # A submodule that exists but cannot import a dependency must report the dependency.
+    code = (
+        "import sys, pydantic_sql\n"
+        "sys.modules['psycopg'] = None\n"
+        "try:\n"
+        "    pydantic_sql.sharding\n"
+        "except ModuleNotFoundError as e:\n"
+        "    print(e.name.split('.')[0])\n"
+        "try:\n"
+        "    pydantic_sql.no_such_module\n"
+        "except AttributeError:\n"
+        "    print('AttributeError')\n"
+    )
+    assert run_python(code).stdout.split() == ["psycopg", "AttributeError"]
@@ -0,0 +1,79 @@
+# tests/test_instrumentation.py
+
+import pytest
+
+from pydantic_sql.instrumentation import (
+    Hook,
+    LatencyHistogram,
+    QueryStatsAggregator,
+    add_hook,
+    instrument,
+    remove_hook,
+)
+
+
+class RecordingHook(Hook):
+    def __init__(self):
+        self.calls = []
+
+    def before(self, event):
+        self.calls.append(("before", event.phase, event.query))
+
+    def after(self, event):
+        self.calls.append(("after", event.phase, event.rows, event.error))
+
+
+@pytest.fixture
+def hook():
+    hook = RecordingHook()
+    add_hook(hook)
+    yield hook
+    remove_hook(hook)
+
+
+def test_no_hooks_is_a_shared_no_op():
+    assert instrument("execute", "q") is instrument("fetch", "q")
+    with instrument("fetch", "q") as event:
+        event.rows = 10
+
+
+def test_hooks_see_before_and_after(hook):
+    with instrument("fetch", "get_user", 1) as event:
+        event.rows = 3
+    assert hook.calls == [("before", "fetch", "get_user"), ("after", "fetch", 3, None)]
+
+
+def test_errors_are_reported(hook):
+    with pytest.raises(ValueError):
+        with instrument("execute", "q"):
+            raise ValueError("boom")
+    assert isinstance(hook.calls[-1][3], ValueError)
+
+
+def test_histogram_buckets_are_contiguous():
+    for value in range(0, 100_000, 7):
+        index = LatencyHistogram.bucket_index(value)
+        assert LatencyHistogram.bucket_value(index) <= value < LatencyHistogram.bucket_value(index + 1)
+
+
+def test_histogram_percentiles_within_precision():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+    assert abs(histogram.percentile(50) - 500_000) <= 500_000 * 0.04
+    assert abs(histogram.percentile(99) - 990_000) <= 990_000 * 0.04
+    assert histogram.percentile(100) == 1_000_000
+
+
+def test_aggregator_snapshot():
+    aggregator = QueryStatsAggregator()
+    add_hook(aggregator)
+    try:
+        for _ in range(5):
+            with instrument("fetch", "list_products") as event:
+                event.rows = 2
+    finally:
+        remove_hook(aggregator)
+    stats = aggregator.snapshot()["list_products"]["fetch"]
+    assert (stats.count, stats.rows, stats.errors) == (5, 10, 0)
+    assert stats.max_ms >= stats.p50_ms >= 0
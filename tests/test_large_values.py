@@ -0,0 +1,95 @@
+# tests/test_large_values.py
+
+import io
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from psycopg.pq import TransactionStatus
+
+from pydantic_sql.exceptions import ConfigurationError
+from pydantic_sql.large_values import MemoryViewLoader, stream_value
+
+VALUE = bytes(range(256)) * 40
+
+
+class FakeAdapters:
+    def register_loader(self, name, loader):
+        self.loader = loader
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.adapters = FakeAdapters()
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        start, length, _ = params
+        chunk = VALUE[start - 1:start - 1 + length]
+        self.log.append(start)
+        self.row = (memoryview(chunk), len(chunk))
+        return self
+
+    def fetchone(self):
+        return self.row
+
+
+class FakeConnection:
+    def __init__(self, status=TransactionStatus.IDLE, isolation="read committed"):
+        self.log = []
+        self.statements = []
+        self.info = SimpleNamespace(transaction_status=status)
+        self.isolation = isolation
+        self.in_transaction = False
+
+    @contextmanager
+    def transaction(self):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+    def execute(self, query, params=None):
+        self.statements.append(query)
+        if query.startswith("SELECT %s::regclass"):
+            row = ('sales."Files"',)
+        else:
+            row = (self.isolation,)
+        return SimpleNamespace(fetchone=lambda: row)
+
+    def cursor(self, binary=False):
+        assert self.in_transaction or self.info.transaction_status != TransactionStatus.IDLE
+        return FakeCursor(self.log)
+
+
+def test_memoryview_loader():
+    assert isinstance(MemoryViewLoader(17).load(b"abc"), memoryview)
+
+
+def test_stream_value_in_chunks():
+    conn = FakeConnection()
+    out = io.BytesIO()
+    written = stream_value(conn, "files", "data", "id", 1, out, chunk_size=4096)
+    assert out.getvalue() == VALUE
+    assert written == len(VALUE)
+    assert conn.log == [1, 4097, 8193]
+    assert conn.statements == ["SET TRANSACTION ISOLATION LEVEL REPEATABLE READ", "SELECT %s::regclass::text"]
+    assert not conn.in_transaction
+
+
+def test_stream_value_in_callers_transaction():
+    conn = FakeConnection(TransactionStatus.INTRANS, isolation="repeatable read")
+    assert stream_value(conn, "sales.Files", "data", "id", 1, io.BytesIO()) == len(VALUE)
+    assert conn.statements[0] == "SELECT current_setting('transaction_isolation')"
+
+    conn = FakeConnection(TransactionStatus.INTRANS, isolation="read committed")
+    with pytest.raises(ConfigurationError):
+        stream_value(conn, "files", "data", "id", 1, io.BytesIO())
+    assert conn.log == []
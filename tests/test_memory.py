@@ -0,0 +1,106 @@
+# tests/test_memory.py
+
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_sql.exceptions import ResultTooLargeError
+from pydantic_sql.instrumentation import Hook, add_hook, remove_hook
+from pydantic_sql.memory import STREAM, MemoryBudget, estimate_rows_size, fetch_accounted
+
+
+class Item(BaseModel):
+    id: int
+    payload: str
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.description = [SimpleNamespace(name="id"), SimpleNamespace(name="payload")]
+        self.fetched = 0
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchmany(self, size):
+        batch = self.rows[self.fetched:self.fetched + size]
+        self.fetched += len(batch)
+        return batch
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.cur = FakeCursor(rows)
+        self.names = []
+
+    def cursor(self, name=None):
+        self.names.append(name)
+        return self.cur
+
+
+def rows(n):
+    return [(i, "x" * 100) for i in range(n)]
+
+
+class BytesHook(Hook):
+    def __init__(self):
+        self.events = []
+
+    def after(self, event):
+        self.events.append((event.phase, event.rows, event.bytes))
+
+
+def test_accounting_is_reported_to_hooks():
+    hook = BytesHook()
+    add_hook(hook)
+    try:
+        result = fetch_accounted(FakeConn(rows(250)), "SELECT * FROM items", model=Item, batch_size=100, trace=True)
+    finally:
+        remove_hook(hook)
+    items = list(result)
+    assert len(items) == 250 and items[0] == Item(id=0, payload="x" * 100)
+    usage = result.usage
+    assert usage.rows == 250 and usage.raw_bytes > 250 * 100 and usage.model_bytes > 250 * 100
+    assert usage.traced_peak_bytes > 0 and not usage.streamed
+    assert hook.events == [("fetch", 250, usage.raw_bytes), ("map", 250, usage.model_bytes)]
+
+
+def test_budget_aborts():
+    conn = FakeConn(rows(1000))
+    with pytest.raises(ResultTooLargeError):
+        fetch_accounted(conn, "SELECT * FROM items", model=Item, budget=MemoryBudget(20_000), batch_size=100)
+    assert conn.cur.closed and conn.cur.fetched < 1000
+
+
+def test_budget_switches_to_streaming():
+    conn = FakeConn(rows(1000))
+    result = fetch_accounted(
+        conn, "SELECT * FROM items", model=Item, budget=MemoryBudget(20_000, on_exceed=STREAM), batch_size=100
+    )
+    assert result.streaming and result.usage.streamed
+    assert conn.cur.fetched < 1000 and not conn.cur.closed
+    assert [item.id for item in result] == list(range(1000))
+    assert result.usage.rows == 1000 and conn.cur.closed
+
+
+def test_estimate_rows_size_scales_sample():
+    data = rows(1000)
+    assert estimate_rows_size([]) == 0
+    assert estimate_rows_size(data) == estimate_rows_size(data[:20]) * 50
+
+
+def test_results_are_single_pass_and_use_distinct_cursors():
+    conn = FakeConn(rows(10))
+    first = fetch_accounted(conn, "SELECT * FROM items")
+    fetch_accounted(conn, "SELECT * FROM items")
+    # Both server-side cursors may be open in the same transaction.
+    assert len(set(conn.names)) == 2
+    assert len(list(first)) == 10
+    with pytest.raises(RuntimeError):
+        iter(first)
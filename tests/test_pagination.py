@@ -0,0 +1,139 @@
+# tests/test_pagination.py
+
+import base64
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_sql.exceptions import ParameterError
+from pydantic_sql.pagination import decode_cursor, encode_cursor, fetch_page, keyset_query, paginate
+
+SQL = "SELECT * FROM orders WHERE user_id = %(user_id)s"
+
+
+def test_first_page_has_no_seek_condition():
+    query, params = keyset_query(SQL, {"user_id": 1}, ["id"], 50)
+    assert query.as_string(None) == (
+        f'SELECT * FROM ({SQL}) AS _page ORDER BY "id" ASC LIMIT %(_page_limit)s'
+    )
+    assert params == {"user_id": 1, "_page_limit": 51}
+
+
+def test_composite_descending_key_uses_row_comparison():
+    query, params = keyset_query(SQL, {"user_id": 1}, ["order_date DESC", "id DESC"], 50, after=["2024-01-01", 9])
+    assert query.as_string(None) == (
+        f'SELECT * FROM ({SQL}) AS _page WHERE ("order_date", "id") < (%(_key_0)s, %(_key_1)s) '
+        'ORDER BY "order_date" DESC, "id" DESC LIMIT %(_page_limit)s'
+    )
+    assert params == {"user_id": 1, "_key_0": "2024-01-01", "_key_1": 9, "_page_limit": 51}
+
+
+def test_mixed_directions_expand_to_or_chain():
+    query, params = keyset_query("SELECT * FROM products", None, ["price DESC", "id"], 10, after=[Decimal("5"), 3])
+    assert query.as_string(None) == (
+        'SELECT * FROM (SELECT * FROM products) AS _page '
+        'WHERE (("price" < %s) OR ("price" = %s AND "id" > %s)) '
+        'ORDER BY "price" DESC, "id" ASC LIMIT %s'
+    )
+    assert params == [Decimal("5"), Decimal("5"), 3, 11]
+
+
+def test_cursor_round_trip():
+    key = [datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), Decimal("19.99"), 42, "x"]
+    token = encode_cursor(key)
+    assert "=" not in token
+    assert decode_cursor(token) == key
+
+
+def test_invalid_cursor():
+    with pytest.raises(ParameterError):
+        decode_cursor("not-a-cursor")
+    for payload in ['[{"$":"decimal","v":"abc"}]', '[{"$":"uuid","v":5}]', '[{"$":"nope","v":1}]']:
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        with pytest.raises(ParameterError):
+            decode_cursor(token)
+    with pytest.raises(ParameterError):
+        keyset_query(SQL, {}, ["id"], 10, after=[1, 2])
+
+
+class Order(BaseModel):
+    id: int
+    user_id: int
+
+
+class FakeCursor:
+    """Evaluates keyset_query's named parameters against in-memory rows."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute(self, query, params):
+        self.conn.queries.append(params)
+        descending = self.conn.descending
+        rows = sorted(self.conn.rows, key=lambda row: row["id"], reverse=descending)
+        if "_key_0" in params:
+            after = params["_key_0"]
+            rows = [row for row in rows if (row["id"] < after if descending else row["id"] > after)]
+        self.rows = rows[: params["_page_limit"]]
+
+    def fetchall(self):
+        return [dict(row) for row in self.rows]
+
+
+class FakeConnection:
+    def __init__(self, count, descending=False):
+        self.rows = [{"id": i, "user_id": 1} for i in range(1, count + 1)]
+        self.descending = descending
+        self.queries = []
+
+    def cursor(self, row_factory=None):
+        return FakeCursor(self)
+
+
+def test_fetch_page_detects_more_rows_from_the_extra_row():
+    conn = FakeConnection(5)
+    page = fetch_page(conn, SQL, ["id"], page_size=2, params={"user_id": 1}, model=Order)
+    assert [order.id for order in page.items] == [1, 2]
+    assert page.has_more and decode_cursor(page.cursor) == [2]
+    assert conn.queries[0]["_page_limit"] == 3
+
+    page = fetch_page(conn, SQL, ["id"], page_size=2, params={"user_id": 1}, cursor=page.cursor)
+    assert [row["id"] for row in page.items] == [3, 4] and page.has_more
+    assert conn.queries[1]["_key_0"] == 2
+
+    page = fetch_page(conn, SQL, ["id"], page_size=2, params={"user_id": 1}, cursor=page.cursor)
+    assert [row["id"] for row in page.items] == [5] and not page.has_more
+
+
+def test_empty_page_keeps_the_cursor():
+    conn = FakeConnection(2)
+    token = encode_cursor([2])
+    page = fetch_page(conn, SQL, ["id"], page_size=2, params={"user_id": 1}, cursor=token)
+    assert page.items == [] and not page.has_more and page.cursor == token
+
+
+def test_paginate_carries_the_cursor_and_skips_an_empty_last_page():
+    conn = FakeConnection(4)
+    pages = list(paginate(conn, SQL, ["id"], page_size=2, params={"user_id": 1}))
+    assert [[row["id"] for row in page.items] for page in pages] == [[1, 2], [3, 4]]
+    assert [page.has_more for page in pages] == [True, False]
+    assert len(conn.queries) == 2
+
+    # Resuming from the first page's cursor continues where it stopped.
+    resumed = list(paginate(conn, SQL, ["id"], page_size=2, params={"user_id": 1}, cursor=pages[0].cursor))
+    assert [[row["id"] for row in page.items] for page in resumed] == [[3, 4]]
+
+
+def test_paginate_descending():
+    conn = FakeConnection(5, descending=True)
+    pages = list(paginate(conn, SQL, ["id DESC"], page_size=2, params={"user_id": 1}))
+    assert [[row["id"] for row in page.items] for page in pages] == [[5, 4], [3, 2], [1]]
+    assert [decode_cursor(page.cursor) for page in pages] == [[4], [2], [1]]
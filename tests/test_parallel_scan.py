@@ -0,0 +1,142 @@
+# tests/test_parallel_scan.py
+
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
+
+import pytest
+
+from pydantic_sql.exceptions import ConfigurationError
+from pydantic_sql.parallel_scan import _range_query, key_ranges, parallel_scan, split_range
+
+
+def test_split_range_covers_keys_with_open_ends():
+    ranges = split_range(1, 100, 4)
+    assert ranges == [(None, 26), (26, 51), (51, 76), (76, None)]
+
+
+def test_split_range_small_table():
+    assert split_range(5, 6, 8) == [(None, 6), (6, None)]
+    assert split_range(5, 5, 3) == [(None, None)]
+
+
+def test_range_query_named_params():
+    query, params = _range_query("SELECT * FROM orders WHERE user_id = %(user_id)s", {"user_id": 7}, "id", (10, 20))
+    assert query.as_string(None) == (
+        'SELECT * FROM (SELECT * FROM orders WHERE user_id = %(user_id)s) AS _scan '
+        'WHERE "id" >= %(_scan_low)s AND "id" < %(_scan_high)s'
+    )
+    assert params == {"user_id": 7, "_scan_low": 10, "_scan_high": 20}
+
+
+def test_range_query_positional_params():
+    query, params = _range_query("SELECT * FROM orders", None, "id", (None, 20))
+    assert query.as_string(None) == 'SELECT * FROM (SELECT * FROM orders) AS _scan WHERE "id" < %s'
+    assert params == [20]
+
+
+class StatsConnection:
+    """Answers key_ranges' queries for a table without pg_stats rows."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, query, params=None):
+        text = query if isinstance(query, str) else query.as_string(None)
+        self.statements.append((text, params))
+        if text.startswith("SELECT s.histogram_bounds"):
+            row = None
+        elif text.startswith("SELECT %s::regclass::text"):
+            row = ('sales."Orders"',)
+        else:
+            row = (1, 100)
+        return SimpleNamespace(fetchone=lambda: row)
+
+
+def test_key_ranges_min_max_fallback_resolves_qualified_names():
+    conn = StatsConnection()
+    assert key_ranges(conn, 'sales."Orders"', "id", 4) == [(None, 26), (26, 51), (51, 76), (76, None)]
+    # Both paths resolve the name through regclass, so a schema-qualified name stays qualified.
+    assert conn.statements[0][1] == ('sales."Orders"', "id")
+    assert conn.statements[1] == ("SELECT %s::regclass::text", ('sales."Orders"',))
+    assert conn.statements[2][0] == 'SELECT min("id"), max("id") FROM sales."Orders"'
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute(self, query, params):
+        low, high = params.get("_scan_low", float("-inf")), params.get("_scan_high", float("inf"))
+        if self.conn.pool.fail_at is not None and low <= self.conn.pool.fail_at < high:
+            raise RuntimeError("connection lost")
+        self.rows = [{"id": key} for key in self.conn.pool.keys if low <= key < high]
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def transaction(self):
+        return nullcontext()
+
+    def execute(self, sql):
+        self.pool.statements.append(sql if isinstance(sql, str) else sql.as_string(None))
+        return SimpleNamespace(fetchone=lambda: ("00000003-1",))
+
+    def cursor(self, name, row_factory=None):
+        return FakeCursor(self)
+
+
+class FakePool:
+    def __init__(self, keys, fail_at=None):
+        self.keys = keys
+        self.fail_at = fail_at
+        self.statements = []
+
+    @contextmanager
+    def connection(self):
+        yield FakeConnection(self)
+
+
+def test_parallel_scan_merges_ranges_in_order():
+    pool = FakePool(list(range(100)))
+    rows = list(parallel_scan(pool, "SELECT * FROM t", "id", split_range(0, 99, 4), params={}, batch_size=7, max_batches=1))
+    assert [row["id"] for row in rows] == list(range(100))
+
+
+def test_parallel_scan_unordered_yields_every_row():
+    pool = FakePool(list(range(50)))
+    rows = parallel_scan(pool, "SELECT * FROM t", "id", split_range(0, 49, 5), params={}, ordered=False, batch_size=3)
+    assert sorted(row["id"] for row in rows) == list(range(50))
+
+
+def test_parallel_scan_propagates_worker_errors():
+    pool = FakePool(list(range(40)), fail_at=25)
+    seen = []
+    with pytest.raises(RuntimeError, match="connection lost"):
+        for row in parallel_scan(pool, "SELECT * FROM t", "id", split_range(0, 39, 4), params={}):
+            seen.append(row["id"])
+    assert seen == list(range(20))
+
+
+def test_parallel_scan_shares_an_exported_snapshot():
+    pool = FakePool(list(range(10)))
+    list(parallel_scan(pool, "SELECT * FROM t", "id", split_range(0, 9, 2), params={}, snapshot=True))
+    assert pool.statements.count("SELECT pg_export_snapshot()") == 1
+    assert pool.statements.count("SET TRANSACTION SNAPSHOT '00000003-1'") == 2
+
+
+def test_split_range_needs_integer_keys():
+    with pytest.raises(ConfigurationError):
+        split_range("a", "z", 4)
@@ -0,0 +1,108 @@
+# tests/test_pipeline.py
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_sql.pipeline import pipelined_fetch, pipelined_map, validate_batch
+
+
+class Category(BaseModel):
+    id: int
+    name: str
+
+
+COLUMNS = ["id", "name"]
+
+
+def batches(count, size):
+    for start in range(0, count, size):
+        yield [(i, f"category {i}") for i in range(start, min(start + size, count))]
+
+
+def test_pipelined_map_preserves_order():
+    mapper = partial(validate_batch, Category, COLUMNS)
+    result = list(pipelined_map(batches(1000, 64), mapper))
+    assert [c.id for c in result] == list(range(1000))
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_pipelined_map_with_executor(executor_class):
+    mapper = partial(validate_batch, Category, COLUMNS)
+    with executor_class(max_workers=2) as executor:
+        result = list(pipelined_map(batches(500, 50), mapper, max_pending=4, executor=executor))
+    assert [c.id for c in result] == list(range(500))
+    assert all(isinstance(c, Category) for c in result)
+
+
+def test_producer_errors_propagate():
+    def failing():
+        yield [(1, "a")]
+        raise RuntimeError("connection lost")
+
+    with pytest.raises(RuntimeError):
+        list(pipelined_map(failing(), partial(validate_batch, Category, COLUMNS)))
+
+
+def test_early_exit_stops_producer():
+    iterator = pipelined_map(batches(10_000, 10), partial(validate_batch, Category, COLUMNS), max_pending=1)
+    assert next(iterator).id == 0
+    iterator.close()
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.description = [SimpleNamespace(name="id"), SimpleNamespace(name="name")]
+        self.statements = []
+        self.fetches = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+
+    def fetchmany(self, size):
+        assert not self.closed, "fetch after close"
+        start = self.fetches * size
+        self.fetches += 1
+        return self.rows[start:start + size]
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.cursors = []
+        self.rows = rows
+
+    def cursor(self, name=None):
+        self.cursors.append((name, FakeCursor(self.rows)))
+        return self.cursors[-1][1]
+
+
+def test_pipelined_fetch_early_exit_closes_cursor():
+    conn = FakeConn([(i, f"category {i}") for i in range(10_000)])
+    iterator = pipelined_fetch(conn, "SELECT * FROM categories", model=Category, batch_size=10, max_pending=1)
+    assert next(iterator).id == 0
+    iterator.close()
+
+    name, cur = conn.cursors[0]
+    assert cur.closed
+    assert cur.statements == [("SELECT * FROM categories", None)]
+    # The producer stopped after the few batches the queue could hold, and has exited.
+    fetches = cur.fetches
+    assert fetches < 10
+    assert not any(thread.name == "pydantic-sql-fetch" for thread in threading.enumerate())
+    assert cur.fetches == fetches
+
+    # A second fetch on the connection gets its own server-side cursor.
+    list(pipelined_fetch(conn, "SELECT * FROM categories", batch_size=5000))
+    assert conn.cursors[1][0] != name
@@ -0,0 +1,126 @@
+# tests/test_plan_review.py
+
+from pydantic_sql.plan_review import (
+    Finding,
+    PlanReport,
+    RelationInfo,
+    diff_reports,
+    explain_query,
+    filter_columns,
+    review_plan,
+    to_positional,
+)
+
+
+def test_to_positional():
+    sql, names = to_positional("SELECT * FROM t WHERE a = :a! AND b::text = :b -- :c\n AND c = :a AND d = ':d'")
+    assert sql == "SELECT * FROM t WHERE a = $1 AND b::text = $2 -- :c\n AND c = $1 AND d = ':d'"
+    assert names == ["a", "b"]
+
+
+def test_filter_columns():
+    assert filter_columns("((status)::text = 'active'::text)") == ["status"]
+    assert filter_columns("((email ~~ '%x%'::text) AND (age >= 18) AND (deleted_at IS NULL))") == [
+        "email",
+        "age",
+        "deleted_at",
+    ]
+    assert filter_columns("(t.user_id = ANY ('{1,2}'::integer[]))") == ["user_id"]
+    assert filter_columns("((orders.status)::text = 'x'::text)") == ["status"]
+
+
+def scan(relation, rows, filter=None):
+    node = {"Node Type": "Seq Scan", "Relation Name": relation, "Plan Rows": rows}
+    if filter:
+        node["Filter"] = filter
+    return node
+
+
+def test_review_flags_large_seq_scans_and_missing_indexes():
+    plan = {
+        "Node Type": "Hash Join",
+        "Plan Rows": 50,
+        "Plans": [scan("orders", 50, "(status = 'x'::text)"), scan("users", 10, "(id = 5)")],
+    }
+    relations = {
+        "orders": RelationInfo(rows=1_000_000, indexed_columns=["id"]),
+        "users": RelationInfo(rows=100_000, indexed_columns=["id"]),
+    }
+    findings = review_plan(plan, relations)
+    assert [(f.kind, f.relation, f.columns) for f in findings] == [
+        ("seq_scan", "orders", []),
+        ("missing_index", "orders", ["status"]),
+        ("seq_scan", "users", []),
+    ]
+
+
+def test_review_ignores_small_relations_and_flags_row_explosion():
+    plan = {"Node Type": "Nested Loop", "Plan Rows": 50_000, "Plans": [scan("a", 100), scan("b", 200)]}
+    findings = review_plan(plan, {"a": RelationInfo(rows=100), "b": RelationInfo(rows=200)})
+    assert [f.kind for f in findings] == ["row_explosion"]
+
+
+def test_diff_reports():
+    seq_scan = Finding(kind="seq_scan", relation="orders", detail="Sequential scan of orders")
+    baseline = [
+        PlanReport(name="A", fingerprint="a", total_cost=10),
+        PlanReport(name="B", fingerprint="b", total_cost=100, findings=[seq_scan]),
+        PlanReport(name="C", fingerprint="c", total_cost=5),
+    ]
+    current = [
+        PlanReport(name="A", fingerprint="a", total_cost=12, findings=[seq_scan]),
+        PlanReport(name="B", fingerprint="b", total_cost=400, findings=[seq_scan]),
+        PlanReport(name="C", fingerprint="c", error="UndefinedTable: x"),
+        PlanReport(name="D", fingerprint="d", total_cost=1e9),
+    ]
+    assert diff_reports(baseline, current) == [
+        "A: Sequential scan of orders",
+        "B: estimated cost rose from 100.0 to 400.0",
+        "C: no longer plans (UndefinedTable: x)",
+    ]
+
+
+def test_relations_are_keyed_by_schema():
+    plan = {"Node Type": "Seq Scan", "Relation Name": "orders", "Schema": "archive", "Plan Rows": 10}
+    relations = {"public.orders": RelationInfo(rows=1_000_000), "archive.orders": RelationInfo(rows=10)}
+    assert review_plan(plan, relations) == []
+    plan["Schema"] = "public"
+    assert [(f.kind, f.relation) for f in review_plan(plan, relations)] == [("seq_scan", "public.orders")]
+
+
+class FailingExplainConnection:
+    """EXPLAIN fails and aborts the transaction; anything but ROLLBACK then fails too."""
+
+    def __init__(self):
+        self.statements = []
+        self.aborted = False
+
+    def transaction(self, force_rollback=False):
+        conn = self
+
+        class Transaction:
+            def __enter__(self):
+                pass
+
+            def __exit__(self, *exc):
+                conn.statements.append("ROLLBACK" if exc[0] or force_rollback else "COMMIT")
+                conn.aborted = False
+
+        return Transaction()
+
+    def execute(self, sql):
+        if self.aborted:
+            raise RuntimeError("current transaction is aborted")
+        self.statements.append(sql.split()[0])
+        if sql.startswith("EXPLAIN"):
+            self.aborted = True
+            raise ValueError("invalid input syntax for type integer")
+
+
+def test_explain_failure_is_not_masked_and_deallocates():
+    import pytest
+
+    conn = FailingExplainConnection()
+    with pytest.raises(ValueError, match="invalid input syntax"):
+        explain_query(conn, "SELECT * FROM t WHERE id = :id")
+    assert conn.statements == ["PREPARE", "SET", "EXPLAIN", "ROLLBACK", "DEALLOCATE", "COMMIT"]
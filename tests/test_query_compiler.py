@@ -0,0 +1,243 @@
+# tests/test_query_compiler.py
+
+from decimal import Decimal
+
+import pytest
+from pydantic import BaseModel, create_model
+
+from pydantic_sql.cli.python_generator import QuerySpec, generate_module, pascal_case, snake_case
+from pydantic_sql.exceptions import QueryError
+from pydantic_sql.model_generator import format_imports, python_type
+from pydantic_sql.query_compiler import CompiledQuery, make_binder, to_positional
+from pydantic_sql.type_introspector import ColumnInfo
+
+
+def test_to_positional_skips_literals_identifiers_and_casts():
+    sql, names = to_positional(
+        "SELECT $$:no$$, \"a:b\", x::text FROM t WHERE a = :a! AND b = ':no' AND c = :c AND d = :a -- :no"
+    )
+    assert sql == "SELECT $$:no$$, \"a:b\", x::text FROM t WHERE a = $1 AND b = ':no' AND c = $2 AND d = $1 -- :no"
+    assert names == ["a", "c"]
+
+
+def test_binder_accepts_mappings_and_objects():
+    class Params(BaseModel):
+        a: int
+        b: str
+
+    bind = make_binder(["b", "a"])
+    assert bind({"a": 1, "b": "x"}) == ("x", 1)
+    assert bind(Params(a=1, b="x")) == ("x", 1)
+
+    query = CompiledQuery.from_sql("GetUser", "SELECT * FROM users WHERE id = :id")
+    assert query.sql == "SELECT * FROM users WHERE id = $1" and query.binder({"id": 7}) == (7,)
+
+
+def test_python_type():
+    assert python_type(23) == ("int", set())
+    assert python_type(1184, nullable=True) == (
+        "Optional[datetime]",
+        {"from datetime import datetime", "from typing import Optional"},
+    )
+    assert python_type(1231) == ("List[Decimal]", {"from typing import List", "from decimal import Decimal"})
+    assert python_type(99999)[0] == "Any"
+
+
+def test_network_types_match_psycopg_values():
+    from psycopg.adapt import Transformer
+
+    annotation, imports = python_type(869)
+    assert annotation == "Union[IPv4Interface, IPv6Interface]"
+    assert format_imports(imports) == [
+        "from ipaddress import IPv4Interface, IPv6Interface",
+        "from typing import Union",
+    ]
+    assert python_type(651)[0] == "List[Union[IPv4Network, IPv6Network]]"
+
+    namespace = {}
+    exec("\n".join(format_imports(python_type(869)[1] | python_type(650)[1])), namespace)
+    inet, cidr = eval(python_type(869)[0], namespace), eval(python_type(650)[0], namespace)
+    Host = create_model("Host", address=(inet, ...), net=(cidr, ...))
+    # What psycopg's loaders return for inet and cidr columns.
+    tx = Transformer()
+    address = tx.get_loader(869, 0).load(b"10.0.0.1/8")
+    net = tx.get_loader(650, 0).load(b"2001:db8::/32")
+    host = Host(address=address, net=net)
+    assert host.address == address and host.net == net
+
+
+def test_names():
+    assert pascal_case("GetUserById") == "GetUserById" and pascal_case("get_user_by_id") == "GetUserById"
+    assert snake_case("GetUserById") == "get_user_by_id"
+
+
+def column(name, oid, nullable=False):
+    return ColumnInfo(name=name, type_oid=oid, nullable=nullable, table_oid=1, column_num=1)
+
+
+def spec(**overrides):
+    values = dict(
+        name="GetProduct",
+        sql="SELECT id, name, price FROM products WHERE id = :id",
+        positional_sql="SELECT id, name, price FROM products WHERE id = $1",
+        param_names=["id"],
+        param_oids=[23],
+        columns=[column("id", 23), column("name", 1043), column("price", 1700, nullable=True)],
+    )
+    values.update(overrides)
+    return QuerySpec(**values)
+
+
+def test_generated_module_runs():
+    source = generate_module(
+        [spec(), spec(name="TouchProducts", positional_sql="UPDATE products SET stock = stock", param_names=[], param_oids=[], columns=[])],
+        "products.sql",
+    )
+    namespace = {}
+    exec(compile(source, "products_queries.py", "exec"), namespace)
+
+    query = namespace["get_product"]
+    assert query.sql == "SELECT id, name, price FROM products WHERE id = $1"
+    assert query.param_oids == (23,) and query.result_oids == (23, 1043, 1700)
+    assert query.binder({"id": 5}) == (5,)
+    product = query.mapper((5, "Lamp", Decimal("9.50")))
+    assert type(product).__name__ == "GetProductResult"
+    assert product.price == Decimal("9.50")
+    assert namespace["GetProductParams"].__annotations__ == {"id": int}
+
+    touch = namespace["touch_products"]
+    assert touch.mapper is None and touch.binder(None) == ()
+
+
+def test_anonymous_columns_are_rejected():
+    with pytest.raises(QueryError, match="anonymous column"):
+        generate_module([spec(columns=[column("?column?", 23)])])
+
+
+def test_dataclass_and_typeddict_targets():
+    source = generate_module(
+        [spec(), spec(name="GetProductDict", result_type="typeddict")], "products.sql", result_type="dataclass"
+    )
+    namespace = {}
+    exec(compile(source, "products_queries.py", "exec"), namespace)
+
+    row = (5, "Lamp", None)
+    product = namespace["get_product"].mapper(row)
+    assert product == namespace["GetProductResult"].from_row(row)
+    assert (product.id, product.name, product.price) == row
+    assert not hasattr(product, "__dict__")
+    with pytest.raises(AttributeError):
+        product.name = "Desk"
+
+    assert namespace["get_product_dict"].mapper(row) == {"id": 5, "name": "Lamp", "price": None}
+
+
+def test_per_query_result_annotation():
+    from pydantic_sql.cli.catalog import parse_catalog, parse_options
+
+    contents = "/*\n  @name GetUser\n  @result dataclass\n*/\nSELECT * FROM users;\n/* @name ListUsers */ SELECT * FROM users;"
+    assert parse_catalog(contents) == {"GetUser": "SELECT * FROM users", "ListUsers": "SELECT * FROM users"}
+    assert parse_options(contents) == {"GetUser": {"result": "dataclass"}, "ListUsers": {}}
+
+
+def test_lazy_package(tmp_path, monkeypatch):
+    import sys
+
+    from pydantic_sql.cli.python_generator import generate_package
+
+    specs = [spec(source="products.sql"), spec(name="CountUsers", param_names=[], param_oids=[], columns=[column("n", 20)])]
+    generate_package(specs, tmp_path / "generated_queries")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    import generated_queries
+
+    try:
+        assert "generated_queries._get_product" not in sys.modules
+        assert sorted(generated_queries.__all__) == ["CountUsersResult", "GetProductParams", "GetProductResult", "count_users", "get_product"]
+        assert generated_queries.get_product.sql.endswith("$1")
+        assert "generated_queries._get_product" in sys.modules
+        assert "generated_queries._count_users" not in sys.modules
+        assert generated_queries.GetProductResult is sys.modules["generated_queries._get_product"].GetProductResult
+        with pytest.raises(AttributeError):
+            generated_queries.missing
+    finally:
+        for name in [name for name in sys.modules if name.startswith("generated_queries")]:
+            del sys.modules[name]
+
+
+def test_package_module_name_clash(tmp_path):
+    from pydantic_sql.cli.python_generator import generate_package
+    from pydantic_sql.exceptions import ConfigurationError
+
+    with pytest.raises(ConfigurationError, match="same module name"):
+        generate_package([spec(name="GetProduct"), spec(name="get_product")], tmp_path / "pkg")
+
+
+def test_describe_cache_reuses_identical_shapes():
+    from pydantic_sql.cli.python_generator import DescribeCache, describe_query
+    from pydantic_sql.fingerprint import canonical_sql
+
+    cache = DescribeCache()
+    cache.specs[canonical_sql("SELECT id, name, price FROM products WHERE id = $1")] = spec()
+    # No round trip: the connection is never touched on a hit.
+    found = describe_query(object(), "FindProduct", "SELECT id, name, price -- by id\nFROM   products WHERE id = :product_id;", cache)
+    assert (found.name, found.param_names, found.param_oids) == ("FindProduct", ["product_id"], [23])
+    assert found.columns == spec().columns and cache.hits == 1
+
+
+def test_identical_results_share_one_class():
+    source = generate_module([spec(), spec(name="FindProduct"), spec(name="GetProductDc", result_type="dataclass")])
+    assert source.count("class GetProductResult(BaseModel)") == 1
+    assert "FindProductResult = GetProductResult\n" in source
+    namespace = {}
+    exec(compile(source, "products_queries.py", "exec"), namespace)
+    assert type(namespace["find_product"].mapper((1, "Lamp", None))) is namespace["GetProductResult"]
+    assert namespace["GetProductDcResult"] is not namespace["GetProductResult"]
+
+
+def test_package_shares_results_across_modules(tmp_path, monkeypatch):
+    import sys
+
+    from pydantic_sql.cli.python_generator import generate_package
+
+    generate_package([spec(source="a.sql"), spec(name="FindProduct", source="b.sql")], tmp_path / "shared_queries")
+    module = (tmp_path / "shared_queries" / "_find_product.py").read_text()
+    assert "from ._get_product import GetProductResult" in module and "class FindProductResult" not in module
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    import shared_queries
+
+    try:
+        assert shared_queries.FindProductResult is shared_queries.GetProductResult
+        assert type(shared_queries.find_product.mapper((1, "Lamp", None))) is shared_queries.GetProductResult
+    finally:
+        for name in [name for name in sys.modules if name.startswith("shared_queries")]:
+            del sys.modules[name]
+
+
+def test_keyword_params_and_object_binding():
+    from datetime import datetime
+    from types import SimpleNamespace
+
+    source = generate_module(
+        [
+            spec(
+                name="OrdersBetween",
+                sql="SELECT id FROM orders WHERE created BETWEEN :from AND :to",
+                positional_sql="SELECT id FROM orders WHERE created BETWEEN $1 AND $2",
+                param_names=["from", "to"],
+                param_oids=[1184, 1184],
+                columns=[column("id", 23)],
+            ),
+            spec(),
+        ]
+    )
+    namespace = {}
+    exec(compile(source, "orders_queries.py", "exec"), namespace)
+    assert namespace["OrdersBetweenParams"].__annotations__ == {"from": datetime, "to": datetime}
+
+    start, end = datetime(2024, 1, 1), datetime(2024, 2, 1)
+    bind = namespace["orders_between"].binder
+    assert bind({"from": start, "to": end}) == (start, end)
+    assert bind(SimpleNamespace(**{"from": start, "to": end})) == (start, end)
+    assert namespace["get_product"].binder(SimpleNamespace(id=3)) == (3,)
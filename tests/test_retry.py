@@ -0,0 +1,97 @@
+# tests/test_retry.py
+
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from psycopg import errors
+from psycopg.pq import TransactionStatus
+
+from pydantic_sql.exceptions import ConfigurationError, DeadlockError, QueryError
+from pydantic_sql.retry import TransactionRunner
+
+
+class FakeConnection:
+    def __init__(self, status=TransactionStatus.IDLE):
+        self.statements = []
+        self.rollbacks = 0
+        self.info = SimpleNamespace(transaction_status=status)
+
+    @contextmanager
+    def transaction(self):
+        try:
+            yield
+        except Exception:
+            self.rollbacks += 1
+            raise
+
+    def execute(self, sql):
+        self.statements.append(sql)
+
+
+def failing_work(failures, error):
+    calls = []
+
+    def work(conn):
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error
+        return "done"
+
+    return work, calls
+
+
+def test_retries_serialization_failures():
+    conn = FakeConnection()
+    delays = []
+    runner = TransactionRunner(isolation_level="serializable", sleep=delays.append)
+    work, calls = failing_work(2, errors.SerializationFailure("could not serialize access"))
+
+    assert runner.run(conn, work) == "done"
+    assert len(calls) == 3
+    assert conn.rollbacks == 2
+    assert conn.statements == ["SET TRANSACTION ISOLATION LEVEL SERIALIZABLE"] * 3
+    assert len(delays) == 2 and all(0 <= d <= 0.02 for d in delays)
+
+    stats = runner.stats()
+    assert (stats.transactions, stats.attempts, stats.retries, stats.failures) == (1, 3, 2, 0)
+    assert stats.retries_by_sqlstate == {"40001": 2}
+
+
+def test_gives_up_after_max_attempts():
+    runner = TransactionRunner(max_attempts=3, sleep=lambda _: None)
+    work, calls = failing_work(10, errors.DeadlockDetected("deadlock detected"))
+    with pytest.raises(DeadlockError):
+        runner.run(FakeConnection(), work)
+    assert len(calls) == 3
+    assert runner.stats().failures == 1
+
+
+def test_other_errors_are_not_retried():
+    runner = TransactionRunner(sleep=lambda _: None)
+    work, calls = failing_work(1, errors.UniqueViolation("duplicate key"))
+    with pytest.raises(QueryError):
+        runner.run(FakeConnection(), work)
+    assert len(calls) == 1
+
+
+def test_backoff_is_capped():
+    runner = TransactionRunner(base_delay=0.5, max_delay=1.0)
+    assert all(0 <= runner.backoff(10) <= 1.0 for _ in range(100))
+
+
+def test_refuses_to_run_inside_an_outer_transaction():
+    runner = TransactionRunner(isolation_level="serializable", sleep=lambda _: None)
+    work, calls = failing_work(0, None)
+    conn = FakeConnection(TransactionStatus.INTRANS)
+    with pytest.raises(ConfigurationError):
+        runner.run(conn, work)
+
+    async def awork(conn):
+        calls.append(1)
+
+    with pytest.raises(ConfigurationError):
+        asyncio.run(runner.arun(conn, awork))
+    assert calls == [] and conn.statements == []
+    assert runner.stats().transactions == 0
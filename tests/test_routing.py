@@ -0,0 +1,92 @@
+# tests/test_routing.py
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+
+from pydantic_sql.routing import LEAST_OUTSTANDING, ReplicaRouter
+from pydantic_sql.utils import is_read_only
+
+
+class FakePool:
+    def __init__(self, name):
+        self.name = name
+
+    @contextmanager
+    def connection(self):
+        yield self.name
+
+
+def test_read_only_classification():
+    assert is_read_only("SELECT * FROM users WHERE id = %s")
+    assert is_read_only("  -- lookup\n WITH c AS (SELECT 1) SELECT * FROM c")
+    assert is_read_only("SELECT * FROM users WHERE name = 'UPDATE me'")
+    assert not is_read_only("SELECT * FROM products WHERE id = 1 FOR UPDATE")
+    assert not is_read_only("SELECT * FROM orders FOR NO KEY UPDATE SKIP LOCKED")
+    assert not is_read_only("WITH d AS (DELETE FROM orders RETURNING *) SELECT * FROM d")
+    assert not is_read_only("SELECT nextval('orders_id_seq')")
+    assert not is_read_only("INSERT INTO users (name) VALUES ('x')")
+
+
+def test_round_robin_across_replicas():
+    primary, r1, r2 = FakePool("primary"), FakePool("r1"), FakePool("r2")
+    router = ReplicaRouter(primary, [r1, r2])
+    chosen = [router.choose("SELECT 1").name for _ in range(4)]
+    assert chosen == ["r1", "r2", "r1", "r2"]
+    assert router.choose("DELETE FROM users") is primary
+    assert router.choose("SELECT pg_sleep(1)", read_only=False) is primary
+
+
+def test_least_outstanding():
+    r1, r2 = FakePool("r1"), FakePool("r2")
+    router = ReplicaRouter(FakePool("primary"), [r1, r2], strategy=LEAST_OUTSTANDING)
+    with router.connection("SELECT 1") as first:
+        with router.connection("SELECT 1") as second:
+            assert {first, second} == {"r1", "r2"}
+    assert router.outstanding() == {0: 0, 1: 0, 2: 0}
+
+
+def test_least_outstanding_under_concurrency():
+    barrier = threading.Barrier(4)
+
+    class BlockingPool(FakePool):
+        @contextmanager
+        def connection(self):
+            # Every caller holds its connection until all four have one.
+            barrier.wait(timeout=5)
+            yield self.name
+
+    router = ReplicaRouter(FakePool("primary"), [BlockingPool("r1"), BlockingPool("r2")], strategy=LEAST_OUTSTANDING)
+
+    def borrow(_):
+        with router.connection("SELECT 1") as conn:
+            return conn
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        chosen = list(executor.map(borrow, range(4)))
+    assert sorted(chosen) == ["r1", "r1", "r2", "r2"]
+
+
+def test_session_sticks_to_primary_after_write():
+    router = ReplicaRouter(FakePool("primary"), [FakePool("r1")])
+    session = router.session()
+    with router.connection("SELECT * FROM users", session=session) as conn:
+        assert conn == "r1"
+    with router.connection("UPDATE users SET age = 1", session=session) as conn:
+        assert conn == "primary"
+    with router.connection("SELECT * FROM users", session=session) as conn:
+        assert conn == "primary"
+
+
+@pytest.mark.skipif(not os.getenv("TEST_REPLICA_URLS"), reason="needs TEST_PRIMARY_URL and TEST_REPLICA_URLS")
+def test_routing_against_local_instances():
+    replicas = os.environ["TEST_REPLICA_URLS"].split(",")
+    router = ReplicaRouter.from_conninfo(os.environ["TEST_PRIMARY_URL"], replicas, min_size=1, open=True)
+    ports = set()
+    for _ in replicas:
+        with router.connection("SELECT inet_server_port()") as conn:
+            ports.add(conn.execute("SELECT inet_server_port()").fetchone()[0])
+    assert len(ports) == len(replicas)
@@ -0,0 +1,106 @@
+# tests/test_sharding.py
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from pydantic import BaseModel
+
+from pydantic_sql.sharding import ShardRouter
+
+
+class Order(BaseModel):
+    id: int
+    user_id: int
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, sql, params):
+        for row in self.rows:
+            await asyncio.sleep(0)
+            yield row
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, row_factory=None):
+        return FakeCursor(self.rows)
+
+
+class FakePool:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+        self.checked_out = 0
+
+    @asynccontextmanager
+    async def connection(self):
+        self.queries += 1
+        self.checked_out += 1
+        try:
+            yield FakeConnection(self.rows)
+        finally:
+            self.checked_out -= 1
+
+
+def make_shards():
+    # user_id % 2 picks the shard; each shard returns rows sorted by id.
+    return [
+        FakePool([{"id": 2, "user_id": 4}, {"id": 5, "user_id": 2}, {"id": 6, "user_id": 8}]),
+        FakePool([{"id": 1, "user_id": 1}, {"id": 3, "user_id": 3}, {"id": 4, "user_id": 5}]),
+    ]
+
+
+async def collect(iterator):
+    return [row async for row in iterator]
+
+
+def test_single_shard_query_hits_one_shard():
+    shards = make_shards()
+    router = ShardRouter(shards)
+    rows = asyncio.run(collect(router.fetch("SELECT ...", {"user_id": 3}, model=Order)))
+    assert all(isinstance(row, Order) for row in rows)
+    assert [shard.queries for shard in shards] == [0, 1]
+
+
+def test_fan_out_gathers_all_shards():
+    router = ShardRouter(make_shards())
+    rows = asyncio.run(collect(router.fetch("SELECT ...", {})))
+    assert sorted(row["id"] for row in rows) == [1, 2, 3, 4, 5, 6]
+
+
+def test_sorted_fan_out_uses_k_way_merge():
+    router = ShardRouter(make_shards())
+    rows = asyncio.run(collect(router.fetch("SELECT ... ORDER BY id LIMIT 4", None, order_by=["id"], limit=4)))
+    assert [row["id"] for row in rows] == [1, 2, 3, 4]
+
+
+def test_descending_merge():
+    shards = [FakePool([{"id": 6}, {"id": 2}]), FakePool([{"id": None}, {"id": 5}, {"id": 1}])]
+    router = ShardRouter(shards)
+    rows = asyncio.run(collect(router.fetch("SELECT ...", None, order_by=["id"], descending=True)))
+    assert [row["id"] for row in rows] == [None, 6, 5, 2, 1]
+
+
+def test_early_exit_returns_every_connection():
+    async def first_row(shards, params, **kwargs):
+        rows = ShardRouter(shards, queue_size=1).fetch("SELECT ...", params, **kwargs)
+        row = await anext(rows)
+        await rows.aclose()
+        # Checked before asyncio.run finalizes any generator left open.
+        return row, [shard.checked_out for shard in shards]
+
+    for params, kwargs in [({"user_id": 3}, {}), ({}, {}), (None, {"order_by": ["id"]})]:
+        row, checked_out = asyncio.run(first_row(make_shards(), params, **kwargs))
+        assert row is not None
+        assert checked_out == [0, 0]
@@ -0,0 +1,126 @@
+# tests/test_singleflight.py
+
+import asyncio
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pydantic_sql import singleflight
+from pydantic_sql.singleflight import AsyncSingleFlight, SingleFlight
+
+SQL = "SELECT * FROM products WHERE category_id = %s"
+
+
+class CountingEvent(threading.Event):
+    """An Event that lets the test wait until `count` threads are blocked on it."""
+
+    def __init__(self):
+        super().__init__()
+        self.waiting = 0
+        self._changed = threading.Condition()
+
+    def wait(self, timeout=None):
+        with self._changed:
+            self.waiting += 1
+            self._changed.notify_all()
+        return super().wait(timeout)
+
+    def wait_for_waiters(self, count, timeout=5):
+        with self._changed:
+            assert self._changed.wait_for(lambda: self.waiting >= count, timeout)
+
+
+@pytest.fixture
+def call_events(monkeypatch):
+    """The completion Event of every shared call, as CountingEvents."""
+    events = []
+
+    class RecordedEvent(CountingEvent):
+        def __init__(self):
+            super().__init__()
+            events.append(self)
+
+    monkeypatch.setattr(singleflight, "threading", types.SimpleNamespace(Event=RecordedEvent, Lock=threading.Lock))
+    return events
+
+
+def test_concurrent_reads_share_one_execution(call_events):
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    leader_calls, follower_calls = [], []
+
+    def lead():
+        leader_calls.append(1)
+        started.set()
+        release.wait(5)
+        return ["row"]
+
+    def follow():
+        follower_calls.append(1)
+        return ["other"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flight.run, SQL, (1,), lead, True)
+        assert started.wait(5)
+        followers = [pool.submit(flight.run, SQL, (1,), follow, True) for _ in range(7)]
+        call_events[0].wait_for_waiters(7)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert (len(leader_calls), len(follower_calls)) == (1, 0)
+    assert all(r is results[0] for r in results)
+
+
+def test_errors_fan_out_to_waiters(call_events):
+    flight = SingleFlight()
+    started, fail = threading.Event(), threading.Event()
+    error = RuntimeError("boom")
+    waiter_calls = []
+
+    def lead():
+        started.set()
+        fail.wait(5)
+        raise error
+
+    def wait():
+        waiter_calls.append(1)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flight.do, "key", lead)
+        assert started.wait(5)
+        waiters = [pool.submit(flight.do, "key", wait) for _ in range(3)]
+        call_events[0].wait_for_waiters(3)
+        fail.set()
+        for future in [leader, *waiters]:
+            assert future.exception(5) is error
+    assert waiter_calls == []
+
+    # The failed call is not remembered: the next caller runs its own loader.
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_writes_are_not_coalesced():
+    flight = SingleFlight()
+    calls = []
+    flight.run(SQL, (1,), lambda: calls.append(1), read_only=False)
+    flight.run(SQL, (1,), lambda: calls.append(1), read_only=False)
+    assert len(calls) == 2
+
+
+def test_async_single_flight():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["row"]
+
+    async def main():
+        return await asyncio.gather(*(flight.run(SQL, (1,), load, read_only=True) for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert all(r is results[0] for r in results)
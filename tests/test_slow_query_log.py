@@ -0,0 +1,164 @@
+# tests/test_slow_query_log.py
+
+from concurrent.futures import Future
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from pydantic_sql.instrumentation import Hook, add_hook, remove_hook
+from pydantic_sql.slow_query_log import SlowQueryLog, params_shape
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class FakeConn:
+    def __init__(self, fail=False, server_version=160000):
+        self.executed = []
+        self.fail = fail
+        self.info = SimpleNamespace(server_version=server_version)
+
+    @contextmanager
+    def transaction(self, force_rollback=False):
+        self.executed.append(("BEGIN", force_rollback))
+        yield
+
+    def execute(self, sql, params=None):
+        if self.fail and sql.startswith("EXPLAIN"):
+            raise RuntimeError("boom")
+        self.executed.append((sql, params))
+        return self
+
+    def fetchone(self):
+        return ([{"Plan": {"Node Type": "Seq Scan"}}],)
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @contextmanager
+    def connection(self):
+        yield self.conn
+
+
+class SlowHook(Hook):
+    def __init__(self):
+        self.entries = []
+
+    def slow_query(self, entry):
+        self.entries.append(entry)
+
+
+@pytest.fixture
+def hook():
+    hook = SlowHook()
+    add_hook(hook)
+    yield hook
+    remove_hook(hook)
+
+
+def test_slow_query_is_explained_and_emitted(hook):
+    conn = FakeConn()
+    log = SlowQueryLog(FakePool(conn), threshold=0.1, executor=InlineExecutor())
+    assert not log.record("SELECT * FROM users WHERE id = %s", [1], 0.05)
+    assert log.record("SELECT * FROM users WHERE id = %s", [1], 0.2)
+
+    [entry] = log.entries()
+    assert hook.entries == [entry]
+    assert entry.plan == [{"Plan": {"Node Type": "Seq Scan"}}]
+    assert entry.params_shape == ["int"] and not entry.sampled and not entry.analyzed
+    explain = [sql for sql, _ in conn.executed if isinstance(sql, str) and sql.startswith("EXPLAIN")]
+    assert explain == ["EXPLAIN (FORMAT JSON, BUFFERS) SELECT * FROM users WHERE id = %s"]
+    assert ("BEGIN", True) in conn.executed
+
+
+def test_analyze_only_for_read_only_statements():
+    conn = FakeConn(server_version=120000)
+    log = SlowQueryLog(FakePool(conn), threshold=0, analyze=True, executor=InlineExecutor())
+    log.record("SELECT 1", None, 1)
+    log.record("UPDATE users SET name = %(name)s", {"name": "x"}, 1)
+    select, update = log.entries()
+    assert select.analyzed and not update.analyzed
+    assert update.params_shape == {"name": "str"}
+    # Postgres 12 rejects BUFFERS unless the statement is analyzed.
+    explain = [sql for sql, _ in conn.executed if isinstance(sql, str) and sql.startswith("EXPLAIN")]
+    assert explain == [
+        "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT 1",
+        "EXPLAIN (FORMAT JSON) UPDATE users SET name = %(name)s",
+    ]
+
+
+def test_sampling_and_ring_buffer():
+    log = SlowQueryLog(
+        FakePool(FakeConn()), threshold=10, sample_rate=0.5, capacity=2, executor=InlineExecutor(), random_fn=lambda: 0.1
+    )
+    for i in range(3):
+        log.record(f"SELECT * FROM t{i}", None, 0.001)
+    entries = log.entries()
+    assert [entry.sql for entry in entries] == ["SELECT * FROM t1", "SELECT * FROM t2"]
+    assert all(entry.sampled for entry in entries)
+
+
+def test_explain_errors_are_recorded():
+    log = SlowQueryLog(FakePool(FakeConn(fail=True)), threshold=0, executor=InlineExecutor())
+    log.record("SELECT 1", None, 1)
+    [entry] = log.entries()
+    assert entry.plan is None and "boom" in entry.error
+
+
+class DeferredExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append((fn, args))
+
+    def run_all(self):
+        calls, self.calls = self.calls, []
+        for fn, args in calls:
+            fn(*args)
+
+    def shutdown(self, wait=True):
+        self.run_all()
+
+
+def test_captures_are_deduplicated_rate_limited_and_bounded():
+    now = [0.0]
+    executor = DeferredExecutor()
+    log = SlowQueryLog(
+        FakePool(FakeConn()), threshold=0, executor=executor, cooldown=30, max_pending=2, clock=lambda: now[0]
+    )
+    assert log.record("SELECT * FROM users WHERE id = 1", None, 1)
+    # Same fingerprint while its capture is pending.
+    assert not log.record("SELECT * FROM users WHERE id = 2", None, 1)
+    assert log.record("SELECT * FROM orders", None, 1)
+    # Queue full.
+    assert not log.record("SELECT * FROM carts", None, 1)
+    assert len(executor.calls) == 2 and log.skipped == 2
+
+    executor.run_all()
+    now[0] = 10
+    assert not log.record("SELECT * FROM users WHERE id = 3", None, 1)
+    now[0] = 31
+    assert log.record("SELECT * FROM users WHERE id = 3", None, 1)
+
+
+def test_record_after_close_is_a_no_op():
+    log = SlowQueryLog(FakePool(FakeConn()), threshold=0)
+    log.close()
+    assert not log.record("SELECT 1", None, 1)
+    assert log.entries() == []
+
+
+def test_params_shape():
+    assert params_shape(None) is None
+    assert params_shape((1, "a", None)) == ["int", "str", "NoneType"]
@@ -0,0 +1,194 @@
+# tests/test_warmup.py
+
+import asyncio
+import types
+
+import psycopg
+import pytest
+from psycopg.adapt import PyFormat, Transformer
+from psycopg.types.numeric import Float4, Int4
+
+from pydantic_sql.exceptions import ConfigurationError
+from pydantic_sql.query_compiler import CompiledQuery
+from pydantic_sql.warmup import Warmup, collect_queries
+
+GET_USER = CompiledQuery.from_sql("GetUser", "SELECT * FROM users WHERE id = :id")
+LIST_USERS = CompiledQuery.from_sql("ListUsers", "SELECT * FROM users")
+BROKEN = CompiledQuery.from_sql("Broken", "SELECT * FROM missing")
+ADD_USER = CompiledQuery.from_sql("AddUser", "INSERT INTO users (name) VALUES (:name)")
+
+
+class FakeCursor:
+    """Stands in for psycopg.RawCursor; anything mentioning `missing` fails, and fails its pipeline."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+    def execute(self, query, params, prepare=None):
+        assert not self.closed
+        self.conn.statements.append((query, tuple(params), prepare))
+        if "missing" in query:
+            # In a pipeline the error only surfaces at the sync on exit.
+            self.conn._failed = True
+            if not self.conn._in_pipeline:
+                raise psycopg.errors.UndefinedTable("relation does not exist")
+        self.description = [("id",)]
+
+    def fetchall(self):
+        return [(7,)]
+
+
+class AsyncFakeCursor(FakeCursor):
+    async def execute(self, query, params, prepare=None):
+        FakeCursor.execute(self, query, params, prepare)
+
+    async def close(self):
+        FakeCursor.close(self)
+
+
+@pytest.fixture(autouse=True)
+def fake_cursors(monkeypatch):
+    monkeypatch.setattr(psycopg, "RawCursor", FakeCursor)
+    monkeypatch.setattr(psycopg, "AsyncRawCursor", AsyncFakeCursor)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.autocommit = False
+        self.statements = []
+        self.pipelines = 0
+        self._failed = False
+        self._in_pipeline = False
+
+    def execute(self, sql, params=None, prepare=None):
+        self.statements.append(sql)
+
+    def pipeline(self):
+        conn = self
+
+        class Pipeline:
+            def __enter__(self):
+                conn.pipelines += 1
+                conn._failed = False
+                conn._in_pipeline = True
+
+            def __exit__(self, *exc):
+                conn._in_pipeline = False
+                if conn._failed and exc[0] is None:
+                    raise psycopg.errors.UndefinedTable("relation does not exist")
+
+        return Pipeline()
+
+
+class AsyncFakeConnection(FakeConnection):
+    async def execute(self, sql, params=None, prepare=None):
+        FakeConnection.execute(self, sql, params, prepare)
+
+    async def set_autocommit(self, value):
+        self.autocommit = value
+
+    def pipeline(self):
+        sync = FakeConnection.pipeline(self)
+
+        class Pipeline:
+            async def __aenter__(self):
+                sync.__enter__()
+
+            async def __aexit__(self, *exc):
+                sync.__exit__(*exc)
+
+        return Pipeline()
+
+
+def executed(conn):
+    return [sql for sql, _, _ in conn.statements]
+
+
+def test_bind_pins_numeric_types():
+    query = CompiledQuery(
+        "FindUser", "SELECT * FROM users WHERE id = $1 AND name = $2 AND age > $3", ["id", "name", "age"], [23, 25, 700]
+    )
+    args = query.bind({"id": 5, "name": "Alice", "age": 30})
+    assert args == (5, "Alice", 30.0)
+    assert [type(arg) for arg in args] == [Int4, str, Float4]
+    assert [type(arg) for arg in query.placeholder_args()] == [Int4, type(None), Float4]
+
+    # psycopg's prepared-statement cache is keyed by these types, so a warm-up hits the same entry.
+    def types(args):
+        tx = Transformer()
+        tx.dump_sequence(args, [PyFormat.AUTO] * len(args))
+        return tx.types
+
+    assert types(args) == types(query.placeholder_args()) == (23, 0, 700)
+    # Without known OIDs the arguments pass through unchanged.
+    assert [type(arg) for arg in GET_USER.bind({"id": 5})] == [int]
+
+
+def test_collect_queries_from_module_dedupes():
+    module = types.ModuleType("queries")
+    module.__all__ = ["GET_USER", "ListUsersRow", "LIST_USERS"]
+    module.GET_USER, module.ListUsersRow, module.LIST_USERS = GET_USER, object, LIST_USERS
+    assert collect_queries(module) == [GET_USER, LIST_USERS]
+    assert collect_queries([GET_USER, CompiledQuery.from_sql("Again", GET_USER.sql)]) == [GET_USER]
+
+
+def test_warmup_runs_read_queries_in_batches():
+    conn = FakeConnection()
+    Warmup([GET_USER, LIST_USERS, BROKEN, ADD_USER], batch_size=2)(conn)
+    assert conn.pipelines == 2 and conn.autocommit is False
+    assert conn.statements[0] == ("SELECT * FROM users WHERE id = $1", (None,), True)
+    # The failing batch is retried query by query; the write is never executed.
+    assert executed(conn) == [GET_USER.sql, LIST_USERS.sql, BROKEN.sql, BROKEN.sql]
+
+
+def test_failed_batch_is_retried_statement_by_statement():
+    conn = FakeConnection()
+    Warmup([BROKEN, GET_USER])(conn)
+    # The pipelined attempt, then each query on its own.
+    assert executed(conn) == [BROKEN.sql, GET_USER.sql, BROKEN.sql, GET_USER.sql]
+
+
+def test_budget_stops_warmup():
+    ticks = iter(range(100))
+    conn = FakeConnection()
+    Warmup([GET_USER, LIST_USERS], budget=1.5, batch_size=1, clock=lambda: next(ticks))(conn)
+    assert conn.pipelines == 1
+    assert executed(conn) == [GET_USER.sql]
+
+
+def test_async_warmup_runs_configure_first():
+    conn = AsyncFakeConnection()
+
+    async def configure(conn):
+        await conn.execute("SET application_name = 'api'")
+
+    asyncio.run(Warmup([GET_USER, BROKEN], configure=configure).aconfigure(conn))
+    assert conn.statements[0] == "SET application_name = 'api'"
+    assert [sql for sql, _, _ in conn.statements[1:]] == [GET_USER.sql, BROKEN.sql, GET_USER.sql, BROKEN.sql]
+    assert conn.autocommit is False
+
+
+def test_invalid_settings():
+    with pytest.raises(ConfigurationError):
+        Warmup([GET_USER], budget=0)
+
+
+def test_run_sends_the_warmed_statement():
+    conn = FakeConnection()
+    query = CompiledQuery("GetUser", GET_USER.sql, ["id"], [23])
+    Warmup([query])(conn)
+    assert query.run(conn, {"id": 7}) == [(7,)]
+    warm, call = conn.statements
+    assert warm[0] == call[0] == GET_USER.sql and warm[2] is call[2] is True
+    assert type(warm[1][0]) is type(call[1][0]) is Int4